@@ -13,7 +13,7 @@ from core.ai import AIPlayer
 def _candidate_from_points(board: Board, player: Player) -> List[int]:
     """Return candidate from_points considering bar priority and ownership."""
     # Bar priority: if player has checkers on bar, must enter from bar
-    if len(board.get_bar()[player]) > 0:  # Usa getter
+    if board.get_bar_count(player) > 0:  # Usa getter
         return [-1] if player.get_color() == "white" else [24]  # Usa getter
     # Otherwise, any point with at least one checker belonging to the player
     points = []
@@ -1,21 +1,69 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 from core.player import Player
-import copy
+from core.array_board import ArrayBoard
+from core.movegen import generate_positions, to_perspective
+from core.search import ExpectiminimaxSearch, TranspositionTable, evaluate_position
 
 if TYPE_CHECKING:
     from core.board import Board
+    from core.bearoff import BearoffDatabase
+    from core.evaluator import Evaluator
+    from core.book import OpeningBook
+
+def _cells_of(board: 'Board') -> tuple:
+    """
+    Returns the cells of a board as an ArrayBoard snapshot.
+
+    Args:
+        board (Board): A Board or ArrayBoard; it is not modified.
+
+    Returns:
+        tuple: The 28 cells of the position, as ArrayBoard.get_cells_snapshot returns them.
+    """
+    if not isinstance(board, ArrayBoard):
+        board = ArrayBoard.from_board(board)
+    return board.get_cells_snapshot()
 
 class AIPlayer(Player):
     """
     Represents an AI player that can choose its own moves. Inherits from Player.
     """
 
+    def __init__(self,
+                 name: str,
+                 color: str,
+                 bearoff_database: Optional['BearoffDatabase'] = None,
+                 evaluator: Optional['Evaluator'] = None,
+                 opening_book: Optional['OpeningBook'] = None):
+        """
+        Initializes the AI player.
+
+        Args:
+            name (str): The name of the player.
+            color (str): The color of the player's checkers ('white' or 'black').
+            bearoff_database (BearoffDatabase, optional): When given, bear-offs without contact
+                are played by looking up the expected number of rolls instead of greedily.
+            evaluator (Evaluator, optional): When given, every legal play is scored with it in one
+                batch and the best one is chosen instead of the greedy moves.
+            opening_book (OpeningBook, optional): Consulted first; book positions are played
+                without any search.
+        """
+        super().__init__(name, color)
+        self.__bearoff_database__ = bearoff_database
+        self.__evaluator__ = evaluator
+        self.__opening_book__ = opening_book
+
+    def get_evaluator(self) -> Optional['Evaluator']:
+        """Returns the position evaluator of this player, if any."""
+        return self.__evaluator__
+
     def choose_moves(self, board: 'Board', dice: List[int]) -> List[tuple]:
         """
         Chooses a sequence of moves for the AI based on the current board state and dice.
 
         This implementation uses a simple greedy algorithm that prioritizes higher dice values
-        and bearing off. It simulates moves on a temporary board to find a valid sequence.
+        and bearing off. It simulates moves directly on the given board with apply_move and
+        reverts them with undo_move before returning, so the board is left unchanged.
 
         Args:
             board (Board): The current state of the game board.
@@ -24,8 +72,108 @@ class AIPlayer(Player):
         Returns:
             List[tuple]: A list of move tuples, e.g., [('bar', 22), (5, 3)].
         """
+        book_moves = self._choose_book_moves(board, dice)
+        if book_moves is not None:
+            return book_moves
+        bearoff_moves = self._choose_bearoff_moves(board, dice)
+        if bearoff_moves is not None:
+            return bearoff_moves
+        if self.__evaluator__ is not None:
+            return self._choose_evaluated_moves(board, dice)
+
+        undo_stack = []
+        try:
+            return self._choose_greedy_moves(board, dice, undo_stack)
+        finally:
+            while undo_stack:
+                board.undo_move(undo_stack.pop())
+
+    def _choose_book_moves(self, board: 'Board', dice: List[int]) -> Optional[List[tuple]]:
+        """
+        Looks the position up in the opening book.
+
+        Args:
+            board (Board): The current state of the game board.
+            dice (List[int]): The dice values available for the turn.
+
+        Returns:
+            List[tuple] or None: The book moves, or None without a book or a book entry.
+        """
+        book = self.__opening_book__
+        # The book only covers the opening, long before anyone bears off.
+        if book is None or board.get_off_board_count(self):
+            return None
+        cells = _cells_of(board)
+        return book.lookup(cells, self.get_color() == 'white', dice)
+
+    def _choose_bearoff_moves(self, board: 'Board', dice: List[int]) -> Optional[List[tuple]]:
+        """
+        Picks the play that minimizes the expected rolls to bear off, using the database.
+
+        Args:
+            board (Board): The current state of the game board.
+            dice (List[int]): The dice values available for the turn.
+
+        Returns:
+            List[tuple] or None: The moves, or None if there is no database, the AI cannot bear
+            off yet, or there is still contact with the opponent.
+        """
+        database = self.__bearoff_database__
+        if database is None or not board.can_player_bear_off(self):
+            return None
+        cells = _cells_of(board)
+        is_white = self.get_color() == 'white'
+        own = to_perspective(cells, is_white)
+        # Opponent checkers on the bar or in our home board still have to pass our checkers.
+        if own[25] or any(count < 0 for count in own[:6]) or not database.covers(own[:6]):
+            return None
+
+        def expected_rolls(play):
+            after = to_perspective(play[1], is_white)
+            return database.expected_rolls(after[:6])
+
+        return min(generate_positions(cells, is_white, dice), key=expected_rolls)[0]
+
+    def _choose_evaluated_moves(self, board: 'Board', dice: List[int]) -> List[tuple]:
+        """
+        Picks the play whose resulting position the evaluator likes best.
+
+        All the distinct resulting positions are scored in a single evaluate_batch call, from
+        the opponent's point of view (the opponent is to move after the play).
+
+        Args:
+            board (Board): The current state of the game board. It is not modified.
+            dice (List[int]): The dice values available for the turn.
+
+        Returns:
+            List[tuple]: The chosen moves.
+        """
+        cells = _cells_of(board)
+        is_white = self.get_color() == 'white'
+        plays = generate_positions(cells, is_white, dice)
+        if len(plays) == 1:
+            return plays[0][0]
+        scores = self.__evaluator__.evaluate_batch([play[1] for play in plays], not is_white)
+        best = min(range(len(plays)), key=scores.__getitem__)
+        return plays[best][0]
+
+    def _choose_greedy_moves(self,
+                             temp_board: 'Board',
+                             dice: List[int],
+                             undo_stack: list) -> List[tuple]:
+        """
+        Runs the greedy search of choose_moves, applying each chosen move to the board.
+
+        Args:
+            temp_board (Board): The board to simulate on; every applied move is pushed to
+                undo_stack.
+            dice (List[int]): The dice values available for the turn.
+            undo_stack (list): Receives the undo records of the simulated moves.
+
+        Returns:
+            List[tuple]: The chosen moves.
+        """
         best_moves = []
-        temp_board = copy.deepcopy(board)
         temp_dice = sorted(list(set(dice)), reverse=True)  # Use unique dice, higher first
         
         if len(dice) > len(temp_dice): # Handle doubles
@@ -38,7 +186,7 @@ class AIPlayer(Player):
             move_found = None
 
             # Priority 1: Find a valid move from the bar
-            if temp_board.get_bar().get(self):
+            if temp_board.get_bar_count(self):
                 for d in temp_dice:
                     # The move logic in board.py handles the conversion from die to point
                     if temp_board.is_valid_move('bar', d, self):
@@ -86,10 +234,98 @@ class AIPlayer(Player):
                 
                 # Simulate the move on the temp board for the next iteration
                 from_point_sim, _ = move_found
-                temp_board.move_piece(from_point_sim, die_to_use, self)
+                undo_stack.append(temp_board.apply_move(from_point_sim, die_to_use, self))
 
             else:
                 # No more moves possible with the remaining dice
                 break
 
         return best_moves
+
+
+class SearchAIPlayer(AIPlayer):
+    """
+    A stronger AI player that looks ahead with depth-limited expectiminimax.
+
+    The search averages over the 21 distinct rolls at chance nodes (with Star1/Star2 pruning)
+    and remembers positions in a bounded transposition table that is kept between turns.
+    With a time budget it deepens iteratively, so a move is always ready when the time is up.
+    """
+
+    def __init__(self,
+                 name: str,
+                 color: str,
+                 depth: Optional[int] = 2,
+                 time_budget: Optional[float] = 1.0,
+                 table_size_bits: int = 16,
+                 bearoff_database: Optional['BearoffDatabase'] = None,
+                 evaluator: Optional['Evaluator'] = None,
+                 opening_book: Optional['OpeningBook'] = None):
+        """
+        Initializes the search AI.
+
+        Args:
+            name (str): The name of the player.
+            color (str): The color of the player's checkers ('white' or 'black').
+            depth (int, optional): Search depth in plies. Defaults to 2. With a time budget this is
+                the deepest iteration, and None deepens until the time runs out.
+            time_budget (float, optional): Maximum seconds per move, or None for a fixed-depth
+                search without limit. Defaults to 1.0.
+            table_size_bits (int, optional): The transposition table holds 2**table_size_bits
+                entries.
+            bearoff_database (BearoffDatabase, optional): Used instead of search for bear-offs
+                without contact.
+            evaluator (Evaluator, optional): Scores the leaves of the search instead of
+                evaluate_position.
+            opening_book (OpeningBook, optional): Consulted before searching.
+        """
+        super().__init__(name, color, bearoff_database, evaluator, opening_book)
+        self.__depth__ = depth
+        if depth is None and time_budget is None:
+            raise ValueError("a search without a time budget needs a depth")
+        self.__time_budget__ = time_budget
+        leaf_evaluator = evaluator if evaluator is not None else evaluate_position
+        self.__search__ = ExpectiminimaxSearch(TranspositionTable(table_size_bits), leaf_evaluator)
+
+    def get_search(self) -> ExpectiminimaxSearch:
+        """Returns the search engine (and through it, the transposition table) of this player."""
+        return self.__search__
+
+    def get_time_budget(self) -> Optional[float]:
+        """Returns the maximum seconds this player thinks per move (None if unlimited)."""
+        return self.__time_budget__
+
+    def set_time_budget(self, time_budget: Optional[float]):
+        """
+        Sets the maximum seconds this player thinks per move.
+
+        Args:
+            time_budget (float or None): The budget, or None for a fixed-depth search.
+        """
+        if time_budget is None and self.__depth__ is None:
+            raise ValueError("a search without a time budget needs a depth")
+        self.__time_budget__ = time_budget
+
+    def choose_moves(self, board: 'Board', dice: List[int]) -> List[tuple]:
+        """
+        Chooses the moves for the turn by expectiminimax search.
+
+        Args:
+            board (Board): The current state of the game board. It is not modified.
+            dice (List[int]): The dice values available for the turn.
+
+        Returns:
+            List[tuple]: A list of move tuples, e.g., [('bar', 22), (5, 3)].
+        """
+        book_moves = self._choose_book_moves(board, dice)
+        if book_moves is not None:
+            return book_moves
+        bearoff_moves = self._choose_bearoff_moves(board, dice)
+        if bearoff_moves is not None:
+            return bearoff_moves
+        cells = _cells_of(board)
+        is_white = self.get_color() == 'white'
+        if self.__time_budget__ is None:
+            return self.__search__.choose_play(cells, is_white, dice, self.__depth__)
+        return self.__search__.iterative_play(cells, is_white, dice, self.__depth__,
+                                              self.__time_budget__)
@@ -0,0 +1,514 @@
+from __future__ import annotations
+from array import array
+from typing import TYPE_CHECKING
+from core.checkers import Checkers
+from core.board import Board, MoveUndo
+from core.position_id import encode_position, decode_position
+from core.zobrist import CELL_KEYS, hash_cells, side_to_move_key
+import random
+
+if TYPE_CHECKING:
+    from core.player import Player
+
+# Layout of the 28 cells of an ArrayBoard.
+# Cells 0-23 are the points: positive counts are white checkers, negative counts are black checkers.
+WHITE_BAR = 24
+BLACK_BAR = 25
+WHITE_OFF = 26
+BLACK_OFF = 27
+NUM_CELLS = 28
+
+START_POSITION = (
+    -2, 0, 0, 0, 0, 5, 0, 3, 0, 0, 0, -5,
+    5, 0, 0, 0, -3, 0, -5, 0, 0, 0, 0, 2,
+    0, 0, 0, 0,
+)
+
+
+class ArrayBoard:
+    """
+    Compact Backgammon board engine backed by a fixed-size signed int array.
+
+    Exposes the same API as Board, but stores the whole position in 28 signed bytes
+    (24 points, bar and off counts for each side) instead of lists of Checkers objects.
+    Ownership checks are a sign test instead of a Player comparison.
+    """
+
+    __slots__ = ('__player1__', '__player2__', '__winner__', '__cells__', '__tokens__',
+                 '__zobrist__', '__hash_dirty__', '__home__', '__counters_dirty__')
+
+    def __init__(self, player1: 'Player', player2: 'Player', random_positions: bool = False):
+        """
+        Initializes the ArrayBoard object.
+
+        Args:
+            player1 (Player): The first player (white).
+            player2 (Player): The second player (black).
+            random_positions (bool, optional): Whether to set up the board with random checker positions. Defaults to False.
+        """
+        self.__player1__ = player1  # White
+        self.__player2__ = player2  # Black
+        self.__winner__ = None
+        self.__cells__ = self._create_cells(random_positions)
+        # A single shared Checkers per side is enough to answer get_point() queries.
+        self.__tokens__ = (Checkers(player1), Checkers(player2))
+        self.__zobrist__ = 0
+        self.__hash_dirty__ = True
+        # Checkers in the home board, indexed 0 for white and 1 for black (see Board).
+        self.__home__ = [0, 0]
+        self.__counters_dirty__ = True
+
+    @classmethod
+    def from_board(cls, board: 'Board') -> 'ArrayBoard':
+        """
+        Builds an ArrayBoard holding the same position as a list-based Board.
+
+        Args:
+            board (Board): The board to convert.
+
+        Returns:
+            ArrayBoard: A new board with the same checkers, bar, off counts and winner.
+        """
+        player1, player2 = board.get_players()
+        new_board = cls(player1, player2)
+        cells = new_board.__cells__
+        # Read through get_point/get_bar_count: get_points/get_bar would mark the source
+        # board's hash and counters as stale.
+        for i in range(24):
+            point = board.get_point(i)
+            if point:
+                cells[i] = len(point) if point[0].get_owner() == player1 else -len(point)
+            else:
+                cells[i] = 0
+        cells[WHITE_BAR] = board.get_bar_count(player1)
+        cells[BLACK_BAR] = board.get_bar_count(player2)
+        cells[WHITE_OFF] = board.get_off_board_count(player1)
+        cells[BLACK_OFF] = board.get_off_board_count(player2)
+        new_board.__winner__ = board.get_winner()
+        return new_board
+
+    def _create_cells(self, random_positions: bool = False):
+        """
+        Creates the initial cell array.
+
+        Args:
+            random_positions (bool, optional): If True, places checkers randomly. Defaults to False.
+
+        Returns:
+            array: A signed byte array of NUM_CELLS entries.
+        """
+        if not random_positions:
+            return array('b', START_POSITION)
+
+        cells = array('b', bytes(NUM_CELLS))
+        for sign in (1, -1):
+            remaining_checkers = 15
+            while remaining_checkers > 0:
+                point_index = random.randrange(24)
+                if cells[point_index] * sign >= 0:
+                    num_to_place = random.randint(1, remaining_checkers)
+                    cells[point_index] += sign * num_to_place
+                    remaining_checkers -= num_to_place
+        return cells
+
+    def copy(self) -> 'ArrayBoard':
+        """Returns an independent copy of this board."""
+        new_board = ArrayBoard.__new__(ArrayBoard)
+        new_board.__player1__ = self.__player1__
+        new_board.__player2__ = self.__player2__
+        new_board.__winner__ = self.__winner__
+        new_board.__cells__ = array('b', self.__cells__)
+        new_board.__tokens__ = self.__tokens__
+        new_board.__zobrist__ = self.__zobrist__
+        new_board.__hash_dirty__ = self.__hash_dirty__
+        new_board.__home__ = self.__home__[:]
+        new_board.__counters_dirty__ = self.__counters_dirty__
+        return new_board
+
+    def get_cells(self):
+        """
+        Returns the raw cell array (see the module constants for its layout).
+
+        Since callers may modify the live array, the position hash and the home counters are
+        recomputed on their next use. Callers that only read should use get_cells_snapshot.
+
+        Returns:
+            array: The live signed byte array backing this board.
+        """
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
+        return self.__cells__
+
+    def get_cells_snapshot(self) -> tuple:
+        """
+        Returns a copy of the cells, for callers that only read them.
+
+        Unlike get_cells, this leaves the incrementally maintained position hash valid.
+
+        Returns:
+            tuple: The 28 cell values.
+        """
+        return tuple(self.__cells__)
+
+    def get_players(self):
+        """Returns the (white, black) players of this board."""
+        return self.__player1__, self.__player2__
+
+    def get_point(self, index: int):
+        """
+        Returns the checkers at a specific point on the board.
+
+        Args:
+            index (int): The point index (0-23).
+
+        Returns:
+            list: A list of Checkers at the specified point. The list is a snapshot;
+            modifying it does not change the board.
+
+        Raises:
+            IndexError: If the index is out of bounds.
+        """
+        if not 0 <= index < 24:
+            raise IndexError("Invalid point index")
+        count = self.__cells__[index]
+        if count > 0:
+            return [self.__tokens__[0]] * count
+        return [self.__tokens__[1]] * -count
+
+    def get_points(self):
+        """Returns a snapshot of all 24 points as lists of Checkers."""
+        return [self.get_point(i) for i in range(24)]
+
+    def get_bar(self):
+        """Returns a snapshot of the bar as a dictionary of player to Checkers."""
+        cells = self.__cells__
+        return {
+            self.__player1__: [self.__tokens__[0]] * cells[WHITE_BAR],
+            self.__player2__: [self.__tokens__[1]] * cells[BLACK_BAR],
+        }
+
+    def get_bar_count(self, player: 'Player'):
+        """Returns the number of checkers a player has on the bar."""
+        return self.__cells__[WHITE_BAR if player.get_color() == 'white' else BLACK_BAR]
+
+    def get_off_board_count(self, player: 'Player'):
+        """Returns the number of checkers a player has borne off."""
+        return self.__cells__[WHITE_OFF if player.get_color() == 'white' else BLACK_OFF]
+
+    def _set_off_board_count(self, player: 'Player', count: int):
+        """Sets the number of checkers a player has borne off (for testing)."""
+        self.__cells__[WHITE_OFF if player.get_color() == 'white' else BLACK_OFF] = count
+        self.__hash_dirty__ = True
+
+    def get_winner(self):
+        """Returns the winner of the game, if any."""
+        return self.__winner__
+
+    def position_hash(self, player: 'Player' = None) -> int:
+        """
+        Returns the 64-bit Zobrist hash of the position, usable as a dictionary key.
+
+        Args:
+            player (Player, optional): The side to move. If given, it is mixed into the hash.
+
+        Returns:
+            int: The position hash.
+        """
+        if self.__hash_dirty__:
+            self.__zobrist__ = hash_cells(self.__cells__)
+            self.__hash_dirty__ = False
+        return self.__zobrist__ ^ side_to_move_key(player)
+
+    def get_position_id(self, player: 'Player') -> str:
+        """
+        Returns the canonical position ID (see core.position_id).
+
+        Args:
+            player (Player): The side to move.
+
+        Returns:
+            str: A 15-character ID.
+        """
+        return encode_position(self.__cells__, player.get_color() == 'white')
+
+    def set_position_id(self, position_id: str) -> 'Player':
+        """
+        Replaces the position with the one described by a position ID.
+
+        Args:
+            position_id (str): An ID returned by get_position_id.
+
+        Returns:
+            Player: The side to move.
+
+        Raises:
+            ValueError: If the ID is malformed.
+        """
+        cells, is_white = decode_position(position_id)
+        self.__cells__[:] = array('b', cells)
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
+        self.__winner__ = (self.__player1__ if cells[WHITE_OFF] == 15 else
+                           self.__player2__ if cells[BLACK_OFF] == 15 else None)
+        return self.__player1__ if is_white else self.__player2__
+
+    def is_valid_move(self, from_point, die: int, player: 'Player'):
+        """
+        Checks if a move is valid according to the rules of Backgammon.
+
+        Args:
+            from_point (str or int): The starting point ('bar' or 0-23).
+            die (int): The value of the die to use for the move.
+            player (Player): The player making the move.
+
+        Returns:
+            bool: True if the move is valid, False otherwise.
+        """
+        if die <= 0: return False
+        cells = self.__cells__
+
+        if player.get_color() == 'white':
+            if from_point == 'bar':
+                if not cells[WHITE_BAR]: return False
+                to_point = 24 - die
+            else:
+                if cells[WHITE_BAR] or cells[from_point] <= 0: return False
+                to_point = from_point - die
+            if to_point < 0:
+                return from_point != 'bar' and self.is_valid_bear_off_move(from_point, die, player)
+            return cells[to_point] >= -1
+
+        if from_point == 'bar':
+            if not cells[BLACK_BAR]: return False
+            to_point = die - 1
+        else:
+            if cells[BLACK_BAR] or cells[from_point] >= 0: return False
+            to_point = from_point + die
+        if to_point > 23:
+            return from_point != 'bar' and self.is_valid_bear_off_move(from_point, die, player)
+        return cells[to_point] <= 1
+
+    def move_piece(self, from_point, die: int, player: 'Player'):
+        """
+        Moves a checker on the board.
+
+        Args:
+            from_point (str or int): The starting point ('bar' or 0-23).
+            die (int): The die value used for the move.
+            player (Player): The player making the move.
+
+        Raises:
+            ValueError: If the move is invalid.
+        """
+        self.apply_move(from_point, die, player)
+
+    def apply_move(self, from_point, die: int, player: 'Player') -> MoveUndo:
+        """
+        Moves a checker on the board and returns a record that can revert it.
+
+        Args:
+            from_point (str or int): The starting point ('bar' or 0-23).
+            die (int): The die value used for the move.
+            player (Player): The player making the move.
+
+        Returns:
+            MoveUndo: The information needed by undo_move to restore the previous position.
+
+        Raises:
+            ValueError: If the move is invalid.
+        """
+        if not self.is_valid_move(from_point, die, player):
+            raise ValueError("Invalid move")
+
+        cells = self.__cells__
+        previous_winner = self.__winner__
+        if self.__hash_dirty__:
+            self.__zobrist__ = hash_cells(cells)
+            self.__hash_dirty__ = False
+        previous_hash = self.__zobrist__
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        home = self.__home__
+        previous_counters = (home[0], home[1])
+
+        if player.get_color() == 'white':
+            sign, bar, off, opponent_bar = 1, WHITE_BAR, WHITE_OFF, BLACK_BAR
+            side, home_low, home_high = 0, 0, 5
+            checker, opponent = self.__tokens__
+            to_point = 24 - die if from_point == 'bar' else from_point - die
+        else:
+            sign, bar, off, opponent_bar = -1, BLACK_BAR, BLACK_OFF, WHITE_BAR
+            side, home_low, home_high = 1, 18, 23
+            opponent, checker = self.__tokens__
+            to_point = die - 1 if from_point == 'bar' else from_point + die
+
+        if from_point == 'bar':
+            from_index, from_value = bar, cells[bar] - 1
+        else:
+            from_index, from_value = from_point, cells[from_point] - sign
+            if home_low <= from_point <= home_high:
+                home[side] -= 1
+        h = previous_hash ^ CELL_KEYS[from_index][cells[from_index] + 15] ^ CELL_KEYS[from_index][from_value + 15]
+        cells[from_index] = from_value
+
+        hit = None
+        if not 0 <= to_point < 24:
+            to_point = 'off'
+            h ^= CELL_KEYS[off][cells[off] + 15] ^ CELL_KEYS[off][cells[off] + 16]
+            cells[off] += 1
+            if cells[off] == 15: self.__winner__ = player
+        else:
+            to_value = cells[to_point]
+            if home_low <= to_point <= home_high:
+                home[side] += 1
+            if to_value == -sign:
+                hit = opponent
+                # The opponent's home board is the mirror of ours
+                if 23 - home_high <= to_point <= 23 - home_low:
+                    home[1 - side] -= 1
+                h ^= CELL_KEYS[opponent_bar][cells[opponent_bar] + 15] ^ CELL_KEYS[opponent_bar][cells[opponent_bar] + 16]
+                cells[opponent_bar] += 1
+                to_value = 0
+            h ^= CELL_KEYS[to_point][cells[to_point] + 15] ^ CELL_KEYS[to_point][to_value + sign + 15]
+            cells[to_point] = to_value + sign
+
+        self.__zobrist__ = h
+        return MoveUndo(from_point, to_point, player, checker, hit, previous_winner, previous_hash,
+                        previous_counters)
+
+    def undo_move(self, record: MoveUndo):
+        """
+        Reverts a move made with apply_move, including hits and bear-offs.
+
+        Moves must be undone in the reverse order in which they were applied.
+
+        Args:
+            record (MoveUndo): The record returned by apply_move.
+        """
+        cells = self.__cells__
+        sign = 1 if record.player.get_color() == 'white' else -1
+        to_point = record.to_point
+        if to_point == 'off':
+            cells[WHITE_OFF if sign == 1 else BLACK_OFF] -= 1
+        else:
+            cells[to_point] -= sign
+            if record.hit_checker is not None:
+                cells[BLACK_BAR if sign == 1 else WHITE_BAR] -= 1
+                cells[to_point] = -sign
+
+        if record.from_point == 'bar':
+            cells[WHITE_BAR if sign == 1 else BLACK_BAR] += 1
+        else:
+            cells[record.from_point] += sign
+        self.__winner__ = record.previous_winner
+        self.__zobrist__ = record.previous_hash
+        if record.previous_counters:
+            self.__home__[0], self.__home__[1] = record.previous_counters
+
+    def can_player_bear_off(self, player: 'Player'):
+        """
+        Checks if a player is in a position to start bearing off checkers.
+
+        Args:
+            player (Player): The player to check.
+
+        Returns:
+            bool: True if the player can bear off, False otherwise.
+        """
+        cells = self.__cells__
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        if player.get_color() == 'white':
+            return not cells[WHITE_BAR] and self.__home__[0] + cells[WHITE_OFF] == 15
+        return not cells[BLACK_BAR] and self.__home__[1] + cells[BLACK_OFF] == 15
+
+    def _refresh_counters(self):
+        """Recomputes the home counters from scratch."""
+        cells = self.__cells__
+        self.__home__ = [sum(c for c in cells[0:6] if c > 0), -sum(c for c in cells[18:24] if c < 0)]
+        self.__counters_dirty__ = False
+
+    def is_valid_bear_off_move(self, from_point, die, player):
+        """
+        Checks if a bear-off move is valid.
+
+        Args:
+            from_point (int): The point from which to bear off.
+            die (int): The value of the die used.
+            player (Player): The player making the move.
+
+        Returns:
+            bool: True if the bear-off move is valid, False otherwise.
+        """
+        if not self.can_player_bear_off(player):
+            return False
+
+        if player.get_color() == 'white':  # Home is 0-5
+            if from_point > 5: return False
+            # Exact roll only
+            return (from_point + 1) == die
+        # Black, home is 18-23
+        if from_point < 18: return False
+        # Exact roll only
+        return (24 - from_point) == die
+
+    def get_possible_moves_for_checker(self, from_point, player, dice):
+        """
+        Gets all possible moves for a single checker.
+
+        Args:
+            from_point (str or int): The starting point of the checker.
+            player (Player): The player who owns the checker.
+            dice (list): A list of available dice values.
+
+        Returns:
+            list: A list of possible destination points (int or 'off').
+        """
+        moves = []
+        is_white = player.get_color() == 'white'
+        for die in set(dice):
+            if self.is_valid_move(from_point, die, player):
+                if from_point == 'bar':
+                    to_point = 24 - die if is_white else die - 1
+                else:
+                    to_point = from_point - die if is_white else from_point + die
+                if 0 <= to_point < 24:
+                    moves.append(to_point)
+                else:
+                    moves.append("off")
+        return moves
+
+    def has_any_valid_moves(self, player, dice):
+        """
+        Checks if the player has any valid moves with the available dice.
+
+        Args:
+            player (Player): The player to check.
+            dice (list): A list of available dice values.
+
+        Returns:
+            bool: True if there is at least one valid move, False otherwise.
+        """
+        cells = self.__cells__
+        sign = 1 if player.get_color() == 'white' else -1
+        if cells[WHITE_BAR if sign == 1 else BLACK_BAR]:
+            for die in dice:
+                if self.is_valid_move('bar', die, player): return True
+            return False
+        for i in range(24):
+            if cells[i] * sign > 0:
+                for die in dice:
+                    if self.is_valid_move(i, die, player): return True
+        return False
+
+    def find_die_for_bear_off(self, from_point, player, dice):
+        """
+        Finds the exact die required for a bear-off move and checks if it's available.
+        Returns the die value if valid, otherwise None.
+        """
+        required_die = (from_point + 1) if player.get_color() == 'white' else (24 - from_point)
+
+        if required_die in dice:
+            if self.is_valid_bear_off_move(from_point, required_die, player):
+                return required_die
+        return None
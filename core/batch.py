@@ -0,0 +1,164 @@
+"""
+Vectorized move legality and move application for many boards at once.
+
+Boards are stacked as an (N, 28) int8 array in the ArrayBoard cell layout. The legality
+rules mirror Board.is_valid_move and Board.is_valid_bear_off_move: entering from the bar
+comes first, a point with two or more opposing checkers is blocked, and bearing off needs
+all 15 checkers home (or off) and an exact roll.
+
+Origins and destinations use column 24 for the bar and -1 for "off".
+"""
+from __future__ import annotations
+from typing import Iterable, Tuple
+import numpy as np
+
+BAR = 24
+OFF = -1
+
+# Mirror permutation from white's to black's point of view (and back).
+_MIRROR = np.array(list(range(23, -1, -1)) + [25, 24, 27, 26])
+_MIRROR_SIGN = np.array([-1] * 24 + [1] * 4, dtype=np.int8)
+_POINTS = np.arange(24)
+
+
+def stack_boards(boards: Iterable) -> np.ndarray:
+    """
+    Stacks ArrayBoard objects into an (N, 28) int8 array.
+
+    Args:
+        boards (iterable of ArrayBoard): The boards to stack.
+
+    Returns:
+        np.ndarray: The stacked cells.
+    """
+    return np.array([board.get_cells_snapshot() for board in boards], dtype=np.int8).reshape(-1, 28)
+
+
+def _as_rows(value, n: int, dtype) -> np.ndarray:
+    """Broadcasts a scalar or per-board value to an (N,) array."""
+    return np.broadcast_to(np.asarray(value, dtype=dtype), (n,))
+
+
+def to_perspective(boards: np.ndarray, is_white) -> np.ndarray:
+    """
+    Converts boards to the mover's perspective (mover positive, moving from 23 towards 0).
+
+    Args:
+        boards (np.ndarray): (N, 28) int8 cells.
+        is_white (bool or np.ndarray): Side to move, for all boards or per board.
+
+    Returns:
+        np.ndarray: A new (N, 28) int8 array. The conversion is its own inverse.
+    """
+    is_white = _as_rows(is_white, len(boards), bool)
+    result = np.array(boards, dtype=np.int8, copy=True)
+    black = ~is_white
+    if black.any():
+        result[black] = boards[black][:, _MIRROR] * _MIRROR_SIGN
+    return result
+
+
+def _can_bear_off(c: np.ndarray) -> np.ndarray:
+    """Per-board bear-off eligibility in the mover's perspective."""
+    home = np.clip(c[:, :6], 0, None).sum(axis=1, dtype=np.int16)
+    return (c[:, 24] == 0) & (home + c[:, 26] == 15)
+
+
+def _perspective_mask(c: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """Legality mask (N, 25) in the mover's perspective; column 24 is the bar."""
+    n = len(c)
+    rows = np.arange(n)
+    on_bar = c[:, 24] > 0
+    die = dice[:, None].astype(np.int16)
+
+    targets = _POINTS[None, :] - die  # (N, 24)
+    destination = np.take_along_axis(c[:, :24], np.clip(targets, 0, 23), axis=1)
+    lands = (targets >= 0) & (destination >= -1)
+    bears_off = (targets == -1) & _can_bear_off(c)[:, None]
+    mask = np.zeros((n, 25), dtype=bool)
+    mask[:, :24] = (c[:, :24] > 0) & (lands | bears_off) & ~on_bar[:, None]
+
+    entry = np.clip(24 - dice.astype(np.int16), 0, 23)
+    mask[:, 24] = on_bar & (dice > 0) & (dice <= 24) & (c[rows, entry] >= -1)
+    mask[dice <= 0] = False
+    return mask
+
+
+def legal_move_mask(boards: np.ndarray, dice, is_white) -> np.ndarray:
+    """
+    Computes which origins can legally move with a die, for every board.
+
+    Args:
+        boards (np.ndarray): (N, 28) int8 cells.
+        dice (int or np.ndarray): The die value, for all boards or per board.
+        is_white (bool or np.ndarray): Side to move, for all boards or per board.
+
+    Returns:
+        np.ndarray: (N, 25) bool mask in board coordinates; column i < 24 is point i and
+        column 24 is the bar.
+    """
+    n = len(boards)
+    is_white = _as_rows(is_white, n, bool)
+    mask = _perspective_mask(to_perspective(boards, is_white), _as_rows(dice, n, np.int16))
+    black = ~is_white
+    mask[black, :24] = mask[black, 23::-1]
+    return mask
+
+
+def apply_moves(boards: np.ndarray, origins, dice, is_white) -> np.ndarray:
+    """
+    Applies one legal move per board.
+
+    Args:
+        boards (np.ndarray): (N, 28) int8 cells.
+        origins (np.ndarray): (N,) origin per board in board coordinates (24 for the bar).
+        dice (int or np.ndarray): The die value, for all boards or per board.
+        is_white (bool or np.ndarray): Side to move, for all boards or per board.
+
+    Returns:
+        np.ndarray: The (N, 28) resulting positions. The moves are assumed to be legal,
+        e.g. taken from legal_move_mask.
+    """
+    n = len(boards)
+    rows = np.arange(n)
+    is_white = _as_rows(is_white, n, bool)
+    dice = _as_rows(dice, n, np.int16)
+    origins = np.asarray(origins, dtype=np.int16)
+
+    c = to_perspective(boards, is_white)
+    from_bar = origins == BAR
+    origins = np.where(from_bar | is_white, origins, 23 - origins)
+    c[rows, origins] -= 1  # Column 24 is the mover's bar in perspective
+
+    targets = np.where(from_bar, 24, origins) - dice
+    off = targets < 0
+    c[off, 26] += 1
+
+    on_board = ~off
+    rows, targets = rows[on_board], targets[on_board]
+    hit = c[rows, targets] == -1
+    c[rows[hit], targets[hit]] = 0
+    c[rows[hit], 25] += 1
+    c[rows, targets] += 1
+    return to_perspective(c, is_white)
+
+
+def successors(boards: np.ndarray, die: int, is_white) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generates every position reachable with one die from every board.
+
+    Args:
+        boards (np.ndarray): (N, 28) int8 cells.
+        die (int or np.ndarray): The die value, for all boards or per board.
+        is_white (bool or np.ndarray): Side to move, for all boards or per board.
+
+    Returns:
+        tuple: (parents, origins, children), where parents[k] is the index of the board that
+        children[k] was reached from and origins[k] the origin moved (24 for the bar).
+    """
+    n = len(boards)
+    is_white = _as_rows(is_white, n, bool)
+    dice = _as_rows(die, n, np.int16)
+    parents, origins = np.nonzero(legal_move_mask(boards, dice, is_white))
+    children = apply_moves(boards[parents], origins, dice[parents], is_white[parents])
+    return parents, origins, children
@@ -0,0 +1,293 @@
+"""
+One-sided bear-off database.
+
+For every home-board configuration of up to 15 checkers, the database stores the expected
+number of rolls needed to bear everything off and the distribution of that number, assuming
+no contact and the bear-off rules used by Board (exact rolls only). The file is written once
+by the generator and opened with mmap, so every process that uses it shares the same pages.
+
+Usage:
+    python -m core.bearoff bearoff.db [--checkers 15]
+"""
+from __future__ import annotations
+from array import array
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+import argparse
+import mmap
+import struct
+import sys
+
+MAGIC = b'BGBO'
+VERSION = 1
+NUM_POINTS = 6
+# Rolls tracked in the distribution; the last bucket also holds every longer bear-off.
+DEFAULT_MAX_ROLLS = 32
+_HEADER = struct.Struct('<4sHHHI')
+_PROBABILITY_SCALE = 65535
+
+ROLLS = tuple(
+    ((d1,) * 4 if d1 == d2 else (d1, d2), (1 if d1 == d2 else 2) / 36)
+    for d1 in range(1, 7) for d2 in range(d1, 7)
+)
+
+
+def _rank_table(max_checkers: int):
+    """
+    Builds the offsets used to rank positions.
+
+    table[i][remaining][count] is the number of positions that come before one with ``count``
+    checkers on point i, given ``remaining`` checkers left for points i..5.
+    """
+    table = []
+    for i in range(NUM_POINTS):
+        points_after = NUM_POINTS - 1 - i
+        rows = []
+        for remaining in range(max_checkers + 1):
+            offsets = [0]
+            for value in range(remaining):
+                offsets.append(offsets[-1] + comb(remaining - value + points_after, points_after))
+            rows.append(offsets)
+        table.append(rows)
+    return table
+
+
+def num_positions(max_checkers: int) -> int:
+    """Returns the number of home-board configurations with at most max_checkers checkers."""
+    return comb(max_checkers + NUM_POINTS, NUM_POINTS)
+
+
+def position_index(counts: Sequence[int], table) -> int:
+    """
+    Returns the index of a configuration in the database.
+
+    Args:
+        counts (sequence of int): Checkers on the 1- to 6-point of the side bearing off.
+        table: The rank table of the database (see _rank_table).
+
+    Returns:
+        int: The position index.
+    """
+    index = 0
+    remaining = len(table[0]) - 1
+    for i in range(NUM_POINTS):
+        count = counts[i]
+        index += table[i][remaining][count]
+        remaining -= count
+    return index
+
+
+def _all_positions(max_checkers: int) -> List[Tuple[int, ...]]:
+    """Lists every configuration of at most max_checkers checkers on six points."""
+    positions = []
+
+    def place(prefix, remaining):
+        if len(prefix) == NUM_POINTS:
+            positions.append(tuple(prefix))
+            return
+        for count in range(remaining + 1):
+            place(prefix + [count], remaining - count)
+
+    place([], max_checkers)
+    return positions
+
+
+def successors(counts: Tuple[int, ...], dice) -> List[Tuple[int, ...]]:
+    """
+    Lists the configurations reachable with a roll under the rules enforced by movegen.
+
+    As many dice as possible must be played, and the larger one if only one can be used.
+    A checker leaves from point i with die i + 1 only (exact bear-off).
+
+    Args:
+        counts (tuple of int): Checkers on the 1- to 6-point.
+        dice (sequence of int): The dice of the roll.
+
+    Returns:
+        list: The distinct resulting configurations (the start one if nothing can move).
+    """
+    results: Dict[Tuple[int, ...], Tuple[int, int]] = {}
+    doubles = len(set(dice)) == 1
+
+    def search(position, remaining, used, first_die, highest):
+        moved = False
+        for die in set(remaining):
+            rest = list(remaining)
+            rest.remove(die)
+            for i in range(min(highest, NUM_POINTS - 1), -1, -1):
+                if not position[i] or i - die < -1:
+                    continue
+                moved = True
+                after = list(position)
+                after[i] -= 1
+                if i - die >= 0:
+                    after[i - die] += 1
+                search(tuple(after), rest, used + 1, first_die or die, i if doubles else NUM_POINTS)
+        if not moved:
+            best = results.get(position)
+            if best is None or (used, first_die) > best:
+                results[position] = (used, first_die)
+
+    search(tuple(counts), list(dice), 0, 0, NUM_POINTS)
+    longest = max(used for used, _ in results.values())
+    plays = {p: first for p, (used, first) in results.items() if used == longest}
+    if longest == 1 and len(set(dice)) > 1:
+        largest = max(plays.values())
+        plays = {p: first for p, first in plays.items() if first == largest}
+    return list(plays)
+
+
+def generate_database(path: str, max_checkers: int = 15, max_rolls: int = DEFAULT_MAX_ROLLS,
+                      progress=None):
+    """
+    Builds the database by dynamic programming and writes it to a binary file.
+
+    The file holds a header, a float32 expected-rolls table and a uint16 table of
+    max_rolls probabilities per position (scaled by 65535), all little-endian.
+
+    Args:
+        path (str): The output file.
+        max_checkers (int, optional): Largest number of checkers in a configuration.
+        max_rolls (int, optional): Length of the stored roll distribution.
+        progress (callable, optional): Called with (done, total) while generating.
+    """
+    table = _rank_table(max_checkers)
+    positions = _all_positions(max_checkers)
+    positions.sort(key=lambda p: sum((i + 1) * c for i, c in enumerate(p)))
+    total = len(positions)
+    expected = [0.0] * total
+    distributions: List[List[float]] = [None] * total
+
+    for done, position in enumerate(positions):
+        index = position_index(position, table)
+        if not any(position):
+            expected[index] = 0.0
+            distributions[index] = [1.0] + [0.0] * (max_rolls - 1)
+            continue
+
+        stuck = 0.0
+        moves = []
+        expected_sum = 1.0
+        for dice, probability in ROLLS:
+            best = None
+            for after in successors(position, dice):
+                if after == position:
+                    continue
+                after_index = position_index(after, table)
+                if best is None or expected[after_index] < expected[best]:
+                    best = after_index
+            if best is None:
+                stuck += probability
+            else:
+                moves.append((probability, distributions[best]))
+                expected_sum += probability * expected[best]
+        expected[index] = expected_sum / (1.0 - stuck)
+
+        distribution = [0.0] * max_rolls
+        for n in range(1, max_rolls):
+            value = stuck * distribution[n - 1]
+            for probability, after in moves:
+                value += probability * after[n - 1]
+            distribution[n] = value
+        distribution[-1] += max(0.0, 1.0 - sum(distribution))
+        distributions[index] = distribution
+        if progress is not None and done % 1000 == 0:
+            progress(done, total)
+
+    expected_table = array('f', expected)
+    probability_table = array('H', (round(p * _PROBABILITY_SCALE)
+                                    for distribution in distributions for p in distribution))
+    if sys.byteorder != 'little':
+        expected_table.byteswap()
+        probability_table.byteswap()
+    with open(path, 'wb') as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, max_checkers, max_rolls, total))
+        expected_table.tofile(handle)
+        probability_table.tofile(handle)
+
+
+class BearoffDatabase:
+    """
+    Read-only, memory-mapped view of a bear-off database file.
+
+    Lookups read straight from the mapping, so nothing is loaded into the process heap and
+    processes opening the same file share its pages.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a database file.
+
+        Args:
+            path (str): The file written by generate_database.
+
+        Raises:
+            ValueError: If the file is not a bear-off database.
+        """
+        with open(path, 'rb') as handle:
+            self.__mmap__ = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_checkers, max_rolls, total = _HEADER.unpack_from(self.__mmap__, 0)
+        if magic != MAGIC or version != VERSION:
+            self.__mmap__.close()
+            raise ValueError(f"{path} is not a bear-off database")
+        self.__max_checkers__ = max_checkers
+        self.__max_rolls__ = max_rolls
+        self.__table__ = _rank_table(max_checkers)
+        self.__expected_offset__ = _HEADER.size
+        self.__distribution_offset__ = _HEADER.size + 4 * total
+        self.__distribution_struct__ = struct.Struct(f'<{max_rolls}H')
+
+    def close(self):
+        """Releases the memory mapping."""
+        self.__mmap__.close()
+
+    def get_max_checkers(self) -> int:
+        """Returns the largest number of checkers covered by the database."""
+        return self.__max_checkers__
+
+    def covers(self, counts: Sequence[int]) -> bool:
+        """Returns True if the configuration is in the database."""
+        return len(counts) == NUM_POINTS and sum(counts) <= self.__max_checkers__
+
+    def expected_rolls(self, counts: Sequence[int]) -> float:
+        """
+        Returns the expected number of rolls to bear off a configuration.
+
+        Args:
+            counts (sequence of int): Checkers on the 1- to 6-point.
+
+        Returns:
+            float: The expected number of rolls.
+        """
+        index = position_index(counts, self.__table__)
+        return struct.unpack_from('<f', self.__mmap__, self.__expected_offset__ + 4 * index)[0]
+
+    def distribution(self, counts: Sequence[int]) -> List[float]:
+        """
+        Returns the probability of bearing off in exactly n rolls, for each n.
+
+        Args:
+            counts (sequence of int): Checkers on the 1- to 6-point.
+
+        Returns:
+            list: max_rolls probabilities; the last one includes all longer bear-offs.
+        """
+        index = position_index(counts, self.__table__)
+        offset = self.__distribution_offset__ + 2 * self.__max_rolls__ * index
+        return [value / _PROBABILITY_SCALE
+                for value in self.__distribution_struct__.unpack_from(self.__mmap__, offset)]
+
+
+def main(argv=None):
+    """Command-line entry point that builds a database file."""
+    parser = argparse.ArgumentParser(description="Build the one-sided bear-off database.")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--checkers", type=int, default=15, help="maximum checkers per side")
+    parser.add_argument("--rolls", type=int, default=DEFAULT_MAX_ROLLS, help="distribution length")
+    args = parser.parse_args(argv)
+    generate_database(args.path, args.checkers, args.rolls,
+                      progress=lambda done, total: print(f"{done}/{total}", file=sys.stderr))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Optional, TYPE_CHECKING
 from core.checkers import Checkers
+from core.position_id import encode_position, decode_position
+from core.zobrist import CELL_KEYS, side_to_move_key
 import random
 
 if TYPE_CHECKING:
@@ -8,6 +10,31 @@ if TYPE_CHECKING:
     from core.ai import AIPlayer
 
 
+class MoveUndo(NamedTuple):
+    """
+    Undo record returned by Board.apply_move.
+
+    Attributes:
+        from_point (str or int): The starting point ('bar' or 0-23).
+        to_point (str or int): The destination point (0-23 or 'off').
+        player (Player): The player who moved.
+        checker (Checkers): The checker that was moved.
+        hit_checker (Checkers or None): The opponent checker sent to the bar, if any.
+        previous_winner (Player or None): The winner before the move.
+        previous_hash (int): The Zobrist hash of the position before the move.
+        previous_counters (tuple): The pip and home counters before the move (Board), or the
+            home counters before the move (ArrayBoard).
+    """
+    from_point: object
+    to_point: object
+    player: 'Player'
+    checker: Checkers
+    hit_checker: Optional[Checkers]
+    previous_winner: Optional['Player']
+    previous_hash: int = 0
+    previous_counters: tuple = ()
+
+
 class Board:
     """
     Manages the Backgammon board state and move validation.
@@ -28,6 +55,13 @@ class Board:
         self.__points__ = self._create_points(random_positions)
         self.__bar__: Dict['Player', List[Checkers]] = {player1: [], player2: []}
         self.__off_board__: Dict['Player', int] = {player1: 0, player2: 0}
+        self.__zobrist__ = 0
+        self.__hash_dirty__ = True
+        # Pip count and checkers in the home board, indexed 0 for white and 1 for black
+        # (lists rather than Player-keyed dicts keep the updates in apply_move cheap).
+        self.__pips__ = [0, 0]
+        self.__home__ = [0, 0]
+        self.__counters_dirty__ = True
 
     def _create_points(self, random_positions: bool = False):
         """
@@ -82,13 +116,31 @@ class Board:
         raise IndexError("Invalid point index")
 
     def get_points(self):
-        """Returns the entire list of points on the board."""
+        """
+        Returns the entire list of points on the board.
+
+        The returned list is the live board state; since callers may modify it directly,
+        the position hash and the pip and home counters are recomputed on their next use.
+        Callers that only read should use get_point, which keeps them valid.
+        """
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
         return self.__points__
 
+    def get_players(self):
+        """Returns the (white, black) players of this board."""
+        return self.__player1__, self.__player2__
+
     def get_bar(self):
-        """Returns the dictionary representing the bar."""
+        """Returns the dictionary representing the bar (live state, see get_points; prefer get_bar_count)."""
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
         return self.__bar__
 
+    def get_bar_count(self, player: 'Player'):
+        """Returns the number of checkers a player has on the bar."""
+        return len(self.__bar__.get(player, ()))
+
     def get_off_board_count(self, player: 'Player'):
         """Returns the number of checkers a player has borne off."""
         return self.__off_board__.get(player, 0)
@@ -96,11 +148,131 @@ class Board:
     def _set_off_board_count(self, player: 'Player', count: int):
         """Sets the number of checkers a player has borne off (for testing)."""
         self.__off_board__[player] = count
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
+
+    def get_pip_count(self, player: 'Player') -> int:
+        """
+        Returns the number of pips a player still needs to bear off all checkers.
+
+        Args:
+            player (Player): The player to count for.
+
+        Returns:
+            int: The pip count, counting checkers on the bar as 25 pips.
+        """
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        return self.__pips__[player.get_color() != 'white']
+
+    def get_checkers_outside_home(self, player: 'Player') -> int:
+        """Returns how many of a player's checkers are neither in the home board nor borne off."""
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        return 15 - self.__home__[player.get_color() != 'white'] - self.__off_board__[player]
+
+    def _refresh_counters(self):
+        """Recomputes the pip and home counters from scratch."""
+        pips = [25 * len(self.__bar__[self.__player1__]), 25 * len(self.__bar__[self.__player2__])]
+        home = [0, 0]
+        for index, point in enumerate(self.__points__):
+            if point:
+                if point[0].get_owner() == self.__player1__:
+                    pips[0] += len(point) * (index + 1)
+                    if index < 6: home[0] += len(point)
+                else:
+                    pips[1] += len(point) * (24 - index)
+                    if index > 17: home[1] += len(point)
+        self.__pips__ = pips
+        self.__home__ = home
+        self.__counters_dirty__ = False
 
     def get_winner(self):
         """Returns the winner of the game, if any."""
         return self.__winner__
 
+    def position_hash(self, player: 'Player' = None) -> int:
+        """
+        Returns the 64-bit Zobrist hash of the position, usable as a dictionary key.
+
+        The hash is maintained incrementally by apply_move/undo_move and matches the hash
+        of the same position held in an ArrayBoard.
+
+        Args:
+            player (Player, optional): The side to move. If given, it is mixed into the hash.
+
+        Returns:
+            int: The position hash.
+        """
+        if self.__hash_dirty__:
+            self._refresh_hash()
+        return self.__zobrist__ ^ side_to_move_key(player)
+
+    def _refresh_hash(self):
+        """Recomputes the position hash from scratch."""
+        h = 0
+        for index in range(28):
+            h ^= CELL_KEYS[index][self._cell_value(index) + 15]
+        self.__zobrist__ = h
+        self.__hash_dirty__ = False
+
+    def _cell_value(self, index: int) -> int:
+        """
+        Returns the signed checker count of a cell in the ArrayBoard layout.
+
+        Args:
+            index (int): 0-23 for points, 24/25 for the white/black bar, 26/27 for white/black off.
+
+        Returns:
+            int: Positive for white checkers, negative for black checkers on points; counts otherwise.
+        """
+        if index < 24:
+            point = self.__points__[index]
+            if not point: return 0
+            return len(point) if point[0].get_owner() == self.__player1__ else -len(point)
+        if index < 26:
+            return len(self.__bar__[self.__player1__ if index == 24 else self.__player2__])
+        return self.__off_board__[self.__player1__ if index == 26 else self.__player2__]
+
+    def get_position_id(self, player: 'Player') -> str:
+        """
+        Returns the canonical position ID, a short string usable as a cache key or wire format.
+
+        Args:
+            player (Player): The side to move.
+
+        Returns:
+            str: A 15-character ID (see core.position_id), identical for an ArrayBoard
+            holding the same position.
+        """
+        return encode_position([self._cell_value(index) for index in range(28)],
+                               player.get_color() == 'white')
+
+    def set_position_id(self, position_id: str) -> 'Player':
+        """
+        Replaces the position with the one described by a position ID.
+
+        Args:
+            position_id (str): An ID returned by get_position_id.
+
+        Returns:
+            Player: The side to move.
+
+        Raises:
+            ValueError: If the ID is malformed.
+        """
+        cells, is_white = decode_position(position_id)
+        white, black = self.__player1__, self.__player2__
+        # The containers are updated in place, since callers may hold them (see get_points).
+        self.__points__[:] = [[Checkers(white if count > 0 else black) for _ in range(abs(count))]
+                              for count in cells[:24]]
+        self.__bar__[white] = [Checkers(white) for _ in range(cells[24])]
+        self.__bar__[black] = [Checkers(black) for _ in range(cells[25])]
+        self.__off_board__[white], self.__off_board__[black] = cells[26], cells[27]
+        self.__winner__ = white if cells[26] == 15 else black if cells[27] == 15 else None
+        self.__hash_dirty__ = True
+        self.__counters_dirty__ = True
+        return white if is_white else black
 
     def is_valid_move(self, from_point, die: int, player: 'Player'):
         """
@@ -145,6 +317,23 @@ class Board:
             die (int): The die value used for the move.
             player (Player): The player making the move.
 
+        Raises:
+            ValueError: If the move is invalid.
+        """
+        self.apply_move(from_point, die, player)
+
+    def apply_move(self, from_point, die: int, player: Player) -> 'MoveUndo':
+        """
+        Moves a checker on the board and returns a record that can revert it.
+
+        Args:
+            from_point (str or int): The starting point ('bar' or 0-23).
+            die (int): The die value used for the move.
+            player (Player): The player making the move.
+
+        Returns:
+            MoveUndo: The information needed by undo_move to restore the previous position.
+
         Raises:
             ValueError: If the move is invalid.
         """
@@ -152,6 +341,17 @@ class Board:
             raise ValueError("Invalid move")
 
         direction = -1 if player.get_color() == 'white' else 1
+        previous_winner = self.__winner__
+        if self.__hash_dirty__:
+            self._refresh_hash()
+        previous_hash = self.__zobrist__
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        pips, home = self.__pips__, self.__home__
+        side = 0 if direction == -1 else 1
+        previous_counters = (pips[0], pips[1], home[0], home[1])
+        touched = self._cells_touched_by(from_point, die, player)
+        before = [self._cell_value(index) for index in touched]
         
         if from_point == 'bar':
             checker = self.__bar__[player].pop(0)
@@ -161,17 +361,81 @@ class Board:
             to_point = from_point + (die * direction)
 
         is_bear_off = (direction == -1 and to_point < 0) or (direction == 1 and to_point > 23)
+        # Every move, bear-offs included (exact rolls only), shortens the race by the die.
+        pips[side] -= die
         if is_bear_off:
             self.__off_board__[player] += 1
+            home[side] -= 1
             if self.__off_board__[player] == 15: self.__winner__ = player
-            return
-            
+            self._update_hash(touched, before)
+            return MoveUndo(from_point, 'off', player, checker, None, previous_winner, previous_hash,
+                            previous_counters)
+
+        if (to_point < 6) if side == 0 else (to_point > 17):
+            if from_point == 'bar' or ((from_point > 5) if side == 0 else (from_point < 18)):
+                home[side] += 1
+        hit_checker = None
         destination = self.__points__[to_point]
         if destination and destination[0].get_owner() != player:
-            opponent_checker = destination.pop()
-            self.__bar__[opponent_checker.get_owner()].append(opponent_checker)
-        
+            hit_checker = destination.pop()
+            self.__bar__[hit_checker.get_owner()].append(hit_checker)
+            # The hit checker restarts from the bar, 25 pips away.
+            pips[1 - side] += (to_point + 1) if side == 0 else (24 - to_point)
+            if (to_point > 17) if side == 0 else (to_point < 6):
+                home[1 - side] -= 1
+
         self.__points__[to_point].append(checker)
+        self._update_hash(touched, before)
+        return MoveUndo(from_point, to_point, player, checker, hit_checker, previous_winner, previous_hash,
+                        previous_counters)
+
+    def _cells_touched_by(self, from_point, die: int, player: 'Player'):
+        """Returns the ArrayBoard cell indices that a valid move will change."""
+        is_white = player.get_color() == 'white'
+        if from_point == 'bar':
+            from_index = 24 if is_white else 25
+            to_point = 24 - die if is_white else die - 1
+        else:
+            from_index = from_point
+            to_point = from_point - die if is_white else from_point + die
+        if not 0 <= to_point < 24:
+            return (from_index, 26 if is_white else 27)
+        return (from_index, to_point, 25 if is_white else 24)
+
+    def _update_hash(self, touched, before):
+        """XORs the keys of changed cells out of and back into the position hash."""
+        h = self.__zobrist__
+        for index, old_value in zip(touched, before):
+            new_value = self._cell_value(index)
+            if new_value != old_value:
+                h ^= CELL_KEYS[index][old_value + 15] ^ CELL_KEYS[index][new_value + 15]
+        self.__zobrist__ = h
+
+    def undo_move(self, record: 'MoveUndo'):
+        """
+        Reverts a move made with apply_move, including hits and bear-offs.
+
+        Moves must be undone in the reverse order in which they were applied.
+
+        Args:
+            record (MoveUndo): The record returned by apply_move.
+        """
+        if record.to_point == 'off':
+            self.__off_board__[record.player] -= 1
+        else:
+            self.__points__[record.to_point].pop()
+            if record.hit_checker is not None:
+                self.__bar__[record.hit_checker.get_owner()].pop()
+                self.__points__[record.to_point].append(record.hit_checker)
+
+        if record.from_point == 'bar':
+            self.__bar__[record.player].insert(0, record.checker)
+        else:
+            self.__points__[record.from_point].append(record.checker)
+        self.__winner__ = record.previous_winner
+        self.__zobrist__ = record.previous_hash
+        if record.previous_counters:
+            self.__pips__[0], self.__pips__[1], self.__home__[0], self.__home__[1] = record.previous_counters
 
     def can_player_bear_off(self, player: Player):
         """
@@ -185,19 +449,9 @@ class Board:
         """
         if self.__bar__.get(player):
             return False
-
-        color = player.get_color()
-        home_board_indices = range(6) if color == 'white' else range(18, 24)
-        
-        checkers_in_home = 0
-        for i in home_board_indices:
-            point = self.__points__[i]
-            if point and point[0].get_owner() == player:
-                checkers_in_home += len(point)
-        
-        total_checkers = self.get_off_board_count(player) + checkers_in_home
-        
-        return total_checkers == 15
+        if self.__counters_dirty__:
+            self._refresh_counters()
+        return self.__home__[player.get_color() != 'white'] + self.__off_board__[player] == 15
 
     def is_valid_bear_off_move(self, from_point, die, player):
         """
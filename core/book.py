@@ -0,0 +1,209 @@
+"""
+Opening book for the first plies of the game.
+
+The book maps (position, roll) to the play found by an offline search. Positions are stored
+from the mover's point of view, so one entry serves white and black alike. The file holds a
+header (magic b'BGOB', version, entry count) followed by the entries, each one:
+
+    15 bytes  position ID of the mover's-perspective position (see core.position_id)
+    1 byte    the roll, (high - 1) * 6 + (low - 1)
+    1 byte    number of moves
+    2 bytes   per move: origin (0-23, 24 for the bar) and destination (0-23, 24 for off)
+
+OpeningBook reads the file on its first lookup only, so creating players that carry a book
+costs nothing until the book is needed.
+
+Usage:
+    python -m core.book opening_book.bin [--plies 2] [--depth 2]
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import functools
+import os
+import struct
+import sys
+import threading
+from core.array_board import START_POSITION
+from core.movegen import generate_positions, to_perspective
+from core.position_id import encode_position
+from core.search import ExpectiminimaxSearch, ROLLS
+
+MAGIC = b'BGOB'
+VERSION = 1
+_HEADER = struct.Struct('<4sBI')
+_ID_BYTES = 15
+_BAR_OR_OFF = 24
+
+# Two-ply book searched at depth 2, shipped with the game.
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'assets', 'opening_book.bin')
+
+
+def _roll_key(dice: Sequence[int]) -> Optional[int]:
+    """Returns the roll byte of a full set of dice, or None if the dice are partly used."""
+    if len(dice) == 2 and dice[0] != dice[1]:
+        high, low = max(dice), min(dice)
+    elif len(dice) == 4 and len(set(dice)) == 1:
+        high = low = dice[0]
+    else:
+        return None
+    return (high - 1) * 6 + (low - 1)
+
+
+def _mirror_moves(moves, is_white: bool) -> List[tuple]:
+    """Converts moves between the mover's perspective and board coordinates."""
+    if is_white:
+        return [tuple(move) for move in moves]
+    return [(origin if origin == 'bar' else 23 - origin, destination if destination == 'off' else 23 - destination)
+            for origin, destination in moves]
+
+
+class OpeningBook:
+    """
+    Lazily loaded opening book.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the book without reading the file.
+
+        Args:
+            path (str): A file written by build_book.
+        """
+        self.__path__ = path
+        self.__entries__: Optional[Dict[Tuple[str, int], Tuple[tuple, ...]]] = None
+        self.__lock__ = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_loaded(self) -> bool:
+        """Returns True once the file has been read."""
+        return self.__entries__ is not None
+
+    def _load(self):
+        """Reads the whole book into a dictionary."""
+        with open(self.__path__, 'rb') as handle:
+            data = handle.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{self.__path__} is not an opening book")
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.__path__} is not an opening book")
+        entries = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            position_id = data[offset:offset + _ID_BYTES].decode('ascii')
+            roll, length = data[offset + _ID_BYTES], data[offset + _ID_BYTES + 1]
+            offset += _ID_BYTES + 2
+            moves = []
+            for i in range(length):
+                origin, destination = data[offset + 2 * i], data[offset + 2 * i + 1]
+                moves.append(('bar' if origin == _BAR_OR_OFF else origin,
+                              'off' if destination == _BAR_OR_OFF else destination))
+            offset += 2 * length
+            entries[(position_id, roll)] = tuple(moves)
+        self.__entries__ = entries
+
+    def _entries(self) -> Dict[Tuple[str, int], Tuple[tuple, ...]]:
+        """Returns the entries, reading the file on first use."""
+        if self.__entries__ is None:
+            with self.__lock__:
+                if self.__entries__ is None:
+                    self._load()
+        return self.__entries__
+
+    def __len__(self):
+        """Returns the number of entries (loading the book if needed)."""
+        return len(self._entries())
+
+    def lookup(self, cells: Sequence[int], is_white: bool, dice: Sequence[int]) -> Optional[List[tuple]]:
+        """
+        Looks up the book play for a position and roll.
+
+        Args:
+            cells (sequence of int): The 28 ArrayBoard cells.
+            is_white (bool): Whether white is to move.
+            dice (sequence of int): The dice of the turn, before any of them is used.
+
+        Returns:
+            list or None: The moves in board coordinates, or None if the book has no entry.
+        """
+        roll = _roll_key(dice)
+        if roll is None:
+            return None
+        moves = self._entries().get((encode_position(to_perspective(cells, is_white), True), roll))
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _mirror_moves(moves, is_white)
+
+
+@functools.lru_cache(maxsize=None)
+def default_book() -> OpeningBook:
+    """Returns the shipped book, shared by every caller (and still only read on first lookup)."""
+    return OpeningBook(DEFAULT_BOOK_PATH)
+
+
+def build_book(path: str, plies: int = 2, depth: int = 2, progress=None) -> int:
+    """
+    Searches the opening positions and writes the book.
+
+    Ply 1 covers the 15 opening rolls (the opening roll cannot be a double); every later ply
+    covers all 21 rolls in each position reached by the book plays of the previous ply.
+
+    Args:
+        path (str): The output file.
+        plies (int, optional): Number of plies covered.
+        depth (int, optional): Search depth used for every entry.
+        progress (callable, optional): Called with (done, ply) after each entry.
+
+    Returns:
+        int: The number of entries written.
+    """
+    search = ExpectiminimaxSearch()
+    entries = []
+    # Positions from the mover's perspective, which the search sees as white to move.
+    frontier = {encode_position(START_POSITION, True): list(START_POSITION)}
+    for ply in range(1, plies + 1):
+        rolls = [dice for dice, _ in ROLLS if ply > 1 or len(dice) == 2]
+        next_frontier = {}
+        for position_id, cells in frontier.items():
+            for dice in rolls:
+                moves = search.choose_play(cells, True, list(dice), depth)
+                entries.append((position_id, _roll_key(dice), moves))
+                after = next(result for played, result in generate_positions(cells, True, list(dice))
+                             if played == moves)
+                following = to_perspective(after, False)
+                next_frontier[encode_position(following, True)] = following
+                if progress is not None:
+                    progress(len(entries), ply)
+        frontier = next_frontier
+
+    with open(path, 'wb') as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, len(entries)))
+        for position_id, roll, moves in entries:
+            record = bytearray(position_id.encode('ascii'))
+            record += bytes((roll, len(moves)))
+            for origin, destination in moves:
+                record += bytes((_BAR_OR_OFF if origin == 'bar' else origin,
+                                 _BAR_OR_OFF if destination == 'off' else destination))
+            handle.write(record)
+    return len(entries)
+
+
+def main(argv=None):
+    """Command-line entry point that builds a book file."""
+    parser = argparse.ArgumentParser(description="Build the opening book.")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--plies", type=int, default=2, help="plies covered by the book")
+    parser.add_argument("--depth", type=int, default=2, help="search depth per entry")
+    args = parser.parse_args(argv)
+    count = build_book(args.path, args.plies, args.depth,
+                       progress=lambda done, ply: print(f"ply {ply}: {done} entries", file=sys.stderr))
+    print(f"{count} entries written to {args.path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,108 @@
+from typing import List, Optional
+import hashlib
 import random
+from core.position_id import encode_dice, decode_dice
+
+_FACES = (1, 2, 3, 4, 5, 6)
+
+
+class DiceStream:
+    """
+    A seedable, replayable source of die values.
+
+    Values are drawn from a private random.Random in blocks, so rolling does not pay the
+    per-call cost of randint. The sequence depends only on the seed (not on the block size),
+    and spawn() derives independent child streams, e.g. one per worker or per game, whose
+    sequences depend only on the parent seed and the child key.
+
+    Attributes
+    ----------
+    seed : int
+        The seed of the stream.
+    """
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024):
+        """
+        Initializes the stream.
+
+        Args:
+            seed (int, optional): The seed. If omitted, one is drawn from the module-level
+                random generator, so random.seed() still makes legacy code reproducible.
+            block_size (int, optional): Number of die values generated at a time.
+        """
+        self.__seed__ = random.getrandbits(64) if seed is None else seed
+        self.__rng__ = random.Random(self.__seed__)
+        self.__block_size__ = block_size
+        self.__block__: List[int] = []
+        self.__index__ = 0
+        self.__consumed__ = 0
+
+    def get_seed(self) -> int:
+        """Returns the seed of the stream."""
+        return self.__seed__
+
+    def get_consumed(self) -> int:
+        """Returns how many die values have been drawn, i.e. the position to replay up to."""
+        return self.__consumed__
+
+    def spawn(self, key) -> 'DiceStream':
+        """
+        Derives an independent child stream.
+
+        Args:
+            key: Any value with a stable repr (e.g. a worker or game number).
+
+        Returns:
+            DiceStream: A stream seeded from (seed, key). Calling spawn again with the same key
+            returns a stream with the same sequence.
+        """
+        digest = hashlib.blake2b(f"{self.__seed__}/{key!r}".encode(), digest_size=8).digest()
+        return DiceStream(int.from_bytes(digest, 'little'), self.__block_size__)
+
+    def _refill(self):
+        """Generates the next block of die values."""
+        self.__block__ = self.__rng__.choices(_FACES, k=self.__block_size__)
+        self.__index__ = 0
+
+    def next_die(self) -> int:
+        """
+        Returns the next die value.
+
+        Returns:
+            int: A value from 1 to 6.
+        """
+        if self.__index__ == len(self.__block__):
+            self._refill()
+        value = self.__block__[self.__index__]
+        self.__index__ += 1
+        self.__consumed__ += 1
+        return value
+
+    def take(self, count: int) -> List[int]:
+        """
+        Returns the next count die values at once.
+
+        Args:
+            count (int): Number of values.
+
+        Returns:
+            list[int]: The values, the same as count calls to next_die.
+        """
+        index = self.__index__
+        if index + count <= len(self.__block__):
+            self.__index__ = index + count
+            self.__consumed__ += count
+            return self.__block__[index:index + count]
+        values: List[int] = []
+        while len(values) < count:
+            if self.__index__ == len(self.__block__):
+                self._refill()
+            end = min(len(self.__block__), self.__index__ + count - len(values))
+            values.extend(self.__block__[self.__index__:end])
+            self.__index__ = end
+        self.__consumed__ += count
+        return values
+
 
 class Dice:
     """
@@ -10,9 +114,21 @@ class Dice:
         The current values of the dice.
     """
 
-    def __init__(self):
-        """Initializes the Dice object with no values."""
+    def __init__(self, stream: Optional[DiceStream] = None, seed: Optional[int] = None):
+        """
+        Initializes the Dice object with no values.
+
+        Args:
+            stream (DiceStream, optional): The source of die values. Injecting a stream makes the
+                rolls reproducible and independent of any other dice.
+            seed (int, optional): Seed of a new stream, used when no stream is given.
+        """
         self.__values__ = []
+        self.__stream__ = stream if stream is not None else DiceStream(seed)
+
+    def get_stream(self) -> DiceStream:
+        """Returns the stream the dice draw from."""
+        return self.__stream__
 
     def roll(self):
         """
@@ -21,7 +137,7 @@ class Dice:
         Returns:
             list[int]: The new values of the dice.
         """
-        self.__values__ = [random.randint(1, 6), random.randint(1, 6)]
+        self.__values__ = self.__stream__.take(2)
         return self.__values__
 
     def roll_one(self):
@@ -31,7 +147,7 @@ class Dice:
         Returns:
             int: The value of the rolled die.
         """
-        return random.randint(1, 6)
+        return self.__stream__.next_die()
 
     def get_values(self):
         """
@@ -65,3 +181,24 @@ class Dice:
             self.__values__.remove(value)
         else:
             raise ValueError(f"Die value {value} not available in {self.__values__}")
+
+    def get_dice_id(self) -> str:
+        """
+        Returns the canonical ID of the dice left to play (see core.position_id).
+
+        Returns:
+            str: A 4-character ID.
+        """
+        return encode_dice(self.__values__)
+
+    def set_dice_id(self, dice_id: str):
+        """
+        Sets the dice from a dice ID.
+
+        Args:
+            dice_id (str): An ID returned by get_dice_id.
+
+        Raises:
+            ValueError: If the ID is malformed.
+        """
+        self.__values__ = decode_dice(dice_id)
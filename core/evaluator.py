@@ -0,0 +1,209 @@
+"""
+Position evaluators that AIPlayer and ExpectiminimaxSearch can plug in.
+
+An evaluator scores positions for the side to move, from -1 (certain loss) to 1 (certain
+win), like core.search.evaluate_position. Calling it scores one position; evaluate_batch
+scores many positions with the same side to move at once, which is how AIPlayer scores all
+the candidate plays of a turn.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+import struct
+import threading
+from core.search import evaluate_position
+
+# Cache keys pack the 28 cells and the side to move into 29 bytes.
+_KEY = struct.Struct('<28b?')
+# Rough memory taken by one cache entry: the key bytes object, the float and the
+# OrderedDict bookkeeping.
+ENTRY_BYTES = 200
+
+
+class Evaluator(ABC):
+    """
+    Base class of position evaluators.
+
+    Subclasses must implement evaluate_batch (a subclass that does not cannot be
+    instantiated); single-position calls go through it by default.
+    """
+
+    def __call__(self, cells: Sequence[int], is_white: bool) -> float:
+        """
+        Scores one position.
+
+        Args:
+            cells (sequence of int): The 28 ArrayBoard cells.
+            is_white (bool): Whether white is to move.
+
+        Returns:
+            float: A score in [-1, 1] for the side to move.
+        """
+        return float(self.evaluate_batch([cells], is_white)[0])
+
+    @abstractmethod
+    def evaluate_batch(self, positions: Sequence[Sequence[int]], is_white: bool) -> List[float]:
+        """
+        Scores several positions with the same side to move.
+
+        Args:
+            positions (sequence): ArrayBoard cell sequences (or an (N, 28) array).
+            is_white (bool): Whether white is to move in every position.
+
+        Returns:
+            list[float]: One score in [-1, 1] per position, for the side to move.
+        """
+
+
+class HeuristicEvaluator(Evaluator):
+    """The hand-written evaluation of core.search, as an Evaluator."""
+
+    def __call__(self, cells: Sequence[int], is_white: bool) -> float:
+        """Scores one position with evaluate_position."""
+        return evaluate_position(cells, is_white)
+
+    def evaluate_batch(self, positions: Sequence[Sequence[int]], is_white: bool) -> List[float]:
+        """Scores each position with evaluate_position."""
+        return [evaluate_position(cells, is_white) for cells in positions]
+
+
+class EvaluationCache:
+    """
+    Bounded LRU cache of position scores, keyed on the position plus the side to move.
+
+    One cache can be shared by any number of CachedEvaluator objects (and so AIPlayer
+    instances) in a process; a lock keeps it consistent when players run in other threads.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Lookup and eviction counters.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 100000, max_bytes: Optional[int] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int, optional): Largest number of stored scores.
+            max_bytes (int, optional): Approximate memory limit; converted to entries with
+                ENTRY_BYTES. When both limits are given the smaller one applies.
+        """
+        limits = [limit for limit in (max_entries, None if max_bytes is None else max_bytes // ENTRY_BYTES)
+                  if limit is not None]
+        if not limits:
+            raise ValueError("the cache needs max_entries or max_bytes")
+        self.__capacity__ = max(1, min(limits))
+        self.__entries__: OrderedDict = OrderedDict()
+        self.__lock__ = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Returns the number of stored scores."""
+        return len(self.__entries__)
+
+    def get_capacity(self) -> int:
+        """Returns the largest number of stored scores."""
+        return self.__capacity__
+
+    @staticmethod
+    def key(cells: Sequence[int], is_white: bool) -> bytes:
+        """Returns the canonical key of a position with its side to move."""
+        return _KEY.pack(*cells, is_white)
+
+    def get(self, key: bytes) -> Optional[float]:
+        """
+        Looks up a score and marks it as recently used.
+
+        Args:
+            key (bytes): A key from EvaluationCache.key.
+
+        Returns:
+            float or None: The score, or None on a miss.
+        """
+        with self.__lock__:
+            value = self.__entries__.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.__entries__.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: float):
+        """
+        Stores a score, evicting the least recently used ones beyond the capacity.
+
+        Args:
+            key (bytes): A key from EvaluationCache.key.
+            value (float): The score.
+        """
+        with self.__lock__:
+            entries = self.__entries__
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.__capacity__:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self.__lock__:
+            self.__entries__.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def hit_rate(self) -> float:
+        """Returns the fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Returns the counters, size and hit rate as a dictionary."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self), 'capacity': self.__capacity__, 'hit_rate': self.hit_rate()}
+
+
+class CachedEvaluator(Evaluator):
+    """
+    Wraps an evaluator with an EvaluationCache.
+
+    evaluate_batch looks every position up first and sends only the misses to the wrapped
+    evaluator, still in a single batch.
+    """
+
+    def __init__(self, evaluator, cache: Optional[EvaluationCache] = None):
+        """
+        Initializes the wrapper.
+
+        Args:
+            evaluator (Evaluator or callable): The evaluator to cache. A plain
+                evaluate(cells, is_white) function is accepted too.
+            cache (EvaluationCache, optional): The cache, possibly shared with other
+                evaluators. A new one with the default capacity is created if omitted.
+        """
+        self.__evaluator__ = evaluator
+        self.__cache__ = cache if cache is not None else EvaluationCache()
+
+    def get_cache(self) -> EvaluationCache:
+        """Returns the cache used by this evaluator."""
+        return self.__cache__
+
+    def evaluate_batch(self, positions: Sequence[Sequence[int]], is_white: bool) -> List[float]:
+        """Scores positions, evaluating only the ones missing from the cache."""
+        cache = self.__cache__
+        keys = [cache.key(cells, is_white) for cells in positions]
+        scores: List[Optional[float]] = [cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            batch = getattr(self.__evaluator__, 'evaluate_batch', None)
+            if batch is not None:
+                computed = batch([positions[i] for i in missing], is_white)
+            else:
+                computed = [self.__evaluator__(positions[i], is_white) for i in missing]
+            for i, score in zip(missing, computed):
+                scores[i] = float(score)
+                cache.put(keys[i], scores[i])
+        return scores
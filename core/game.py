@@ -19,20 +19,32 @@ class Game:
         The dice for the game.
     """
 
-    def __init__(self, players: list['Player'], random_positions=False):
+    def __init__(self, players: list['Player'], random_positions=False, dice: 'Dice' = None):
         """
         Initializes the Game object.
 
         Args:
             players (list[Player]): The list of players.
             random_positions (bool, optional): Whether to start with random checker positions. Defaults to False.
+            dice (Dice, optional): The dice to play with, e.g. built on a seeded DiceStream. Defaults to new Dice.
         """
         self.__players__ = players
         self.__board__ = Board(players[0], players[1], random_positions=random_positions)
         self.__current_player_index__ = 0
-        self.__dice__ = Dice()
+        self.__dice__ = dice if dice is not None else Dice()
         self.__initial_rolls__ = [0, 0]
         self.__initial_roll_winner__ = None
+        self.__recorder__ = None
+
+    def set_recorder(self, recorder):
+        """
+        Attaches an object notified of every roll and move (e.g. a GameRecordWriter).
+
+        Args:
+            recorder: An object with record_roll(player, dice), record_move(player, from_point,
+                to_point) and end_game(winner) methods, or None to detach.
+        """
+        self.__recorder__ = recorder
 
     def get_current_player(self):
         """
@@ -53,6 +65,8 @@ class Game:
         if self.__dice__.get_values()[0] == self.__dice__.get_values()[1]:
             # Doubles, grant four moves
             self.__dice__.set_values([self.__dice__.get_values()[0]] * 4)
+        if self.__recorder__ is not None:
+            self.__recorder__.record_roll(self.get_current_player(), self.__dice__.get_values())
 
     def determine_first_player(self):
         """Players roll one die each to determine who goes first, handling ties."""
@@ -73,6 +87,8 @@ class Game:
         
         # The first turn's dice are the initial winning rolls
         self.__dice__.set_values(self.__initial_rolls__)
+        if self.__recorder__ is not None:
+            self.__recorder__.record_roll(self.get_current_player(), self.__initial_rolls__)
             
     def _calculate_and_validate_die_for_move(self, from_point: str | int, to_point: str | int, player: 'Player') -> int | None:
         """
@@ -115,6 +131,10 @@ class Game:
 
         self.__board__.move_piece(from_point, die, player)
         self.__dice__.remove_value(die)
+        if self.__recorder__ is not None:
+            self.__recorder__.record_move(player, from_point, to_point)
+            if self.__board__.get_winner() is not None:
+                self.__recorder__.end_game(self.__board__.get_winner())
 
     def has_possible_moves(self, player: 'Player') -> bool:
         """
@@ -140,17 +160,44 @@ class Game:
 
         if isinstance(player, AIPlayer):
             # The AI determines all its moves for the turn at once
-            moves = player.choose_moves(self.__board__, self.__dice__.get_values())
-            
-            for from_point, to_point in moves:
-                try:
-                    # Each move is executed sequentially
-                    self.move(from_point, to_point)
-                except (ValueError, IndexError) as e:
-                    # This may happen if the AI's logic produces a sequence of moves
-                    # that becomes invalid after an earlier move is made.
-                    print(f"AI tried an invalid move and has forfeited the rest of its turn: {from_point}->{to_point}. Error: {e}")
-                    break # Stop processing further moves
+            self.play_moves(player.choose_moves(self.__board__, self.__dice__.get_values()))
+
+    def play_moves(self, moves, play_move=None):
+        """
+        Performs a turn's moves chosen beforehand, e.g. by an AI running in another thread.
+
+        Args:
+            moves (list[tuple]): (from_point, to_point) moves for the current player, in order.
+            play_move (callable, optional): play_move(from_point, to_point) performs one move
+                and raises like move does. Defaults to move; a UI can pass one that also
+                animates the move.
+
+        Returns:
+            list[tuple]: The moves that were played; an invalid move forfeits the rest of the turn.
+        """
+        if play_move is None:
+            play_move = self.move
+        played = []
+        for from_point, to_point in moves:
+            try:
+                # Each move is executed sequentially
+                play_move(from_point, to_point)
+            except (ValueError, IndexError) as e:
+                # This may happen if the AI's logic produces a sequence of moves
+                # that becomes invalid after an earlier move is made.
+                print(f"AI tried an invalid move and has forfeited the rest of its turn: {from_point}->{to_point}. Error: {e}")
+                break # Stop processing further moves
+            played.append((from_point, to_point))
+        return played
+
+    def position_hash(self) -> int:
+        """
+        Returns the Zobrist hash of the board with the current player as side to move.
+
+        Returns:
+            int: A 64-bit key suitable for caches and transposition tables.
+        """
+        return self.__board__.position_hash(self.get_current_player())
 
     def is_game_over(self):
         """
@@ -0,0 +1,222 @@
+from __future__ import annotations
+from typing import List, Tuple, TYPE_CHECKING
+from core.array_board import ArrayBoard
+
+if TYPE_CHECKING:
+    from core.player import Player
+    from core.board import Board
+
+# The generator works on a "mover's perspective" copy of the cells: the side to move owns the
+# positive counts and always moves from high to low points, with home on 0-5. Index 24 is the
+# mover's bar, 25 the opponent's bar, 26 the mover's off count and 27 the opponent's off count.
+_BAR = 24
+_OPP_BAR = 25
+_OFF = 26
+_OPP_OFF = 27
+
+
+def to_perspective(cells, is_white: bool) -> list:
+    """
+    Converts absolute board cells into the mover's perspective.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+        is_white (bool): Whether the side to move is white.
+
+    Returns:
+        list: A new list of 28 ints seen from the side to move.
+    """
+    if is_white:
+        return list(cells)
+    mirrored = [-count for count in cells[23::-1]]
+    mirrored += [cells[25], cells[24], cells[27], cells[26]]
+    return mirrored
+
+
+def from_perspective(cells, is_white: bool) -> list:
+    """Converts mover's-perspective cells back into absolute ArrayBoard cells."""
+    # The mirror is its own inverse.
+    return to_perspective(cells, is_white)
+
+
+def _single_moves(c, die: int, home: int, highest: int = 23) -> list:
+    """
+    Lists every legal (from_point, to_point) for one die, mirroring Board.is_valid_move.
+
+    Points are in the mover's perspective; 'bar' and 'off' keep their names. home is the
+    number of the mover's checkers on points 0-5, which decides whether it may bear off.
+    Only checkers on points up to ``highest`` are considered; the bar always is.
+    """
+    if c[_BAR]:
+        to_point = 24 - die
+        return [('bar', to_point)] if c[to_point] >= -1 else []
+    moves = []
+    for from_point in range(min(highest, 23), die - 1, -1):
+        if c[from_point] > 0 and c[from_point - die] >= -1:
+            moves.append((from_point, from_point - die))
+    # Exact roll only
+    if die <= highest + 1 and c[die - 1] > 0 and home + c[_OFF] == 15:
+        moves.append((die - 1, 'off'))
+    return moves
+
+
+def _move(c, from_point, to_point) -> bool:
+    """Plays a perspective move on c in place and returns whether it hit a blot."""
+    if from_point == 'bar':
+        c[_BAR] -= 1
+    else:
+        c[from_point] -= 1
+    if to_point == 'off':
+        c[_OFF] += 1
+        return False
+    if c[to_point] == -1:
+        c[to_point] = 1
+        c[_OPP_BAR] += 1
+        return True
+    c[to_point] += 1
+    return False
+
+
+def _unmove(c, from_point, to_point, hit: bool):
+    """Takes back a move played by _move."""
+    if to_point == 'off':
+        c[_OFF] -= 1
+    elif hit:
+        c[to_point] = -1
+        c[_OPP_BAR] -= 1
+    else:
+        c[to_point] -= 1
+    if from_point == 'bar':
+        c[_BAR] += 1
+    else:
+        c[from_point] += 1
+
+
+def _home_after(home: int, from_point, to_point) -> int:
+    """Updates the mover's home board count for a move."""
+    if from_point != 'bar' and from_point < 6:
+        home -= 1
+    if to_point != 'off' and to_point < 6:
+        home += 1
+    return home
+
+
+def generate_positions(cells, is_white: bool, dice) -> List[Tuple[list, list]]:
+    """
+    Enumerates every legal full-turn play for a roll on raw ArrayBoard cells.
+
+    A play must use as many dice as possible; when only one die of two different values
+    can be used, the larger one must be played if it can be. Plays that end in the same
+    position are returned once.
+
+    The search plays and takes back moves in place on a single perspective copy of the
+    cells; only the final positions are copied. With doubles, checkers are moved in
+    descending order of their origin, which skips the reorderings of the same moves.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+        is_white (bool): Whether the side to move is white.
+        dice (list[int]): The dice available, e.g. [3, 5] or [4, 4, 4, 4].
+
+    Returns:
+        list: (moves, final_cells) pairs. moves is a list of (from_point, to_point) tuples in
+        board coordinates; final_cells is a list of 28 absolute cells. If no move is possible
+        the only play is the empty one.
+    """
+    c = to_perspective(cells, is_white)
+    home = sum(count for count in c[:6] if count > 0)
+    # Final position -> (moves, die used when a single die is played)
+    finals = {}
+    moves = []
+    best_length = 0
+
+    def record(die=None):
+        nonlocal best_length
+        if len(moves) < best_length:
+            return
+        if len(moves) > best_length:
+            best_length = len(moves)
+            finals.clear()
+        key = tuple(c)
+        if key not in finals:
+            finals[key] = (moves[:], die)
+
+    def play_doubles(die, remaining, highest, home):
+        if remaining:
+            legal = _single_moves(c, die, home, highest)
+            for from_point, to_point in legal:
+                hit = _move(c, from_point, to_point)
+                moves.append((from_point, to_point))
+                play_doubles(die, remaining - 1, 23 if from_point == 'bar' else from_point,
+                             _home_after(home, from_point, to_point))
+                moves.pop()
+                _unmove(c, from_point, to_point, hit)
+            if legal:
+                return
+        record()
+
+    high, low = (max(dice), min(dice)) if dice else (0, 0)
+    if high == low:
+        play_doubles(high, len(dice), 23, home)
+    else:
+        for first, second in ((high, low), (low, high)):
+            for from_point, to_point in _single_moves(c, first, home):
+                hit = _move(c, from_point, to_point)
+                moves.append((from_point, to_point))
+                replies = _single_moves(c, second, _home_after(home, from_point, to_point))
+                for reply in replies:
+                    reply_hit = _move(c, *reply)
+                    moves.append(reply)
+                    record()
+                    moves.pop()
+                    _unmove(c, reply[0], reply[1], reply_hit)
+                if not replies:
+                    record(first)
+                moves.pop()
+                _unmove(c, from_point, to_point, hit)
+        if not finals:
+            record()
+
+    plays = finals.items()
+    if best_length == 1 and high != low and any(die == high for _, die in finals.values()):
+        plays = [(key, play) for key, play in plays if play[1] == high]
+
+    unique = []
+    for key, (play_moves, _) in plays:
+        if not is_white:
+            play_moves = [(_mirror_point(f), _mirror_point(t)) for f, t in play_moves]
+        unique.append((play_moves, from_perspective(key, is_white)))
+    return unique
+
+
+def die_for_move(from_point, to_point, is_white: bool) -> int:
+    """Returns the die used by a (from_point, to_point) move in board coordinates."""
+    if to_point == 'off':
+        return from_point + 1 if is_white else 24 - from_point
+    if from_point == 'bar':
+        return 24 - to_point if is_white else to_point + 1
+    return abs(to_point - from_point)
+
+
+def _mirror_point(point):
+    """Maps a perspective point to black's board coordinates."""
+    return point if isinstance(point, str) else 23 - point
+
+
+def generate_plays(board: 'Board', player: 'Player', dice) -> List[List[tuple]]:
+    """
+    Returns every legal full-turn play for a roll, with duplicate end positions removed.
+
+    Args:
+        board (Board or ArrayBoard): The current board.
+        player (Player): The player to move.
+        dice (list[int]): The dice available for the turn.
+
+    Returns:
+        list: A list of plays, each a list of (from_point, to_point) moves in the format
+        accepted by Game.move. A player with no legal move gets a single empty play.
+    """
+    if not isinstance(board, ArrayBoard):
+        board = ArrayBoard.from_board(board)
+    is_white = player.get_color() == 'white'
+    return [moves for moves, _ in generate_positions(board.get_cells_snapshot(), is_white, dice)]
@@ -0,0 +1,167 @@
+"""
+Feed-forward neural network evaluator in NumPy.
+
+Positions are encoded with the TD-Gammon input scheme (198 inputs): for each side and each
+point, four units for 1, 2, 3 and (n - 3) / 2 further checkers; the bar count / 2 and the
+borne-off count / 15 for each side; and two units for the side to move. One hidden sigmoid
+layer feeds one sigmoid output, the probability that white wins.
+
+Encoding and inference are vectorized over the batch, so every candidate play of a turn is
+scored with one matrix multiply per layer.
+"""
+from __future__ import annotations
+from typing import Optional, Sequence
+import numpy as np
+from core.evaluator import Evaluator
+
+NUM_INPUTS = 198
+
+
+def encode(positions, is_white) -> np.ndarray:
+    """
+    Encodes positions as network inputs.
+
+    Args:
+        positions (sequence or np.ndarray): N ArrayBoard cell sequences or an (N, 28) array.
+        is_white (bool or np.ndarray): Whether white is to move, for all positions or per position.
+
+    Returns:
+        np.ndarray: (N, 198) float32 inputs.
+    """
+    cells = np.asarray(positions, dtype=np.int16).reshape(-1, 28)
+    n = len(cells)
+    inputs = np.zeros((n, NUM_INPUTS), dtype=np.float32)
+    for offset, counts, bar, off in ((0, np.clip(cells[:, :24], 0, None), cells[:, 24], cells[:, 26]),
+                                     (98, np.clip(-cells[:, :24], 0, None), cells[:, 25], cells[:, 27])):
+        units = inputs[:, offset:offset + 96].reshape(n, 24, 4)
+        units[:, :, 0] = counts >= 1
+        units[:, :, 1] = counts >= 2
+        units[:, :, 2] = counts >= 3
+        units[:, :, 3] = np.clip(counts - 3, 0, None) / 2.0
+        inputs[:, offset + 96] = bar / 2.0
+        inputs[:, offset + 97] = off / 15.0
+    white_to_move = np.broadcast_to(np.asarray(is_white, dtype=bool), (n,))
+    inputs[:, 196] = white_to_move
+    inputs[:, 197] = ~white_to_move
+    return inputs
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Logistic function, clipped so large inputs do not overflow."""
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -40.0, 40.0)))
+
+
+class NeuralEvaluator(Evaluator):
+    """
+    TD-Gammon-style network: 198 inputs, one sigmoid hidden layer, one sigmoid output.
+
+    Attributes
+    ----------
+    hidden_weights, hidden_bias, output_weights, output_bias : np.ndarray
+        The parameters, as float32 arrays of shape (198, H), (H,), (H,) and ().
+    """
+
+    def __init__(self, hidden: int = 40, seed: Optional[int] = 0):
+        """
+        Initializes the network with small random weights.
+
+        Args:
+            hidden (int, optional): Number of hidden units.
+            seed (int, optional): Seed of the initial weights.
+        """
+        rng = np.random.default_rng(seed)
+        self.hidden_weights = rng.normal(0.0, 0.1, (NUM_INPUTS, hidden)).astype(np.float32)
+        self.hidden_bias = np.zeros(hidden, dtype=np.float32)
+        self.output_weights = rng.normal(0.0, 0.1, hidden).astype(np.float32)
+        self.output_bias = np.zeros((), dtype=np.float32)
+
+    def get_weights(self) -> tuple:
+        """Returns the parameters as a tuple of arrays (picklable, e.g. to send to workers)."""
+        return self.hidden_weights, self.hidden_bias, self.output_weights, self.output_bias
+
+    def set_weights(self, weights: tuple):
+        """Replaces the parameters with a tuple returned by get_weights."""
+        self.hidden_weights, self.hidden_bias, self.output_weights, self.output_bias = (
+            np.array(weight, dtype=np.float32) for weight in weights)
+
+    def forward(self, inputs: np.ndarray):
+        """
+        Runs the network on encoded inputs, keeping the hidden activations.
+
+        Args:
+            inputs (np.ndarray): (N, 198) inputs from encode.
+
+        Returns:
+            tuple: (hidden, output) with the (N, H) hidden activations and the (N,)
+            probabilities that white wins.
+        """
+        hidden = _sigmoid(inputs @ self.hidden_weights + self.hidden_bias)
+        return hidden, _sigmoid(hidden @ self.output_weights + self.output_bias)
+
+    def win_probability(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Runs the network on encoded inputs.
+
+        Args:
+            inputs (np.ndarray): (N, 198) inputs from encode.
+
+        Returns:
+            np.ndarray: (N,) probabilities that white wins.
+        """
+        return self.forward(inputs)[1]
+
+    def update(self, inputs: np.ndarray, errors: np.ndarray, learning_rate: float):
+        """
+        Moves the outputs on a batch of inputs towards their targets by one gradient step.
+
+        The weights change by learning_rate * sum over k of errors[k] * grad output(inputs[k]),
+        computed for the whole batch with matrix products.
+
+        Args:
+            inputs (np.ndarray): (N, 198) inputs from encode.
+            errors (np.ndarray): (N,) target minus output for each input.
+            learning_rate (float): The step size.
+        """
+        hidden, output = self.forward(inputs)
+        output_delta = (errors * output * (1.0 - output)).astype(np.float32)
+        hidden_delta = output_delta[:, None] * self.output_weights * hidden * (1.0 - hidden)
+        self.output_weights += learning_rate * (hidden.T @ output_delta)
+        self.output_bias += learning_rate * output_delta.sum()
+        self.hidden_weights += learning_rate * (inputs.T @ hidden_delta)
+        self.hidden_bias += learning_rate * hidden_delta.sum(axis=0)
+
+    def evaluate_batch(self, positions: Sequence[Sequence[int]], is_white: bool):
+        """
+        Scores positions for the side to move in one batched forward pass.
+
+        Args:
+            positions (sequence): ArrayBoard cell sequences (or an (N, 28) array).
+            is_white (bool): Whether white is to move in every position.
+
+        Returns:
+            np.ndarray: (N,) scores in [-1, 1] for the side to move.
+        """
+        win = self.win_probability(encode(positions, is_white))
+        return 2.0 * win - 1.0 if is_white else 1.0 - 2.0 * win
+
+    def save(self, path: str):
+        """Saves the weights to a .npz file."""
+        np.savez(path, hidden_weights=self.hidden_weights, hidden_bias=self.hidden_bias,
+                 output_weights=self.output_weights, output_bias=self.output_bias)
+
+    @classmethod
+    def load(cls, path: str) -> 'NeuralEvaluator':
+        """
+        Loads weights saved with save.
+
+        Args:
+            path (str): The .npz file.
+
+        Returns:
+            NeuralEvaluator: The network.
+        """
+        with np.load(path) as data:
+            network = cls(hidden=data['hidden_bias'].shape[0], seed=None)
+            for name in ('hidden_weights', 'hidden_bias', 'output_weights', 'output_bias'):
+                setattr(network, name, data[name].astype(np.float32))
+        return network
@@ -0,0 +1,159 @@
+"""
+Compact, canonical IDs for positions and dice.
+
+A position ID packs the side to move and both sides' checkers into 11 bytes: one bit for
+the side to move, then for white and for black in turn, each of the side's 24 points (in
+its own direction of play, from its 1-point) and its bar as a run of one bits per checker
+closed by a zero bit. Checkers borne off are implied (15 minus those on the board). The
+bytes are written least significant bit first and encoded as unpadded URL-safe base64, so
+every ID is 15 characters long and safe in URLs, file names and JSON.
+
+A dice ID holds how many dice of each face are left to play, three bits per face, in
+4 characters.
+"""
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+import base64
+
+CHECKERS = 15
+POSITION_BYTES = 11
+DICE_BYTES = 3
+
+
+def _b64encode(data: bytes) -> str:
+    """Unpadded URL-safe base64."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str, size: int) -> bytes:
+    """Inverse of _b64encode, checking the decoded size."""
+    try:
+        data = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"invalid ID {text!r}") from error
+    if len(data) != size:
+        raise ValueError(f"invalid ID {text!r}")
+    return data
+
+
+def encode_position(cells: Sequence[int], is_white: bool) -> str:
+    """
+    Encodes a position.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+        is_white (bool): Whether white is to move.
+
+    Returns:
+        str: The 15-character position ID.
+
+    Raises:
+        ValueError: If a side has more than 15 checkers on the board.
+    """
+    bits = 0 if is_white else 1
+    length = 1
+    for white in (True, False):
+        counts = [cells[i] if white else -cells[23 - i] for i in range(24)]
+        counts = [max(count, 0) for count in counts] + [cells[24 if white else 25]]
+        if sum(counts) > CHECKERS:
+            raise ValueError("a side has more than 15 checkers on the board")
+        for count in counts:
+            bits |= ((1 << count) - 1) << length
+            length += count + 1
+    return _b64encode(bits.to_bytes(POSITION_BYTES, 'little'))
+
+
+def decode_position(position_id: str) -> Tuple[List[int], bool]:
+    """
+    Decodes a position ID.
+
+    Args:
+        position_id (str): An ID returned by encode_position.
+
+    Returns:
+        tuple: (cells, is_white) with the 28 ArrayBoard cells and the side to move.
+
+    Raises:
+        ValueError: If the ID is malformed.
+    """
+    bits = int.from_bytes(_b64decode(position_id, POSITION_BYTES), 'little')
+    is_white = not bits & 1
+    bits >>= 1
+    cells = [0] * 28
+    for white in (True, False):
+        counts = []
+        for _ in range(25):
+            count = 0
+            while bits & 1:
+                count += 1
+                bits >>= 1
+            bits >>= 1
+            counts.append(count)
+        if sum(counts) > CHECKERS:
+            raise ValueError(f"invalid ID {position_id!r}")
+        for i in range(24):
+            if counts[i]:
+                if cells[i if white else 23 - i]:
+                    raise ValueError(f"invalid ID {position_id!r}")
+                cells[i if white else 23 - i] = counts[i] if white else -counts[i]
+        cells[24 if white else 25] = counts[24]
+        cells[26 if white else 27] = CHECKERS - sum(counts)
+    if bits:
+        raise ValueError(f"invalid ID {position_id!r}")
+    return cells, is_white
+
+
+def _is_dice_left(values: Sequence[int]) -> bool:
+    """Whether values can be left of one roll: two different dice, or up to four of a double."""
+    if len(set(values)) > 1:
+        return len(values) == 2
+    return len(values) <= 4
+
+
+def encode_dice(values: Sequence[int]) -> str:
+    """
+    Encodes the dice left to play.
+
+    Args:
+        values (sequence of int): Die values from 1 to 6 left of one roll: two different
+            values, or up to four equal ones. The order is ignored.
+
+    Returns:
+        str: The 4-character dice ID.
+
+    Raises:
+        ValueError: If the values cannot be left of a roll.
+    """
+    bits = 0
+    for value in values:
+        if not 1 <= value <= 6:
+            raise ValueError(f"invalid die value {value}")
+        bits += 1 << (3 * (value - 1))
+    if not _is_dice_left(values):
+        raise ValueError(f"dice {list(values)} cannot be left of one roll")
+    return _b64encode(bits.to_bytes(DICE_BYTES, 'little'))
+
+
+def decode_dice(dice_id: str) -> List[int]:
+    """
+    Decodes a dice ID.
+
+    Args:
+        dice_id (str): An ID returned by encode_dice.
+
+    Returns:
+        list[int]: The dice, highest first.
+
+    Raises:
+        ValueError: If the ID is malformed, has bits set outside the six face counts or holds
+            dice that cannot be left of one roll.
+    """
+    bits = int.from_bytes(_b64decode(dice_id, DICE_BYTES), 'little')
+    if bits >> (3 * 6):
+        raise ValueError(f"invalid ID {dice_id!r}")
+    values = []
+    for face in range(6, 0, -1):
+        values += [face] * ((bits >> (3 * (face - 1))) & 7)
+    if not _is_dice_left(values):
+        raise ValueError(f"invalid ID {dice_id!r}")
+    return values
@@ -0,0 +1,261 @@
+"""
+Compact binary game records.
+
+A record file starts with a 5-byte header (magic b'BGRC' and a version byte) followed by
+one block per game. Each block is a little-endian uint32 length and a payload holding:
+
+    28 signed bytes     the initial position in the ArrayBoard cell layout
+    2 x (uint8 + utf-8) the white and black player names
+    events              one byte per roll, two bytes per move
+    0x00 + result byte  end of game: 0 white won, 1 black won, 255 unfinished
+
+Events are tagged by their top two bits: 01 and 10 are rolls by white and black, with
+(d1 - 1) * 6 + (d2 - 1) in the low six bits; 11 is a move, with the mover's color in bit 5
+(set for black), the origin in the low five bits (24 for the bar) and the destination in the
+next byte (24 for off). A typical turn therefore takes 5 to 9 bytes. The length prefix lets
+readers skip games without parsing them.
+
+Version 1 files had no color bit; their moves are attributed to the side that rolled last.
+"""
+from __future__ import annotations
+from array import array
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+import struct
+from core.array_board import ArrayBoard, NUM_CELLS
+from core.player import Player
+from core.movegen import die_for_move
+
+if TYPE_CHECKING:
+    from core.game import Game
+
+MAGIC = b'BGRC'
+VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+_HEADER = struct.Struct('<4sB')
+_LENGTH = struct.Struct('<I')
+_CELLS = struct.Struct(f'<{NUM_CELLS}b')
+
+_END = 0x00
+_WHITE_ROLL = 0x40
+_BLACK_ROLL = 0x80
+_MOVE = 0xC0
+_BLACK_MOVE = 0x20
+_BAR_OR_OFF = 24
+_RESULTS = {'white': 0, 'black': 1, None: 255}
+
+
+class Roll(NamedTuple):
+    """A roll of the dice: the color of the roller and the two dice."""
+    color: str
+    dice: Tuple[int, int]
+
+
+class Move(NamedTuple):
+    """A checker move and the color of the mover; points are 0-23, 'bar' or 'off'."""
+    color: str
+    from_point: object
+    to_point: object
+
+
+class GameRecord(NamedTuple):
+    """
+    A recorded game.
+
+    Attributes:
+        white (str): Name of the white player.
+        black (str): Name of the black player.
+        cells (tuple of int): The initial position in the ArrayBoard layout.
+        events (list): Roll and Move events in the order they happened.
+        winner (str or None): 'white', 'black' or None if the game was not finished.
+    """
+    white: str
+    black: str
+    cells: Tuple[int, ...]
+    events: List[object]
+    winner: Optional[str]
+
+
+class GameRecordWriter:
+    """
+    Streams games to a binary record file.
+
+    A game is attached with start_game; from then on Game.roll_dice, Game.determine_first_player
+    and Game.move report to the writer, and the game block is written when the game is won
+    (or end_game is called). Finished blocks are buffered and written out in large chunks.
+    """
+
+    def __init__(self, stream: BinaryIO, buffer_size: int = 1 << 16):
+        """
+        Initializes the writer and writes the file header.
+
+        Args:
+            stream (BinaryIO): A binary file opened for writing (or appending to an empty file).
+            buffer_size (int, optional): Bytes buffered before they are written to the stream.
+        """
+        self.__stream__ = stream
+        self.__buffer_size__ = buffer_size
+        self.__buffer__ = bytearray(_HEADER.pack(MAGIC, VERSION))
+        self.__game__: Optional['Game'] = None
+        self.__payload__ = bytearray()
+        self.games = 0
+
+    def __enter__(self):
+        """Returns the writer for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the writer at the end of a with statement."""
+        self.close()
+
+    def start_game(self, game: 'Game'):
+        """
+        Starts recording a game from its current position.
+
+        Args:
+            game (Game): The game to record. Only one game is recorded at a time; an
+                unfinished previous game is written as unfinished.
+        """
+        if self.__game__ is not None:
+            self.end_game()
+        white, black = game.board.get_players()
+        payload = bytearray(_CELLS.pack(*ArrayBoard.from_board(game.board).get_cells_snapshot()))
+        for name in (white.get_name(), black.get_name()):
+            encoded = name.encode('utf-8')[:255]
+            payload.append(len(encoded))
+            payload += encoded
+        self.__payload__ = payload
+        self.__game__ = game
+        game.set_recorder(self)
+
+    def record_roll(self, player: 'Player', dice):
+        """Records a roll; dice holds the two dice (doubles may already be expanded to four)."""
+        tag = _WHITE_ROLL if player.get_color() == 'white' else _BLACK_ROLL
+        self.__payload__.append(tag | (dice[0] - 1) * 6 + (dice[1] - 1))
+
+    def record_move(self, player: 'Player', from_point, to_point):
+        """Records a move of a player."""
+        tag = _MOVE if player.get_color() == 'white' else _MOVE | _BLACK_MOVE
+        self.__payload__.append(tag | (_BAR_OR_OFF if from_point == 'bar' else from_point))
+        self.__payload__.append(_BAR_OR_OFF if to_point == 'off' else to_point)
+
+    def end_game(self, winner: 'Player' = None):
+        """
+        Finishes the current game and queues its block for writing.
+
+        Args:
+            winner (Player, optional): The winner, or None if the game was abandoned.
+        """
+        if self.__game__ is None:
+            return
+        self.__game__.set_recorder(None)
+        self.__game__ = None
+        payload = self.__payload__
+        payload.append(_END)
+        payload.append(_RESULTS[winner.get_color() if winner is not None else None])
+        self.__buffer__ += _LENGTH.pack(len(payload))
+        self.__buffer__ += payload
+        self.__payload__ = bytearray()
+        self.games += 1
+        if len(self.__buffer__) >= self.__buffer_size__:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered blocks to the stream."""
+        if self.__buffer__:
+            self.__stream__.write(self.__buffer__)
+            self.__buffer__ = bytearray()
+        self.__stream__.flush()
+
+    def close(self):
+        """Ends any game in progress as unfinished and flushes the buffer (the stream stays open)."""
+        self.end_game()
+        self.flush()
+
+
+def _decode(payload: bytes, version: int = VERSION) -> GameRecord:
+    """Decodes the payload of one game block written in a given format version."""
+    cells = _CELLS.unpack_from(payload, 0)
+    offset = _CELLS.size
+    names = []
+    for _ in range(2):
+        size = payload[offset]
+        names.append(payload[offset + 1:offset + 1 + size].decode('utf-8'))
+        offset += 1 + size
+
+    events: List[object] = []
+    color = None
+    winner = None
+    end = len(payload)
+    while offset < end:
+        byte = payload[offset]
+        kind = byte & 0xC0
+        if kind == _MOVE:
+            origin, destination = byte & 0x1F, payload[offset + 1]
+            if version > 1:
+                color = 'black' if byte & _BLACK_MOVE else 'white'
+            events.append(Move(color, 'bar' if origin == _BAR_OR_OFF else origin,
+                               'off' if destination == _BAR_OR_OFF else destination))
+            offset += 2
+        elif kind == _END:
+            result = payload[offset + 1]
+            winner = 'white' if result == 0 else 'black' if result == 1 else None
+            break
+        else:
+            color = 'white' if kind == _WHITE_ROLL else 'black'
+            d1, d2 = divmod(byte & 0x3F, 6)
+            events.append(Roll(color, (d1 + 1, d2 + 1)))
+            offset += 1
+    return GameRecord(names[0], names[1], cells, events, winner)
+
+
+def read_games(stream: BinaryIO) -> Iterator[GameRecord]:
+    """
+    Iterates over the games of a record file, one block in memory at a time.
+
+    Args:
+        stream (BinaryIO): A binary file opened for reading.
+
+    Yields:
+        GameRecord: The games in file order.
+
+    Raises:
+        ValueError: If the stream is not a game record file or ends in the middle of a game.
+    """
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("not a game record file")
+    magic, version = _HEADER.unpack(header)
+    if magic != MAGIC or version not in _READABLE_VERSIONS:
+        raise ValueError("not a game record file")
+    while True:
+        prefix = stream.read(_LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) < _LENGTH.size:
+            raise ValueError("truncated game record")
+        (length,) = _LENGTH.unpack(prefix)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("truncated game record")
+        yield _decode(payload, version)
+
+
+def replay(record: GameRecord) -> Iterator[ArrayBoard]:
+    """
+    Replays a recorded game move by move.
+
+    Args:
+        record (GameRecord): The game to replay.
+
+    Yields:
+        ArrayBoard: The board after each move (the same object, updated in place).
+    """
+    white, black = Player(record.white, 'white'), Player(record.black, 'black')
+    board = ArrayBoard(white, black)
+    board.get_cells()[:] = array('b', record.cells)
+    for event in record.events:
+        if isinstance(event, Move):
+            is_white = event.color == 'white'
+            board.move_piece(event.from_point, die_for_move(event.from_point, event.to_point, is_white),
+                             white if is_white else black)
+            yield board
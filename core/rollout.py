@@ -0,0 +1,241 @@
+"""
+Monte Carlo rollouts of a position.
+
+A rollout plays the position out many times with a fixed policy for both sides and averages
+the results into win, gammon and backgammon probabilities. Three techniques cut the number
+of games needed: antithetic pairs replay each game with every die d turned into 7 - d, the
+first roll is stratified over all 36 outcomes, and the rollout stops early once the
+confidence interval of the equity is narrow enough. Games can also be truncated after a
+number of plies and scored with an evaluator.
+
+Usage:
+    result = Rollout(max_trials=648).run(board, player)
+"""
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+import math
+import random
+from core.ai import AIPlayer
+from core.array_board import ArrayBoard, WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+from core.movegen import die_for_move
+from core.search import evaluate_position
+
+if TYPE_CHECKING:
+    from core.board import Board
+    from core.player import Player
+
+# Safety net for games that never finish during a rollout.
+MAX_PLIES = 1000
+
+
+def heuristic_outcome(cells, is_white: bool):
+    """
+    Default evaluator for truncated rollouts, based on the search heuristic.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+        is_white (bool): The side to move.
+
+    Returns:
+        tuple: (win, win_gammon, win_backgammon, lose_gammon, lose_backgammon) probabilities
+        for the side to move. The heuristic does not estimate gammons.
+    """
+    return (evaluate_position(cells, is_white) + 1) / 2, 0.0, 0.0, 0.0, 0.0
+
+
+class RolloutResult:
+    """
+    Estimated outcome probabilities for the side to move.
+
+    Attributes
+    ----------
+    trials : int
+        Games played.
+    win, win_gammon, win_backgammon, lose_gammon, lose_backgammon : float
+        Estimated probabilities; gammon figures include backgammons.
+    equity : float
+        Cubeless equity: 2 * win - 1 plus the gammon and backgammon terms.
+    std_error : float
+        Standard error of the equity estimate.
+    """
+
+    def __init__(self, trials: int, totals, equity: float, std_error: float):
+        """
+        Initializes the result.
+
+        Args:
+            trials (int): Games played.
+            totals (sequence of float): Summed (win, wg, wbg, lg, lbg) over the trials.
+            equity (float): The mean equity.
+            std_error (float): Standard error of the equity.
+        """
+        self.trials = trials
+        self.win, self.win_gammon, self.win_backgammon, self.lose_gammon, self.lose_backgammon = \
+            (total / trials for total in totals)
+        self.equity = equity
+        self.std_error = std_error
+
+    def confidence_interval(self, z: float = 1.96):
+        """Returns the (low, high) confidence interval of the equity."""
+        return self.equity - z * self.std_error, self.equity + z * self.std_error
+
+    def __repr__(self):
+        """Returns a short summary of the estimate."""
+        return (f"RolloutResult(trials={self.trials}, win={self.win:.3f}, "
+                f"gammon={self.win_gammon:.3f}, equity={self.equity:+.3f}±{self.std_error:.3f})")
+
+
+class Rollout:
+    """
+    Monte Carlo rollout evaluator.
+
+    Plays a position out many times with a pluggable policy and averages the outcomes.
+    Variance is reduced with antithetic dice (each game is paired with one where every die d
+    is replaced by 7 - d) and a stratified first roll that cycles through all 36 outcomes.
+    The rollout stops early once the equity confidence interval is narrow enough.
+    """
+
+    def __init__(self, policy=AIPlayer, max_trials: int = 1296, min_trials: int = 72,
+                 tolerance: float = 0.02, z: float = 1.96, truncate_after: Optional[int] = None,
+                 evaluator=heuristic_outcome, antithetic: bool = True, stratify: bool = True,
+                 seed: int = 0):
+        """
+        Initializes the rollout.
+
+        Args:
+            policy (type, optional): AIPlayer class (or any Player with choose_moves) used for
+                both sides.
+            max_trials (int, optional): Upper limit of games.
+            min_trials (int, optional): Games played before early stopping is considered.
+            tolerance (float, optional): Stop when z * std_error of the equity is below this.
+            z (float, optional): Normal quantile of the confidence interval.
+            truncate_after (int, optional): Plies after which a game is scored with the evaluator.
+            evaluator (callable, optional): evaluator(cells, is_white) -> outcome tuple for
+                truncation.
+            antithetic (bool, optional): Whether to pair games with mirrored dice.
+            stratify (bool, optional): Whether to cycle the first roll through all 36 outcomes.
+            seed (int, optional): Seed of the dice streams.
+        """
+        self.__policy__ = policy
+        self.__max_trials__ = max_trials
+        self.__min_trials__ = min_trials
+        self.__tolerance__ = tolerance
+        self.__z__ = z
+        self.__truncate_after__ = truncate_after
+        self.__evaluator__ = evaluator
+        self.__antithetic__ = antithetic
+        self.__stratify__ = stratify
+        self.__seed__ = seed
+
+    def run(self, board: 'Board', player: 'Player') -> RolloutResult:
+        """
+        Rolls out a position.
+
+        Args:
+            board (Board or ArrayBoard): The position. It is not modified.
+            player (Player): The side to move, who rolls next.
+
+        Returns:
+            RolloutResult: The estimated probabilities for that player.
+        """
+        start = board.copy() if isinstance(board, ArrayBoard) else ArrayBoard.from_board(board)
+        is_white = player.get_color() == 'white'
+        # Policies compare checker owners by name, so they take the names of the board's players.
+        white, black = start.get_players()
+        policies = (self.__policy__(white.get_name(), 'white'),
+                    self.__policy__(black.get_name(), 'black'))
+        group = 2 if self.__antithetic__ else 1
+        seeds = random.Random(self.__seed__)
+
+        totals = [0.0] * 5
+        trials = 0
+        samples = 0
+        equity_sum = equity_square_sum = 0.0
+        while trials + group <= self.__max_trials__:
+            pair_seed = seeds.getrandbits(64)
+            sample_equity = 0.0
+            for member in range(group):
+                first_roll = None
+                if self.__stratify__:
+                    first_roll = divmod((trials // group) % 36, 6)
+                    first_roll = (first_roll[0] + 1, first_roll[1] + 1)
+                outcome = self._play(start.copy(), policies, is_white, random.Random(pair_seed),
+                                     mirror=member == 1, first_roll=first_roll)
+                for i in range(5):
+                    totals[i] += outcome[i]
+                sample_equity += _equity(outcome) / group
+            trials += group
+            samples += 1
+            equity_sum += sample_equity
+            equity_square_sum += sample_equity * sample_equity
+            if trials >= self.__min_trials__ and samples > 1:
+                std_error = _std_error(equity_sum, equity_square_sum, samples)
+                if self.__z__ * std_error < self.__tolerance__:
+                    break
+
+        mean = equity_sum / samples
+        std_error = _std_error(equity_sum, equity_square_sum, samples)
+        return RolloutResult(trials, totals, mean, std_error)
+
+    def _play(self, board: ArrayBoard, policies, root_is_white: bool, rng: random.Random,
+              mirror: bool, first_roll) -> tuple:
+        """Plays one game from the root position and returns the outcome for the root side."""
+        cells = board.get_cells_snapshot()
+        is_white = root_is_white
+        for ply in range(MAX_PLIES):
+            if self.__truncate_after__ is not None and ply >= self.__truncate_after__:
+                outcome = self.__evaluator__(cells, is_white)
+                return outcome if is_white == root_is_white else _flip(outcome)
+
+            d1, d2 = rng.randint(1, 6), rng.randint(1, 6)
+            if ply == 0 and first_roll is not None:
+                d1, d2 = first_roll
+            if mirror:
+                d1, d2 = 7 - d1, 7 - d2
+            dice = [d1] * 4 if d1 == d2 else [d1, d2]
+
+            mover = policies[0 if is_white else 1]
+            for from_point, to_point in mover.choose_moves(board, dice):
+                board.move_piece(from_point, die_for_move(from_point, to_point, is_white), mover)
+            cells = board.get_cells_snapshot()
+
+            if cells[WHITE_OFF if is_white else BLACK_OFF] == 15:
+                outcome = _win_outcome(cells, is_white)
+                return outcome if is_white == root_is_white else _flip(outcome)
+            is_white = not is_white
+
+        outcome = self.__evaluator__(cells, is_white)
+        return outcome if is_white == root_is_white else _flip(outcome)
+
+
+def _win_outcome(cells, winner_is_white: bool) -> tuple:
+    """Outcome tuple for the winner of a finished game."""
+    loser_off = cells[BLACK_OFF if winner_is_white else WHITE_OFF]
+    if loser_off:
+        return 1.0, 0.0, 0.0, 0.0, 0.0
+    if winner_is_white:
+        backgammon = cells[BLACK_BAR] > 0 or any(c < 0 for c in cells[0:6])
+    else:
+        backgammon = cells[WHITE_BAR] > 0 or any(c > 0 for c in cells[18:24])
+    return 1.0, 1.0, 1.0 if backgammon else 0.0, 0.0, 0.0
+
+
+def _flip(outcome) -> tuple:
+    """Converts an outcome tuple to the other side's point of view."""
+    win, win_gammon, win_backgammon, lose_gammon, lose_backgammon = outcome
+    return 1.0 - win, lose_gammon, lose_backgammon, win_gammon, win_backgammon
+
+
+def _equity(outcome) -> float:
+    """Cubeless equity of an outcome tuple."""
+    win, win_gammon, win_backgammon, lose_gammon, lose_backgammon = outcome
+    return 2 * win - 1 + win_gammon - lose_gammon + win_backgammon - lose_backgammon
+
+
+def _std_error(total: float, square_total: float, samples: int) -> float:
+    """Standard error of the mean from running sums."""
+    if samples < 2:
+        return math.inf
+    mean = total / samples
+    variance = max(square_total / samples - mean * mean, 0.0) * samples / (samples - 1)
+    return math.sqrt(variance / samples)
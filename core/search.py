@@ -0,0 +1,405 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+import math
+import threading
+import time
+from core.movegen import generate_positions, to_perspective
+from core.zobrist import hash_cells, hash_after_play, BLACK_TO_MOVE_KEY
+
+# The 21 distinct rolls and their probabilities out of 36.
+ROLLS: Tuple[Tuple[Tuple[int, ...], float], ...] = tuple(
+    ((d1,) * 4 if d1 == d2 else (d1, d2), (1 if d1 == d2 else 2) / 36)
+    for d1 in range(1, 7) for d2 in range(d1, 7)
+)
+
+# Evaluations are bounded so chance nodes can be pruned (Star1/Star2).
+WIN_SCORE = 1.0
+LOSS_SCORE = -1.0
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out."""
+
+
+def evaluate_position(cells, is_white: bool) -> float:
+    """
+    Heuristic evaluation of a position for the side to move.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+        is_white (bool): Whether the side to move is white.
+
+    Returns:
+        float: A score in [-1, 1]; 1 is a won game for the side to move.
+    """
+    c = to_perspective(cells, is_white)
+    if c[26] == 15: return WIN_SCORE
+    if c[27] == 15: return LOSS_SCORE
+
+    pips = 25 * c[24]
+    opponent_pips = 25 * c[25]
+    blots = opponent_blots = home_points = opponent_home_points = 0
+    for i in range(24):
+        count = c[i]
+        if count > 0:
+            pips += count * (i + 1)
+            if count == 1:
+                blots += 1
+            elif i < 6:
+                home_points += 1
+        elif count < 0:
+            opponent_pips -= count * (24 - i)
+            if count == -1:
+                opponent_blots += 1
+            elif i > 17:
+                opponent_home_points += 1
+
+    score = (0.015 * (opponent_pips - pips)
+             + 0.08 * (c[26] - c[27])
+             + 0.05 * (opponent_blots - blots)
+             + 0.04 * (home_points - opponent_home_points)
+             + 0.12 * (c[25] - c[24]))
+    return math.tanh(score)
+
+
+class TranspositionTable:
+    """
+    Bounded transposition table keyed on 64-bit position hashes.
+
+    Entries live in a fixed number of slots addressed by the low bits of the key. A new entry
+    replaces the stored one if the slot is empty, holds the same position, was written by an
+    older search, or was searched to a depth no greater than the new one.
+    """
+
+    def __init__(self, size_bits: int = 16):
+        """
+        Initializes the table.
+
+        Args:
+            size_bits (int, optional): The table holds 2**size_bits entries. Defaults to 16.
+        """
+        size = 1 << size_bits
+        self.__mask__ = size - 1
+        self.__keys__: List[Optional[int]] = [None] * size
+        self.__depths__ = [0] * size
+        self.__values__ = [0.0] * size
+        self.__flags__ = [EXACT] * size
+        self.__generations__ = [0] * size
+        self.__generation__ = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        """Returns the number of slots in the table."""
+        return self.__mask__ + 1
+
+    def new_search(self):
+        """Marks the start of a new search so entries from older searches become replaceable."""
+        self.__generation__ += 1
+
+    def probe(self, key: int):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): The position hash.
+
+        Returns:
+            tuple or None: (depth, value, flag) if the position is stored, otherwise None.
+        """
+        slot = key & self.__mask__
+        if self.__keys__[slot] == key:
+            self.hits += 1
+            return self.__depths__[slot], self.__values__[slot], self.__flags__[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int):
+        """
+        Stores a search result, subject to the replacement policy.
+
+        Args:
+            key (int): The position hash.
+            depth (int): The remaining depth the value was searched to.
+            value (float): The value, from the point of view of the side to move.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+        """
+        slot = key & self.__mask__
+        stored_key = self.__keys__[slot]
+        if (stored_key is not None and stored_key != key
+                and self.__generations__[slot] == self.__generation__
+                and self.__depths__[slot] > depth):
+            return
+        self.__keys__[slot] = key
+        self.__depths__[slot] = depth
+        self.__values__[slot] = value
+        self.__flags__[slot] = flag
+        self.__generations__[slot] = self.__generation__
+        self.stores += 1
+
+
+class ExpectiminimaxSearch:
+    """
+    Depth-limited expectiminimax over the 21 distinct rolls with Star1/Star2 chance-node pruning.
+
+    Depth counts plies: depth 1 picks the play with the best static evaluation, depth 2 also
+    averages over every reply roll of the opponent, and so on.
+    """
+
+    def __init__(self, table: Optional[TranspositionTable] = None, evaluate=evaluate_position):
+        """
+        Initializes the search.
+
+        Args:
+            table (TranspositionTable, optional): The transposition table to use. A new one is
+                created if omitted.
+            evaluate (callable, optional): evaluate(cells, is_white) -> float in [-1, 1]. If it
+                also has an evaluate_batch method (see core.evaluator), the plays of each roll
+                are ordered with one batched call.
+        """
+        self.__table__ = table if table is not None else TranspositionTable()
+        self.__evaluate__ = evaluate
+        self.__deadline__ = None
+        # Set by stop(); unlike the deadline it is not reset when a search starts.
+        self.__stopped__ = threading.Event()
+        self.nodes = 0
+        self.last_depth = 0
+
+    def get_table(self) -> TranspositionTable:
+        """Returns the transposition table used by this search."""
+        return self.__table__
+
+    def stop(self):
+        """
+        Makes a search running in another thread return its best play so far, as if its time
+        budget had run out. Searches started afterwards stop at once too, until clear_stop is
+        called, so a stop that lands just before a search starts is not lost.
+        """
+        self.__stopped__.set()
+
+    def clear_stop(self):
+        """Lets searches run again after stop; call it before starting a new job."""
+        self.__stopped__.clear()
+
+    def _out_of_time(self) -> bool:
+        """Returns True once the search was stopped or its deadline has passed."""
+        deadline = self.__deadline__
+        if self.__stopped__.is_set():
+            return True
+        return deadline is not None and time.perf_counter() > deadline
+
+    def choose_play(self, cells, is_white: bool, dice, depth: int = 2,
+                    time_budget: Optional[float] = None) -> List[tuple]:
+        """
+        Picks the best play for a roll.
+
+        Args:
+            cells (sequence of int): The 28 ArrayBoard cells.
+            is_white (bool): Whether the side to move is white.
+            dice (list[int]): The dice available for the turn.
+            depth (int, optional): The search depth in plies. Defaults to 2.
+            time_budget (float, optional): Seconds allowed for the search. When it runs out,
+                the best play among the fully searched ones is returned.
+
+        Returns:
+            list: The chosen moves as (from_point, to_point) tuples.
+        """
+        self.__deadline__ = None if time_budget is None else time.perf_counter() + time_budget
+        self.__table__.new_search()
+        self.nodes = 0
+
+        plays = self._ordered_plays(cells, is_white, dice)
+        if len(plays) == 1 or depth <= 1:
+            return plays[0][0]
+        return self._search_root(plays, cells, is_white, depth)[0]
+
+    def iterative_play(self, cells, is_white: bool, dice, max_depth: Optional[int] = None,
+                       time_budget: Optional[float] = None) -> List[tuple]:
+        """
+        Picks the best play for a roll by iterative deepening (an anytime search).
+
+        The plays are searched at depth 1, 2, 3 and so on, each iteration starting with the best
+        play of the previous one, so a play is always ready. When the time budget runs out, the
+        best play of the last finished iteration is returned, or the play the interrupted
+        iteration found to be better than it. The depth reached is left in last_depth.
+
+        Args:
+            cells (sequence of int): The 28 ArrayBoard cells.
+            is_white (bool): Whether the side to move is white.
+            dice (list[int]): The dice available for the turn.
+            max_depth (int, optional): Deepest iteration; None deepens until the time runs out.
+            time_budget (float, optional): Seconds allowed for the search.
+
+        Returns:
+            list: The chosen moves as (from_point, to_point) tuples.
+
+        Raises:
+            ValueError: If neither a maximum depth nor a time budget is given.
+        """
+        if max_depth is None and time_budget is None:
+            raise ValueError("iterative deepening needs a maximum depth or a time budget")
+        self.__deadline__ = None if time_budget is None else time.perf_counter() + time_budget
+        self.__table__.new_search()
+        self.nodes = 0
+        self.last_depth = 1
+
+        plays = self._ordered_plays(cells, is_white, dice)
+        best_moves = plays[0][0]
+        depth = 2
+        while len(plays) > 1 and (max_depth is None or depth <= max_depth):
+            best_moves, best_value, complete = self._search_root(plays, cells, is_white, depth)
+            if not complete:
+                break
+            self.last_depth = depth
+            if abs(best_value) >= WIN_SCORE:
+                break  # Deeper searches cannot change a decided game.
+            plays.sort(key=lambda play: play[0] != best_moves)
+            depth += 1
+        return best_moves
+
+    def _search_root(self,
+                     plays,
+                     cells,
+                     is_white: bool,
+                     depth: int) -> Tuple[List[tuple], float, bool]:
+        """
+        Searches every play of the root at the given depth.
+
+        The root position is hashed once; every node below derives its key from its parent's.
+
+        Returns:
+            tuple: (best moves, their value, whether every play was searched before the deadline).
+            The first play is the answer if the deadline passes before it is searched.
+        """
+        best_moves, best_value = plays[0][0], LOSS_SCORE - 1
+        key = hash_cells(cells) ^ (0 if is_white else BLACK_TO_MOVE_KEY)
+        try:
+            for moves, child in plays:
+                value = -self._chance(child, hash_after_play(key, cells, moves, child, is_white),
+                                      not is_white, depth - 1, LOSS_SCORE, -best_value)
+                if value > best_value:
+                    best_moves, best_value = moves, value
+        except SearchTimeout:
+            return best_moves, best_value, False
+        return best_moves, best_value, True
+
+    def _ordered_plays(self, cells, is_white: bool, dice):
+        """Returns the (moves, cells) plays for a roll, best static evaluation first."""
+        evaluate = self.__evaluate__
+        plays = generate_positions(cells, is_white, dice)
+        if len(plays) > 1:
+            batch = getattr(evaluate, 'evaluate_batch', None)
+            if batch is None:
+                plays.sort(key=lambda play: evaluate(play[1], not is_white))
+            else:
+                scores = batch([play[1] for play in plays], not is_white)
+                order = sorted(range(len(plays)), key=scores.__getitem__)
+                plays = [plays[i] for i in order]
+        return plays
+
+    def _chance(self,
+                cells,
+                key: int,
+                is_white: bool,
+                depth: int,
+                alpha: float,
+                beta: float) -> float:
+        """
+        Value of a position before the side to move rolls, pruned with Star2.
+
+        key is the position hash with the side to move, as derived by hash_after_play.
+
+        Returns a value v with the usual fail-soft meaning: v <= alpha is an upper bound,
+        v >= beta is a lower bound, anything in between is exact.
+        """
+        self.nodes += 1
+        if self._out_of_time():
+            raise SearchTimeout()
+
+        if cells[26] == 15 or cells[27] == 15 or depth <= 0:
+            return self.__evaluate__(cells, is_white)
+
+        entry = self.__table__.probe(key)
+        if entry is not None and entry[0] >= depth:
+            _, value, flag = entry
+            if flag == EXACT or (flag == LOWER_BOUND and value >= beta) or \
+                    (flag == UPPER_BOUND and value <= alpha):
+                return value
+
+        # Star2 probing: the first (best-ordered) play of every roll gives a lower bound.
+        roll_plays = []
+        probes = []
+        for dice, _ in ROLLS:
+            # Checked per roll too: a single node at the horizon can take milliseconds.
+            if self._out_of_time():
+                raise SearchTimeout()
+            plays = self._ordered_plays(cells, is_white, dice)
+            roll_plays.append(plays)
+            if depth > 1:
+                moves, child = plays[0]
+                child_key = hash_after_play(key, cells, moves, child, is_white)
+                probes.append(-self._chance(child, child_key, not is_white, depth - 1,
+                                            LOSS_SCORE, WIN_SCORE))
+            else:
+                probes.append(-self.__evaluate__(plays[0][1], not is_white))
+
+        lower_rest = sum(p * probe for (_, p), probe in zip(ROLLS, probes))
+        if lower_rest >= beta:
+            self.__table__.store(key, depth, lower_rest, LOWER_BOUND)
+            return lower_rest
+
+        # Star1 over the rolls, with the probe values as lower bounds for unsearched rolls.
+        total = 0.0
+        remaining = 1.0
+        for (_, p), plays, probe in zip(ROLLS, roll_plays, probes):
+            remaining -= p
+            lower_rest -= p * probe
+            roll_alpha = (alpha - total - WIN_SCORE * remaining) / p
+            roll_beta = (beta - total - lower_rest) / p
+            value = self._max(plays, cells, key, is_white, depth, max(roll_alpha, LOSS_SCORE),
+                              min(roll_beta, WIN_SCORE), probe)
+            total += p * value
+            if value <= roll_alpha:
+                bound = total + WIN_SCORE * remaining
+                self.__table__.store(key, depth, bound, UPPER_BOUND)
+                return bound
+            if value >= roll_beta:
+                bound = total + lower_rest
+                self.__table__.store(key, depth, bound, LOWER_BOUND)
+                return bound
+
+        self.__table__.store(key, depth, total, EXACT)
+        return total
+
+    def _max(self,
+             plays,
+             cells,
+             key: int,
+             is_white: bool,
+             depth: int,
+             alpha: float,
+             beta: float,
+             probe: float) -> float:
+        """
+        Best value over the plays of one roll for the side to move.
+
+        cells and key are the parent's; probe is the value of the first (best-ordered) play.
+        """
+        if depth <= 1:
+            return probe  # The first ordered play already has the best static evaluation.
+        best = probe
+        if best >= beta:
+            return best
+        for moves, child in plays[1:]:
+            value = -self._chance(child, hash_after_play(key, cells, moves, child, is_white),
+                                  not is_white, depth - 1, -beta, -max(alpha, best))
+            if value > best:
+                best = value
+                if best >= beta:
+                    break
+        return best
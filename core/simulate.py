@@ -0,0 +1,280 @@
+"""
+Headless AI-vs-AI batch simulation.
+
+Runs complete games between two AI classes, sharded across a process pool. Each shard
+gets its own seed and every game its own dice stream spawned from it, so a run is
+reproducible for a given seed and shard size regardless of the number of workers. Shard
+results stream back as they finish and are merged into a SimulationStats.
+
+Usage:
+    python -m core.simulate --games 10000 --workers 8 --seed 42
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+from typing import Iterator, Optional
+from core.ai import AIPlayer
+from core.dice import Dice, DiceStream
+from core.game import Game
+
+# Safety net against games that never finish (e.g. two AIs that cannot break a prime).
+MAX_TURNS = 1000
+
+
+def pip_count(board, player) -> int:
+    """
+    Returns the number of pips a player still needs to bear off all checkers.
+
+    Args:
+        board (Board): The board.
+        player (Player): The player to count for.
+
+    Returns:
+        int: The pip count, counting checkers on the bar as 25 pips.
+    """
+    return board.get_pip_count(player)
+
+
+class SimulationStats:
+    """
+    Aggregate results of a batch of games.
+
+    Attributes
+    ----------
+    games : int
+        Number of games played.
+    wins : dict
+        Wins per color ('white', 'black').
+    gammons : dict
+        Gammons (loser bore off nothing) per winning color, backgammons included.
+    backgammons : dict
+        Backgammons (loser still on the bar or in the winner's home) per winning color.
+    unfinished : int
+        Games stopped after MAX_TURNS.
+    total_turns : int
+        Sum of turns over all games.
+    total_loser_pips : int
+        Sum of the loser's pip count at the end of finished games.
+    max_loser_pips : int
+        Largest loser pip count seen.
+    """
+
+    def __init__(self):
+        """Initializes empty statistics."""
+        self.games = 0
+        self.wins = {'white': 0, 'black': 0}
+        self.gammons = {'white': 0, 'black': 0}
+        self.backgammons = {'white': 0, 'black': 0}
+        self.unfinished = 0
+        self.total_turns = 0
+        self.total_loser_pips = 0
+        self.max_loser_pips = 0
+
+    def record_game(self, result: dict):
+        """
+        Adds the result of one game.
+
+        Args:
+            result (dict): A result as returned by play_game.
+        """
+        self.games += 1
+        self.total_turns += result['turns']
+        winner = result['winner']
+        if winner is None:
+            self.unfinished += 1
+            return
+        self.wins[winner] += 1
+        if result['gammon']:
+            self.gammons[winner] += 1
+        if result['backgammon']:
+            self.backgammons[winner] += 1
+        self.total_loser_pips += result['loser_pips']
+        self.max_loser_pips = max(self.max_loser_pips, result['loser_pips'])
+
+    def merge(self, other: 'SimulationStats'):
+        """
+        Adds the counts of another SimulationStats into this one.
+
+        Args:
+            other (SimulationStats): The statistics to merge.
+        """
+        self.games += other.games
+        for color in ('white', 'black'):
+            self.wins[color] += other.wins[color]
+            self.gammons[color] += other.gammons[color]
+            self.backgammons[color] += other.backgammons[color]
+        self.unfinished += other.unfinished
+        self.total_turns += other.total_turns
+        self.total_loser_pips += other.total_loser_pips
+        self.max_loser_pips = max(self.max_loser_pips, other.max_loser_pips)
+
+    def average_turns(self) -> float:
+        """Returns the average number of turns per game."""
+        return self.total_turns / self.games if self.games else 0.0
+
+    def average_loser_pips(self) -> float:
+        """Returns the average pip count left to the loser of finished games."""
+        finished = self.games - self.unfinished
+        return self.total_loser_pips / finished if finished else 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the statistics as a JSON-serializable dictionary."""
+        return {
+            'games': self.games,
+            'wins': dict(self.wins),
+            'gammons': dict(self.gammons),
+            'backgammons': dict(self.backgammons),
+            'unfinished': self.unfinished,
+            'average_turns': self.average_turns(),
+            'average_loser_pips': self.average_loser_pips(),
+            'max_loser_pips': self.max_loser_pips,
+        }
+
+
+def play_game(white_class=AIPlayer, black_class=AIPlayer, max_turns: int = MAX_TURNS,
+              stream: Optional[DiceStream] = None, recorder=None) -> dict:
+    """
+    Plays one complete game between two AI players without any UI.
+
+    Args:
+        white_class (type, optional): The AIPlayer class playing white.
+        black_class (type, optional): The AIPlayer class playing black.
+        max_turns (int, optional): Turns after which the game is abandoned.
+        stream (DiceStream, optional): The dice stream of the game. Defaults to a new stream.
+        recorder (GameRecordWriter, optional): Writer the game is recorded to.
+
+    Returns:
+        dict: 'winner' ('white', 'black' or None), 'turns', 'gammon', 'backgammon' and 'loser_pips'.
+    """
+    white = white_class("White", "white")
+    black = black_class("Black", "black")
+    game = Game([white, black], dice=Dice(stream))
+    if recorder is not None:
+        recorder.start_game(game)
+    game.determine_first_player()  # The opening roll doubles as the first turn's dice
+
+    turns = 0
+    while not game.is_game_over() and turns < max_turns:
+        if turns:
+            game.roll_dice()
+        game.play_ai_turn()
+        game.switch_player()
+        turns += 1
+
+    winner = game.get_winner()
+    if recorder is not None and winner is None:
+        recorder.end_game(None)
+    if winner is None:
+        return {'winner': None, 'turns': turns, 'gammon': False, 'backgammon': False, 'loser_pips': 0}
+
+    board = game.board
+    loser = black if winner.get_color() == 'white' else white
+    gammon = board.get_off_board_count(loser) == 0
+    backgammon = False
+    if gammon:
+        winner_home = range(18, 24) if loser.get_color() == 'white' else range(6)
+        backgammon = board.get_bar_count(loser) > 0 or any(
+            board.get_point(i) and board.get_point(i)[0].get_owner() == loser for i in winner_home)
+    return {
+        'winner': winner.get_color(),
+        'turns': turns,
+        'gammon': gammon,
+        'backgammon': backgammon,
+        'loser_pips': pip_count(board, loser),
+    }
+
+
+def run_shard(task: tuple) -> SimulationStats:
+    """
+    Plays one shard of games with its own seed (the unit of work sent to each worker).
+
+    Args:
+        task (tuple): (seed, num_games, white_class, black_class, max_turns).
+
+    Returns:
+        SimulationStats: The statistics of the shard.
+    """
+    seed, num_games, white_class, black_class, max_turns = task
+    stream = DiceStream(seed)
+    stats = SimulationStats()
+    for game_number in range(num_games):
+        stats.record_game(play_game(white_class, black_class, max_turns, stream.spawn(game_number)))
+    return stats
+
+
+def iter_simulation(num_games: int, workers: Optional[int] = None, seed: int = 0,
+                    shard_size: int = 100, white_class=AIPlayer, black_class=AIPlayer,
+                    max_turns: int = MAX_TURNS) -> Iterator[SimulationStats]:
+    """
+    Runs a batch of games and yields each shard's statistics as soon as it finishes.
+
+    Args:
+        num_games (int): Total number of games.
+        workers (int, optional): Worker processes. None uses every CPU; 1 runs in this process.
+        seed (int, optional): Base seed; the shard seeds are drawn from it.
+        shard_size (int, optional): Games per shard.
+        white_class (type, optional): The AIPlayer class playing white.
+        black_class (type, optional): The AIPlayer class playing black.
+        max_turns (int, optional): Turns after which a game is abandoned.
+
+    Yields:
+        SimulationStats: Per-shard statistics, in completion order.
+    """
+    seeds = random.Random(seed)
+    tasks = []
+    for start in range(0, num_games, shard_size):
+        tasks.append((seeds.getrandbits(64), min(shard_size, num_games - start),
+                      white_class, black_class, max_turns))
+
+    if workers == 1:
+        for task in tasks:
+            yield run_shard(task)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(run_shard, tasks)
+
+
+def simulate(num_games: int, workers: Optional[int] = None, seed: int = 0, shard_size: int = 100,
+             white_class=AIPlayer, black_class=AIPlayer, max_turns: int = MAX_TURNS,
+             on_progress=None) -> SimulationStats:
+    """
+    Runs a batch of games and returns the merged statistics.
+
+    Takes the same arguments as iter_simulation, plus:
+        on_progress (callable, optional): Called with the running SimulationStats after each shard.
+
+    Returns:
+        SimulationStats: The statistics of all games.
+    """
+    total = SimulationStats()
+    for shard in iter_simulation(num_games, workers, seed, shard_size, white_class, black_class, max_turns):
+        total.merge(shard)
+        if on_progress is not None:
+            on_progress(total)
+    return total
+
+
+def main(argv=None):
+    """Command-line entry point; prints the final statistics as JSON."""
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Backgammon games.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--shard-size", type=int, default=100, help="games per shard")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress on stderr")
+    args = parser.parse_args(argv)
+
+    def report(stats):
+        print(f"{stats.games}/{args.games} games", file=sys.stderr)
+
+    stats = simulate(args.games, args.workers, args.seed, args.shard_size,
+                     on_progress=None if args.quiet else report)
+    print(json.dumps(stats.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+TD(lambda) self-play training of the neural evaluator.
+
+Training runs in rounds. Actor processes play self-play games with a copy of the current
+weights: each side picks the play the network rates best, scoring all candidate plays of a
+turn in one batch. An actor sends back only the compact int8 positions of each game and its
+result. The learner then encodes each game in one batch and applies the TD(lambda) update
+for the whole game with matrix products. The update uses the forward view: each position
+moves towards its lambda-return. Weights are checkpointed to disk periodically.
+
+Usage:
+    python -m core.train --games 10000 --workers 4 --checkpoint weights.npz
+"""
+from __future__ import annotations
+from typing import Iterator, List, Optional, Tuple
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+import numpy as np
+from core.array_board import START_POSITION, WHITE_OFF, BLACK_OFF
+from core.dice import DiceStream
+from core.movegen import generate_positions
+from core.network import NeuralEvaluator, encode
+
+# Safety net against self-play games that never finish.
+MAX_PLIES = 1000
+
+# One game: (positions (T, 28) int8, white to move (T,) bool, 1.0 if white won else 0.0).
+Trajectory = Tuple[np.ndarray, np.ndarray, float]
+
+
+def play_training_game(network: NeuralEvaluator, stream: DiceStream, exploration: float = 0.0,
+                       max_plies: int = MAX_PLIES) -> Optional[Trajectory]:
+    """
+    Plays one self-play game with the network choosing the plays of both sides.
+
+    Args:
+        network (NeuralEvaluator): The evaluator.
+        stream (DiceStream): The dice of the game (also seeds the exploration).
+        exploration (float, optional): Probability of playing a random legal play instead.
+        max_plies (int, optional): Plies after which the game is dropped.
+
+    Returns:
+        Trajectory or None: The positions before every ply with their side to move and the
+        result, or None if the game did not finish.
+    """
+    rng = random.Random(stream.get_seed())
+    cells = list(START_POSITION)
+    d1, d2 = stream.next_die(), stream.next_die()
+    while d1 == d2:
+        d1, d2 = stream.next_die(), stream.next_die()
+    is_white = d1 > d2
+    dice = [d1, d2]
+
+    positions: List[list] = []
+    to_move: List[bool] = []
+    for _ in range(max_plies):
+        positions.append(cells)
+        to_move.append(is_white)
+        plays = generate_positions(cells, is_white, dice)
+        if len(plays) == 1:
+            cells = plays[0][1]
+        elif exploration and rng.random() < exploration:
+            cells = rng.choice(plays)[1]
+        else:
+            scores = network.evaluate_batch([play[1] for play in plays], not is_white)
+            cells = plays[int(np.argmin(scores))][1]
+        if cells[WHITE_OFF] == 15 or cells[BLACK_OFF] == 15:
+            return (np.array(positions, dtype=np.int8), np.array(to_move, dtype=bool),
+                    1.0 if cells[WHITE_OFF] == 15 else 0.0)
+        is_white = not is_white
+        d1, d2 = stream.next_die(), stream.next_die()
+        dice = [d1] * 4 if d1 == d2 else [d1, d2]
+    return None
+
+
+def run_actor(task: tuple) -> List[Trajectory]:
+    """
+    Plays a batch of self-play games (the unit of work sent to each actor process).
+
+    Args:
+        task (tuple): (weights, seeds, exploration, max_plies), with weights as returned by
+            NeuralEvaluator.get_weights.
+
+    Returns:
+        list: The trajectories of the games that finished.
+    """
+    weights, seeds, exploration, max_plies = task
+    network = NeuralEvaluator(hidden=len(weights[1]), seed=None)
+    network.set_weights(weights)
+    trajectories = []
+    for seed in seeds:
+        trajectory = play_training_game(network, DiceStream(seed), exploration, max_plies)
+        if trajectory is not None:
+            trajectories.append(trajectory)
+    return trajectories
+
+
+def lambda_errors(values: np.ndarray, outcome: float, trace_decay: float) -> np.ndarray:
+    """
+    Computes the lambda-return errors of a game.
+
+    errors[k] = sum over t >= k of lambda**(t - k) * delta[t], where delta[t] is the TD error
+    V(s[t + 1]) - V(s[t]) and the value after the last position is the outcome. Summing
+    errors[k] * grad V(s[k]) gives the same update as accumulating eligibility traces over the game.
+
+    Args:
+        values (np.ndarray): (T,) network outputs for the positions of the game.
+        outcome (float): The final result (1.0 if white won).
+        trace_decay (float): The lambda parameter.
+
+    Returns:
+        np.ndarray: (T,) errors.
+    """
+    deltas = np.append(values[1:], outcome) - values
+    errors = np.empty_like(deltas)
+    running = 0.0
+    for k in range(len(deltas) - 1, -1, -1):
+        running = deltas[k] + trace_decay * running
+        errors[k] = running
+    return errors
+
+
+def learn(network: NeuralEvaluator,
+          trajectory: Trajectory,
+          learning_rate: float,
+          trace_decay: float):
+    """
+    Applies the TD(lambda) update of one game to the network.
+
+    Args:
+        network (NeuralEvaluator): The network to train (updated in place).
+        trajectory (Trajectory): The game.
+        learning_rate (float): The step size (alpha).
+        trace_decay (float): The lambda parameter.
+    """
+    positions, to_move, outcome = trajectory
+    inputs = encode(positions, to_move)
+    values = network.win_probability(inputs)
+    network.update(inputs, lambda_errors(values, outcome, trace_decay), learning_rate)
+
+
+def save_checkpoint(network: NeuralEvaluator, path: str):
+    """Saves the weights atomically, so a crash never leaves a half-written checkpoint."""
+    temporary = path + '.tmp.npz'
+    network.save(temporary)
+    os.replace(temporary, path)
+
+
+class TrainingProgress:
+    """
+    Running statistics of a training run.
+
+    Attributes
+    ----------
+    games : int
+        Finished games learned from.
+    dropped : int
+        Games dropped after MAX_PLIES.
+    white_wins : int
+        Games won by white.
+    positions : int
+        Positions learned from.
+    elapsed : float
+        Wall-clock seconds since training started.
+    workers : int
+        Actor processes.
+    """
+
+    def __init__(self, workers: int):
+        """Initializes empty statistics."""
+        self.games = 0
+        self.dropped = 0
+        self.white_wins = 0
+        self.positions = 0
+        self.elapsed = 0.0
+        self.workers = workers
+
+    def games_per_second(self) -> float:
+        """Returns the overall throughput."""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def games_per_second_per_core(self) -> float:
+        """Returns the throughput per actor process, the figure to compare between machines."""
+        return self.games_per_second() / self.workers
+
+
+def iter_training(network: NeuralEvaluator, num_games: int, workers: Optional[int] = 1,
+                  games_per_round: int = 64, learning_rate: float = 0.1, trace_decay: float = 0.7,
+                  exploration: float = 0.0, seed: int = 0, max_plies: int = MAX_PLIES,
+                  checkpoint_path: Optional[str] = None,
+                  checkpoint_every: int = 1000) -> Iterator[TrainingProgress]:
+    """
+    Trains a network by self-play and yields the progress after every round.
+
+    Args:
+        network (NeuralEvaluator): The network to train (updated in place).
+        num_games (int): Total number of self-play games.
+        workers (int, optional): Actor processes. None uses every CPU; 1 plays in this process.
+        games_per_round (int, optional): Games played with the same weights before learning.
+        learning_rate (float, optional): The step size (alpha).
+        trace_decay (float, optional): The lambda parameter.
+        exploration (float, optional): Probability of a random play during self-play.
+        seed (int, optional): Seed of the game streams; a run is reproducible for a given seed,
+            number of workers and round size.
+        max_plies (int, optional): Plies after which a game is dropped.
+        checkpoint_path (str, optional): File the weights are saved to.
+        checkpoint_every (int, optional): Games between checkpoints.
+
+    Yields:
+        TrainingProgress: The statistics so far, after each round.
+    """
+    worker_count = workers if workers is not None else os.cpu_count() or 1
+    progress = TrainingProgress(worker_count)
+    streams = DiceStream(seed)
+    pool = multiprocessing.Pool(worker_count) if worker_count > 1 else None
+    start = time.perf_counter()
+    played = 0
+    next_checkpoint = checkpoint_every
+    try:
+        while played < num_games:
+            round_games = min(games_per_round, num_games - played)
+            seeds = [streams.spawn(played + i).get_seed() for i in range(round_games)]
+            weights = network.get_weights()
+            tasks = [(weights, seeds[i::worker_count], exploration, max_plies)
+                     for i in range(min(worker_count, round_games))]
+            if pool is not None:
+                results = pool.map(run_actor, tasks)
+            else:
+                results = [run_actor(task) for task in tasks]
+            played += round_games
+
+            for trajectories in results:
+                for trajectory in trajectories:
+                    learn(network, trajectory, learning_rate, trace_decay)
+                    progress.games += 1
+                    progress.positions += len(trajectory[0])
+                    progress.white_wins += int(trajectory[2])
+            progress.dropped = played - progress.games
+            progress.elapsed = time.perf_counter() - start
+
+            if checkpoint_path is not None and (played >= next_checkpoint or played >= num_games):
+                save_checkpoint(network, checkpoint_path)
+                next_checkpoint = played + checkpoint_every
+            yield progress
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def train(network: NeuralEvaluator, num_games: int, **options) -> TrainingProgress:
+    """
+    Trains a network by self-play.
+
+    Takes the same arguments as iter_training.
+
+    Returns:
+        TrainingProgress: The final statistics.
+    """
+    progress = TrainingProgress(1)
+    for progress in iter_training(network, num_games, **options):
+        pass
+    return progress
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Train the neural evaluator by TD(lambda) self-play.")
+    parser.add_argument("--games", type=int, default=10000, help="self-play games")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="actor processes (default: all CPUs)")
+    parser.add_argument("--round", type=int, default=64, help="games per round")
+    parser.add_argument("--alpha", type=float, default=0.1, help="learning rate")
+    parser.add_argument("--lambda", dest="trace_decay", type=float, default=0.7, help="trace decay")
+    parser.add_argument("--exploration", type=float, default=0.0,
+                        help="probability of a random play")
+    parser.add_argument("--hidden", type=int, default=40, help="hidden units of a new network")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--checkpoint", default="weights.npz", help="weights file")
+    parser.add_argument("--checkpoint-every", type=int, default=1000,
+                        help="games between checkpoints")
+    parser.add_argument("--resume", action="store_true",
+                        help="start from the weights in --checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.resume and os.path.exists(args.checkpoint):
+        network = NeuralEvaluator.load(args.checkpoint)
+    else:
+        network = NeuralEvaluator(args.hidden, args.seed)
+    for progress in iter_training(network, args.games, args.workers, args.round, args.alpha,
+                                  args.trace_decay, args.exploration, args.seed,
+                                  checkpoint_path=args.checkpoint,
+                                  checkpoint_every=args.checkpoint_every):
+        print(f"{progress.games} games, {progress.games_per_second():.1f} games/s "
+              f"({progress.games_per_second_per_core():.1f}/core), "
+              f"white won {progress.white_wins / max(progress.games, 1):.1%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import random
+
+# Zobrist keys for the 28 ArrayBoard cells (24 points, bar and off for each side).
+# A point holds a signed checker count (positive for white, negative for black), so each
+# cell gets one key per value in -15..15, indexed as CELL_KEYS[cell][count + 15].
+_KEY_SEED = 0x5EED_BAC6
+_MAX_COUNT = 15
+NUM_CELLS = 28
+
+
+def _make_keys():
+    """Builds the fixed 64-bit key tables from a constant seed so hashes are stable across runs."""
+    rng = random.Random(_KEY_SEED)
+    cell_keys = tuple(
+        tuple(rng.getrandbits(64) for _ in range(2 * _MAX_COUNT + 1))
+        for _ in range(NUM_CELLS)
+    )
+    return cell_keys, rng.getrandbits(64)
+
+
+CELL_KEYS, BLACK_TO_MOVE_KEY = _make_keys()
+
+
+def hash_cells(cells) -> int:
+    """
+    Computes the Zobrist hash of a position from scratch.
+
+    Args:
+        cells (sequence of int): The 28 ArrayBoard cells.
+
+    Returns:
+        int: The 64-bit position hash, without the side-to-move key.
+    """
+    h = 0
+    for index, count in enumerate(cells):
+        h ^= CELL_KEYS[index][count + _MAX_COUNT]
+    return h
+
+
+def hash_after_play(key: int, cells, moves, after, is_white: bool) -> int:
+    """
+    Derives the hash of the position after a full-turn play from the hash before it.
+
+    Only the cells the moves touch are compared, so this costs a few XORs instead of the
+    28 table lookups of hash_cells. The side to move flips with the play.
+
+    Args:
+        key (int): The hash before the play, side-to-move key included.
+        cells (sequence of int): The 28 cells before the play.
+        moves (list): The (from_point, to_point) moves of the play, in board coordinates.
+        after (sequence of int): The 28 cells after the play.
+        is_white (bool): Whether white made the play.
+
+    Returns:
+        int: The hash of the position after the play, with the other side to move.
+    """
+    bar, off, opponent_bar = (24, 26, 25) if is_white else (25, 27, 24)
+    touched = {opponent_bar}  # Hits land on the opponent's bar
+    for from_point, to_point in moves:
+        touched.add(bar if from_point == 'bar' else from_point)
+        touched.add(off if to_point == 'off' else to_point)
+    for index in touched:
+        if cells[index] != after[index]:
+            key ^= CELL_KEYS[index][cells[index] + _MAX_COUNT] ^ CELL_KEYS[index][after[index] + _MAX_COUNT]
+    return key ^ BLACK_TO_MOVE_KEY
+
+
+def side_to_move_key(player) -> int:
+    """
+    Returns the key mixed into a position hash for the side to move.
+
+    Args:
+        player (Player or None): The player to move, or None to leave the side out.
+
+    Returns:
+        int: BLACK_TO_MOVE_KEY when black is to move, otherwise 0.
+    """
+    if player is not None and player.get_color() == 'black':
+        return BLACK_TO_MOVE_KEY
+    return 0
@@ -0,0 +1,108 @@
+"""
+Background computation of AI turns for the pygame UI.
+
+The UI loop must keep handling events and drawing frames while an AI thinks, so the
+moves are chosen in a worker thread. The UI submits a turn and polls for the result once
+per frame; requests and results travel through queues. The worker only ever sees a
+snapshot of the board, never the board the UI draws from.
+"""
+from typing import List, NamedTuple, Optional
+import queue
+import threading
+from core.array_board import ArrayBoard
+
+
+class AIResult(NamedTuple):
+    """The outcome of a submitted turn: the chosen moves, or the error the AI raised."""
+    job: int
+    moves: List[tuple]
+    error: Optional[BaseException]
+
+
+class AIWorker:
+    """
+    Runs AIPlayer.choose_moves in a background thread, one turn at a time.
+
+    Every submitted turn gets a job number. Cancelling bumps the current job number, so the
+    results of cancelled turns are dropped when they arrive; a search that supports it is
+    also told to stop early.
+    """
+
+    def __init__(self):
+        """Initializes the worker; the thread starts with the first submitted turn."""
+        self.__requests__ = queue.Queue()
+        self.__results__ = queue.Queue()
+        self.__thread__: Optional[threading.Thread] = None
+        # Only the UI thread writes it; the worker reads it to skip cancelled turns.
+        self.__job__ = 0
+        self.__player__ = None
+
+    def submit(self, player, board, dice) -> int:
+        """
+        Starts choosing the moves of a turn.
+
+        Args:
+            player (AIPlayer): The AI to move.
+            board (Board): The current board; it is copied before this returns.
+            dice (list[int]): The dice of the turn.
+
+        Returns:
+            int: The job number, which the AIResult of this turn carries.
+        """
+        self.cancel()
+        if self.__thread__ is None:
+            self.__thread__ = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+            self.__thread__.start()
+        self.__player__ = player
+        self.__requests__.put((self.__job__, player, ArrayBoard.from_board(board), list(dice)))
+        return self.__job__
+
+    def poll(self) -> Optional[AIResult]:
+        """Returns the result of the current turn if it is ready, without blocking."""
+        while True:
+            try:
+                result = self.__results__.get_nowait()
+            except queue.Empty:
+                return None
+            if result.job == self.__job__:
+                self.__player__ = None
+                return result
+
+    def is_busy(self) -> bool:
+        """Returns True while a submitted turn has not been collected by poll."""
+        return self.__player__ is not None
+
+    def cancel(self):
+        """Abandons the current turn, if any; its result will never be returned."""
+        self.__job__ += 1
+        player, self.__player__ = self.__player__, None
+        get_search = getattr(player, 'get_search', None)
+        if get_search is not None:
+            get_search().stop()
+
+    def close(self):
+        """Cancels the current turn and stops the thread."""
+        self.cancel()
+        if self.__thread__ is not None:
+            self.__requests__.put(None)
+            self.__thread__ = None
+
+    def _run(self):
+        """Thread body: serves turns until close."""
+        while True:
+            request = self.__requests__.get()
+            if request is None:
+                return
+            job, player, board, dice = request
+            # Clear a stop left by an earlier cancel before checking the job: a cancel that
+            # lands after the check then sets it again and is seen by the search.
+            get_search = getattr(player, 'get_search', None)
+            if get_search is not None:
+                get_search().clear_stop()
+            if job != self.__job__:
+                continue  # Cancelled before it started
+            try:
+                result = AIResult(job, player.choose_moves(board, dice), None)
+            except Exception as error:
+                result = AIResult(job, [], error)
+            self.__results__.put(result)
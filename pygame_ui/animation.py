@@ -0,0 +1,136 @@
+"""
+Time-based checker animations for the pygame UI.
+
+A move changes the game state at once, but its checker glides from its origin to its
+destination. Until the checker lands, the destination must not show it yet (and until a
+queued animation starts, its origin must still show it). The queue therefore reports, per
+board location, how many checkers arriving or departing are still in flight, and the UI
+draws every location with those counts applied.
+
+Locations are point indices, ('bar', color) and ('off', color). Times are in milliseconds,
+as returned by pygame.time.get_ticks.
+"""
+from typing import Dict, List, Tuple
+
+# Duration of one checker move.
+MOVE_DURATION = 300  # ms
+
+
+def ease_out(t: float) -> float:
+    """Cubic ease-out: fast start, gentle landing. Maps [0, 1] onto [0, 1]."""
+    t = min(max(t, 0.0), 1.0)
+    return 1 - (1 - t) ** 3
+
+
+class CheckerAnimation:
+    """
+    One checker gliding between two screen positions.
+
+    Attributes
+    ----------
+    color : str
+        Color of the checker ('white' or 'black').
+    origin, destination : int or tuple
+        Board locations the checker leaves and reaches.
+    start_ms, end_ms : int
+        When the checker leaves and lands.
+    """
+
+    def __init__(self, color: str, start: Tuple[float, float], end: Tuple[float, float],
+                 origin, destination, start_ms: int, duration_ms: int = MOVE_DURATION):
+        """
+        Initializes the animation.
+
+        Args:
+            color (str): Color of the checker.
+            start (tuple): Screen position the checker leaves from.
+            end (tuple): Screen position the checker lands on.
+            origin (int or tuple): Board location it leaves.
+            destination (int or tuple): Board location it reaches.
+            start_ms (int): Departure time.
+            duration_ms (int, optional): Flight time.
+        """
+        self.color = color
+        self.origin = origin
+        self.destination = destination
+        self.start_ms = start_ms
+        self.end_ms = start_ms + duration_ms
+        self.__start__ = start
+        self.__end__ = end
+
+    def is_started(self, now: int) -> bool:
+        """Returns True once the checker has left its origin."""
+        return now >= self.start_ms
+
+    def is_finished(self, now: int) -> bool:
+        """Returns True once the checker has landed."""
+        return now >= self.end_ms
+
+    def get_position(self, now: int) -> Tuple[float, float]:
+        """Returns the screen position of the checker at a given time."""
+        t = ease_out((now - self.start_ms) / max(self.end_ms - self.start_ms, 1))
+        (x0, y0), (x1, y1) = self.__start__, self.__end__
+        return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+
+
+class AnimationQueue:
+    """
+    The checker animations in progress, played one move after the other.
+    """
+
+    def __init__(self):
+        """Initializes an empty queue."""
+        self.__animations__: List[CheckerAnimation] = []
+
+    def __len__(self):
+        """Returns the number of animations not yet pruned."""
+        return len(self.__animations__)
+
+    def clear(self):
+        """Drops every animation."""
+        self.__animations__ = []
+
+    def next_start(self, now: int) -> int:
+        """Returns when a newly queued move can start: now, or when the last queued move lands."""
+        return max([now] + [animation.end_ms for animation in self.__animations__])
+
+    def add(self, animation: CheckerAnimation):
+        """Queues an animation (its start time is chosen by the caller, see next_start)."""
+        self.__animations__.append(animation)
+
+    def prune(self, now: int) -> bool:
+        """
+        Drops the animations that have landed.
+
+        Returns:
+            bool: True if any animation was dropped.
+        """
+        running = [animation for animation in self.__animations__ if not animation.is_finished(now)]
+        pruned = len(running) != len(self.__animations__)
+        self.__animations__ = running
+        return pruned
+
+    def get_flying(self, now: int) -> List[CheckerAnimation]:
+        """Returns the animations whose checker is in the air."""
+        return [animation for animation in self.__animations__
+                if animation.is_started(now) and not animation.is_finished(now)]
+
+    def get_adjustments(self, now: int) -> Dict[object, Tuple[int, int, str]]:
+        """
+        Returns what the board locations must hide or still show.
+
+        Returns:
+            dict: location -> (arriving, departing, color). arriving checkers have not landed
+            yet and must be hidden; departing ones have not left yet and must still be drawn,
+            in the given color.
+        """
+        adjustments = {}
+        for animation in self.__animations__:
+            if animation.is_finished(now):
+                continue
+            arriving, departing, color = adjustments.get(animation.destination, (0, 0, animation.color))
+            adjustments[animation.destination] = (arriving + 1, departing, color)
+            if not animation.is_started(now):
+                arriving, departing, _ = adjustments.get(animation.origin, (0, 0, animation.color))
+                adjustments[animation.origin] = (arriving, departing + 1, animation.color)
+        return adjustments
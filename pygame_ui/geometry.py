@@ -0,0 +1,201 @@
+"""
+Screen geometry of the pygame UI.
+
+Everything the UI needs to know about where things are on screen is computed once per
+window size: the board and its 24 point triangles, the rectangles used for hit-testing
+and partial redraws, the centre of every checker slot, the button layout and the
+translucent highlight surfaces. Drawing and hit-testing are then table lookups, and a
+window resize only has to build a new BoardGeometry.
+
+Points are numbered 0-23 as in the game: 0-11 along the bottom from right to left,
+12-23 along the top from left to right, with the bar in the middle column.
+"""
+from typing import Dict, List, Optional, Tuple
+import pygame
+
+# Fixed margins around the board, in pixels. The board takes whatever is left.
+BEAR_OFF_LEFT = 10
+BEAR_OFF_WIDTH = 80
+BOARD_TOP = 70
+HUD_WIDTH = 204
+MARGIN = 10
+
+# Smallest window the layout is computed for; smaller windows are laid out at this size.
+MIN_WIDTH = 640
+MIN_HEIGHT = 480
+
+# Highlight colors (RGBA)
+MOVE_HIGHLIGHT = (0, 255, 0, 120)
+OFF_HIGHLIGHT = (0, 255, 0, 100)
+MESSAGE_BACKGROUND = (0, 0, 0, 180)
+
+COLUMNS = 13  # 12 point columns and the bar
+BAR_COLUMN = 6
+STACK_SLOTS = 5  # Checkers drawn per point; more are shown with a counter
+CHECKERS = 15
+
+
+def point_column(point: int) -> int:
+    """Returns the board column (0-12, 6 being the bar) of a point."""
+    if point <= 5:
+        return 12 - point
+    if point <= 11:
+        return 11 - point
+    if point <= 17:
+        return point - 12
+    return point - 11
+
+
+class BoardGeometry:
+    """
+    Precomputed layout of the game screen for one window size.
+
+    Attributes
+    ----------
+    width, height : int
+        The window size the tables were built for.
+    board_rect, bar_rect, hud_rect, message_rect : pygame.Rect
+        The board, the bar column, the HUD panel and the message overlay.
+    point_width, point_height : float
+        Size of a point triangle.
+    checker_radius : int
+        Radius of a checker.
+    point_rects : list of pygame.Rect
+        The half-board column of each point; neighbouring columns tile the board exactly.
+    point_triangles : list of tuple
+        The three vertices of each point triangle.
+    checker_slots : list of list of tuple
+        checker_slots[point][k] is the centre of the k-th checker (0-4) of a point.
+    bar_slots, off_rects : dict
+        Per color, the centres of the checkers on the bar and the bear-off tray.
+    menu_buttons, ingame_buttons, game_over_buttons : dict of pygame.Rect
+        The buttons of each screen.
+    initial_roll_button : pygame.Rect
+        The button of the initial roll screen.
+    checker_highlight, message_panel : pygame.Surface
+        Translucent possible-move marker and message background.
+    off_highlights : dict of pygame.Surface
+        Translucent cover of each bear-off tray.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        Builds the tables for a window size.
+
+        Args:
+            width (int): The window width in pixels.
+            height (int): The window height in pixels.
+        """
+        self.width, self.height = width, height
+        width, height = max(width, MIN_WIDTH), max(height, MIN_HEIGHT)
+
+        board_left = BEAR_OFF_LEFT + BEAR_OFF_WIDTH + MARGIN
+        board_width = width - board_left - HUD_WIDTH - 2 * MARGIN
+        board_height = height - 2 * BOARD_TOP
+        self.board_rect = pygame.Rect(board_left, BOARD_TOP, board_width, board_height)
+        self.point_width = board_width / COLUMNS
+        self.point_height = board_height / 2.5
+        # Five checkers must fit across a point and along half the board
+        self.checker_radius = int(min(self.point_width / 2.2, board_height / 20))
+
+        pw, half = self.point_width, board_height / 2
+        edges = [round(board_left + col * pw) for col in range(COLUMNS + 1)]
+        self.bar_rect = pygame.Rect(edges[BAR_COLUMN], BOARD_TOP,
+                                    edges[BAR_COLUMN + 1] - edges[BAR_COLUMN], board_height)
+        hud_x = board_left + board_width + MARGIN
+        self.hud_rect = pygame.Rect(hud_x, 0, width - hud_x - MARGIN, height)
+        message_width = min(500, board_width)
+        self.message_rect = pygame.Rect(board_left + board_width / 2 - message_width / 2,
+                                        BOARD_TOP + half - 50, message_width, 100)
+        self.off_rects = {
+            'white': pygame.Rect(BEAR_OFF_LEFT, BOARD_TOP, BEAR_OFF_WIDTH, half - 10),
+            'black': pygame.Rect(BEAR_OFF_LEFT, BOARD_TOP + half + 10, BEAR_OFF_WIDTH, half - 10),
+        }
+
+        radius = self.checker_radius
+        bottom = BOARD_TOP + board_height
+        self.point_rects: List[pygame.Rect] = []
+        self.point_triangles: List[Tuple[Tuple[float, float], ...]] = []
+        self.checker_slots: List[List[Tuple[float, float]]] = []
+        for point in range(24):
+            col = point_column(point)
+            x = board_left + (col + 0.5) * pw
+            top = point >= 12
+            rect_top = BOARD_TOP if top else BOARD_TOP + round(half)
+            self.point_rects.append(pygame.Rect(edges[col], rect_top,
+                                                edges[col + 1] - edges[col], round(half)))
+            if top:
+                self.point_triangles.append(((x - pw / 2, BOARD_TOP), (x + pw / 2, BOARD_TOP),
+                                             (x, BOARD_TOP + self.point_height)))
+                self.checker_slots.append([(x, BOARD_TOP + radius + k * 2 * radius)
+                                           for k in range(STACK_SLOTS)])
+            else:
+                self.point_triangles.append(((x - pw / 2, bottom), (x + pw / 2, bottom),
+                                             (x, bottom - self.point_height)))
+                self.checker_slots.append([(x, bottom - radius - k * 2 * radius)
+                                           for k in range(STACK_SLOTS)])
+
+        bar_x = board_left + (BAR_COLUMN + 0.5) * pw
+        self.bar_slots = {
+            'white': [(bar_x, BOARD_TOP + board_height / 4 + k * 2 * radius)
+                      for k in range(CHECKERS)],
+            'black': [(bar_x, BOARD_TOP + 3 * board_height / 4 - k * 2 * radius)
+                      for k in range(CHECKERS)],
+        }
+
+        # Hit-testing: the points of each column, top then bottom (None for the bar)
+        self.__columns__: List[Optional[Tuple[int, int]]] = [None] * COLUMNS
+        for point in range(12, 24):
+            self.__columns__[point_column(point)] = (point, 23 - point)
+
+        center_x, center_y = width / 2, height / 2
+        self.menu_buttons = {
+            "h_vs_h": pygame.Rect(center_x - 150, center_y - 100, 300, 80),
+            "h_vs_ai": pygame.Rect(center_x - 150, center_y, 300, 80),
+            "exit": pygame.Rect(center_x - 150, center_y + 100, 300, 80),
+        }
+        self.ingame_buttons = {
+            "roll_dice": pygame.Rect(hud_x + MARGIN, height - 240, 200, 50),
+            "exit": pygame.Rect(hud_x + MARGIN, height - 170, 200, 50),
+        }
+        self.game_over_buttons = {
+            "play_again": pygame.Rect(center_x - 150, center_y, 300, 80),
+            "main_menu": pygame.Rect(center_x - 150, center_y + 100, 300, 80),
+        }
+        self.initial_roll_button = pygame.Rect(center_x - 150, height - 120, 300, 60)
+
+        self.checker_highlight = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.checker_highlight, MOVE_HIGHLIGHT, (radius, radius), radius)
+        self.off_highlights: Dict[str, pygame.Surface] = {}
+        for color, rect in self.off_rects.items():
+            self.off_highlights[color] = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self.off_highlights[color].fill(OFF_HIGHLIGHT)
+        self.message_panel = pygame.Surface(self.message_rect.size, pygame.SRCALPHA)
+        self.message_panel.fill(MESSAGE_BACKGROUND)
+
+    def get_checker_position(self, point: int, stack_index: int) -> Tuple[float, float]:
+        """Returns the centre of a checker slot; stacks taller than five share the top slot."""
+        return self.checker_slots[point][min(stack_index, STACK_SLOTS - 1)]
+
+    def hit_test(self, pos) -> object:
+        """
+        Returns what is under a screen position.
+
+        Args:
+            pos (tuple): The (x, y) screen position.
+
+        Returns:
+            A point index (0-23), 'bar', ('off', color) for a bear-off tray, or None.
+        """
+        for color, rect in self.off_rects.items():
+            if rect.collidepoint(pos):
+                return ('off', color)
+        board = self.board_rect
+        x, y = pos
+        if not (board.left <= x <= board.right and board.top <= y <= board.bottom):
+            return None
+        column = min(int((x - board.left) / self.point_width), COLUMNS - 1)
+        points = self.__columns__[column]
+        if points is None:
+            return 'bar'
+        return points[0] if y < board.top + board.height / 2 else points[1]
@@ -8,10 +8,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from core.game import Game
 from core.player import Player
-from core.ai import AIPlayer
+from core.ai import AIPlayer, SearchAIPlayer
+from core.book import default_book
 from core.checkers import Checkers
+from pygame_ui.text_cache import TextCache
+from pygame_ui.ai_worker import AIWorker
+from pygame_ui.animation import AnimationQueue, CheckerAnimation
+from pygame_ui.geometry import BoardGeometry
 
 # --- Constants ---
+# Initial window size; the window can be resized (see pygame_ui.geometry for the layout).
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 680
 BACKGROUND_COLOR = (0, 40, 0) # Dark Green
@@ -23,147 +29,335 @@ POINT_COLOR_2 = (160, 82, 45)   # Sienna
 HUD_COLOR = (20, 20, 20)
 FONT_COLOR = (230, 230, 230)
 
-# Board layout
-BEAR_OFF_WIDTH = 80
-BOARD_LEFT = BEAR_OFF_WIDTH + 20
-BOARD_TOP = 70
-BOARD_WIDTH = 700
-BOARD_HEIGHT = 540
-POINT_WIDTH = BOARD_WIDTH / 13
-POINT_HEIGHT = BOARD_HEIGHT / 2.5
-CHECKER_RADIUS = int(POINT_WIDTH / 2.2)
+# Frame cap; idle frames redraw nothing, so this bounds the CPU used while waiting.
+FPS = 30
+
+# AI pacing: the AI thinks in the background with a hard budget, and its moves are shown
+# no earlier than AI_MOVE_DELAY after its roll.
+AI_MOVE_DELAY = 1000  # ms
+AI_TIME_BUDGET = 0.75  # s
 
 class BackgammonUI:
-    def __init__(self, screen):
+    def __init__(self, screen, fps=FPS, text_cache=None):
         self.screen = screen
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        # Every text of the UI is rendered through this cache.
+        self.text = text_cache if text_cache is not None else TextCache()
         self.game = None
-        self.font = pygame.font.Font(None, 50)
-        self.small_font = pygame.font.Font(None, 36)
         self.game_state = "menu"
         self.player_names = ["Player 1", "AI Player"]
         self.active_input = None
         self.game_mode = None
         self.selected_checker_point = None
         self.possible_moves = []
-        self.menu_buttons = {
-            "h_vs_h": pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2 - 100, 300, 80),
-            "h_vs_ai": pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2, 300, 80),
-            "exit": pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2 + 100, 300, 80)
-        }
-        self.ingame_buttons = {
-            "roll_dice": pygame.Rect(BOARD_LEFT + BOARD_WIDTH + 20, SCREEN_HEIGHT - 240, 200, 50),
-            "exit": pygame.Rect(BOARD_LEFT + BOARD_WIDTH + 20, SCREEN_HEIGHT - 170, 200, 50)
-        }
-        self.game_over_buttons = {
-            "play_again": pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2, 300, 80),
-            "main_menu": pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT/2 + 100, 300, 80)
-        }
-        self.initial_roll_button = pygame.Rect(SCREEN_WIDTH/2 - 150, SCREEN_HEIGHT - 120, 300, 60)
+        self.set_geometry(BoardGeometry(*screen.get_size()))
         self.dice_rolled = False
         self.message = None
         self.message_timer = 0
         self.ai_turn_timer = None
-
-    def draw_board(self):
-        pygame.draw.rect(self.screen, BOARD_COLOR, (BOARD_LEFT, BOARD_TOP, BOARD_WIDTH, BOARD_HEIGHT))
-        bar_x = BOARD_LEFT + 6 * POINT_WIDTH
-        pygame.draw.rect(self.screen, (200, 0, 0), (bar_x, BOARD_TOP, POINT_WIDTH, BOARD_HEIGHT))
-        for i in range(24):
+        self.ai_worker = AIWorker()
+        self.ai_job = None
+        self.ai_result = None
+        self.ai_moves_played = False
+        # Rendering state: the static board, the drawn state of each screen region and
+        # the rectangles to push to the display this frame.
+        self.board_surface = None
+        self.regions = None
+        self.region_keys = {}
+        self.drawn_screen = None
+        self.dirty_rects = []
+        # Checker animations, the per-location counts they adjust this frame and the
+        # screen rectangles of the checkers drawn in flight last frame.
+        self.animations = AnimationQueue()
+        self.adjustments = {}
+        self.sprite_rects = []
+
+    def get_board_surface(self):
+        """Returns the static parts of the game screen, drawn once."""
+        if self.board_surface is None:
+            self.board_surface = self.render_board_surface()
+        return self.board_surface
+
+    def render_board_surface(self):
+        geometry = self.geometry
+        surface = pygame.Surface(self.screen.get_size()).convert()
+        surface.fill(BACKGROUND_COLOR)
+        pygame.draw.rect(surface, BOARD_COLOR, geometry.board_rect)
+        pygame.draw.rect(surface, (200, 0, 0), geometry.bar_rect)
+        for i, triangle in enumerate(geometry.point_triangles):
             color = POINT_COLOR_1 if (i % 2) != 0 else POINT_COLOR_2
-            if 0 <= i <= 5: col = 12 - i
-            elif 6 <= i <= 11: col = 11 - i
-            elif 12 <= i <= 17: col = i - 12
-            else: col = i - 11
-            x_base = BOARD_LEFT + (col + 0.5) * POINT_WIDTH
-            if i >= 12:
-                p1, p2, p3 = (x_base - POINT_WIDTH / 2, BOARD_TOP), (x_base + POINT_WIDTH / 2, BOARD_TOP), (x_base, BOARD_TOP + POINT_HEIGHT)
-            else:
-                p1, p2, p3 = (x_base - POINT_WIDTH / 2, BOARD_TOP + BOARD_HEIGHT), (x_base + POINT_WIDTH / 2, BOARD_TOP + BOARD_HEIGHT), (x_base, BOARD_TOP + BOARD_HEIGHT - POINT_HEIGHT)
-            pygame.draw.polygon(self.screen, color, [p1, p2, p3])
+            pygame.draw.polygon(surface, color, triangle)
+
+        # Bear-off trays and their labels
+        for rect, label in ((self.get_off_rect('white'), "White Off"), (self.get_off_rect('black'), "Black Off")):
+            pygame.draw.rect(surface, (40, 40, 40), rect)
+            label_text = self.text.render(label, 24, FONT_COLOR)
+            surface.blit(label_text, (rect.centerx - label_text.get_width()/2, rect.bottom - 20))
+
+        # HUD panel, title and buttons
+        hud_rect = self.get_hud_rect()
+        pygame.draw.rect(surface, HUD_COLOR, hud_rect)
+        title_text = self.text.render("Backgammon", 40, FONT_COLOR)
+        surface.blit(title_text, (hud_rect.centerx - title_text.get_width()/2, 20))
+        for key, rect in self.ingame_buttons.items():
+            pygame.draw.rect(surface, POINT_COLOR_1, rect, border_radius=8)
+            text_str = key.replace("_", " ").title()
+            text = self.text.render(text_str, 36, FONT_COLOR)
+            surface.blit(text, (rect.centerx - text.get_width()/2, rect.centery - text.get_height()/2))
+        return surface
 
-    def draw_checkers(self):
-        if not self.game: return
-        points = self.game.board.get_points()
-        for i, point in enumerate(points):
-            num_checkers = len(point)
-            for j, checker in enumerate(point[:5]): # Limit drawing to 5 checkers
-                player = checker.get_owner()
-                color = WHITE if player.get_color() == 'white' else BLACK
-                x, y = self.get_checker_position(i, j)
-                pygame.draw.circle(self.screen, color, (int(x), int(y)), CHECKER_RADIUS)
-            
-            if num_checkers > 5:
-                # Position counter on the 5th checker
-                x, y = self.get_checker_position(i, 4) 
-                count_font = pygame.font.Font(None, 24)
-                count_text = count_font.render(str(num_checkers), True, (255, 200, 0))
-                self.screen.blit(count_text, (x - count_text.get_width()/2, y - count_text.get_height()/2))
-            
-            bar = self.game.board.get_bar()
-            bar_x = BOARD_LEFT + 6.5 * POINT_WIDTH
-            for player, checkers in bar.items():
-                for k, checker in enumerate(checkers):
-                    color = WHITE if player.get_color() == 'white' else BLACK
-                    y_pos = (BOARD_TOP + BOARD_HEIGHT / 4) + (k * CHECKER_RADIUS * 2) if player.get_color() == 'white' else \
-                            (BOARD_TOP + 3 * BOARD_HEIGHT / 4) - (k * CHECKER_RADIUS * 2)
-                    pygame.draw.circle(self.screen, color, (int(bar_x), int(y_pos)), CHECKER_RADIUS)
+    def draw_board(self):
+        self.screen.blit(self.get_board_surface(), (0, 0))
+
+    def set_geometry(self, geometry):
+        """Switches to the layout of a window size; everything drawn from the old one is dropped."""
+        self.geometry = geometry
+        self.menu_buttons = geometry.menu_buttons
+        self.ingame_buttons = geometry.ingame_buttons
+        self.game_over_buttons = geometry.game_over_buttons
+        self.initial_roll_button = geometry.initial_roll_button
+        self.board_surface = None
+        self.regions = None
+        self.drawn_screen = None
+
+    def resize(self, size):
+        """Rebuilds the layout tables after the window was resized."""
+        self.screen = pygame.display.get_surface()
+        self.set_geometry(BoardGeometry(*size))
+        # Checkers in flight would land on the old layout: finish them at once
+        self.animations.clear()
+        self.sprite_rects = []
+
+    def get_off_rect(self, color):
+        return self.geometry.off_rects[color]
+
+    def get_hud_rect(self):
+        return self.geometry.hud_rect
+
+    def get_message_rect(self):
+        return self.geometry.message_rect
+
+    def get_regions(self):
+        """Screen rectangles of the parts of the game screen that change, by name."""
+        if self.regions is None:
+            regions = dict(enumerate(self.geometry.point_rects))
+            regions['bar'] = self.geometry.bar_rect
+            regions['white_off'] = self.get_off_rect('white')
+            regions['black_off'] = self.get_off_rect('black')
+            regions['hud'] = self.get_hud_rect()
+            self.regions = regions
+        return self.regions
+
+    def get_player(self, color):
+        return self.game.players[0] if color == 'white' else self.game.players[1]
+
+    def get_stack(self, location):
+        """(color, count) of the checkers at a point, ('bar', color) or ('off', color) in the game."""
+        board = self.game.board
+        if isinstance(location, int):
+            point = board.get_point(location)
+            return (point[0].get_owner().get_color() if point else None, len(point))
+        kind, color = location
+        player = self.get_player(color)
+        if kind == 'bar':
+            return color, board.get_bar_count(player)
+        return color, board.get_off_board_count(player)
+
+    def get_visible_stack(self, location):
+        """(color, count) of the checkers drawn at a location, leaving out those still in flight."""
+        color, count = self.get_stack(location)
+        adjustment = self.adjustments.get(location)
+        if adjustment is None:
+            return color, count
+        arriving, departing, departing_color = adjustment
+        count -= arriving
+        if count > 0:
+            return color, count + departing
+        return (departing_color, departing) if departing else (None, 0)
+
+    def get_region_key(self, name):
+        """A value that changes whenever the drawing of a region would change."""
+        if isinstance(name, int):
+            return (self.get_visible_stack(name), len(self.game.board.get_point(name)),
+                    self.selected_checker_point == name, name in self.possible_moves)
+        if name == 'bar':
+            return (self.get_visible_stack(('bar', 'white')), self.get_visible_stack(('bar', 'black')))
+        if name in ('white_off', 'black_off'):
+            color = name[:5]
+            highlighted = 'off' in self.possible_moves and self.game.get_current_player().get_color() == color
+            return (self.get_visible_stack(('off', color)), highlighted)
+        return (self.game.get_current_player().get_name(), tuple(self.game.dice.get_values()), self.dice_rolled,
+                self.get_thinking_phase())
+
+    def draw_region(self, name):
+        if isinstance(name, int):
+            self.draw_point(name)
+            self.draw_point_highlights(name)
+        elif name == 'bar':
+            self.draw_bar()
+        elif name in ('white_off', 'black_off'):
+            self.draw_off_highlight(name[:5])
+            self.draw_off_count(name[:5])
+        else:
+            self.draw_hud()
+
+    def draw_game_screen(self, full=False):
+        """
+        Redraws the regions of the game screen whose state changed since they were last drawn
+        (every region if full), recomposes the pixels under checkers in flight, and queues the
+        touched rectangles for the display update.
+        """
+        regions = self.get_regions()
+        if full:
+            self.draw_board()
+            self.region_keys = {}
+        now = pygame.time.get_ticks()
+        self.animations.prune(now)
+        self.adjustments = self.animations.get_adjustments(now)
+        flying = self.animations.get_flying(now)
+        sprite_rects = [self.get_sprite_rect(animation.get_position(now)) for animation in flying]
+
+        keys = {name: self.get_region_key(name) for name in regions}
+        dirty = [name for name in regions if full or keys[name] != self.region_keys.get(name)]
+
+        # The message overlay is translucent: everything under it is redrawn with it.
+        message_rect = self.get_message_rect()
+        message_key = self.message
+        if message_key != self.region_keys.get('message') or \
+                (message_key and any(regions[name].colliderect(message_rect) for name in dirty)):
+            dirty += [name for name in regions if name not in dirty and regions[name].colliderect(message_rect)]
+        else:
+            message_rect = None
+        keys['message'] = message_key
+
+        base = self.get_board_surface()
+        for name in dirty:
+            rect = regions[name]
+            self.screen.set_clip(rect)
+            self.screen.blit(base, rect, rect)
+            self.draw_region(name)
+        self.screen.set_clip(None)
+        if message_rect is not None and self.message:
+            self.draw_message()
+
+        # Checker trails: only the pixels where a checker flew last frame or flies now are
+        # recomposed, from the static board, the regions below and the message overlay.
+        uncovered = self.sprite_rects + sprite_rects
+        message_rect = self.get_message_rect()
+        for rect in uncovered:
+            self.screen.set_clip(rect)
+            self.screen.blit(base, rect, rect)
+            for name in regions:
+                if regions[name].colliderect(rect):
+                    self.draw_region(name)
+            if self.message and message_rect.colliderect(rect):
+                self.draw_message()
+        self.screen.set_clip(None)
+        for animation in flying:
+            x, y = animation.get_position(now)
+            pygame.draw.circle(self.screen, WHITE if animation.color == 'white' else BLACK, (int(x), int(y)), self.geometry.checker_radius)
+
+        self.region_keys = keys
+        self.sprite_rects = sprite_rects
+        if full:
+            self.dirty_rects.append(self.screen.get_rect())
+        else:
+            self.dirty_rects += [regions[name] for name in dirty] + uncovered
+
+    def get_sprite_rect(self, position):
+        x, y, radius = int(position[0]), int(position[1]), self.geometry.checker_radius
+        return pygame.Rect(x - radius - 1, y - radius - 1, 2 * radius + 3, 2 * radius + 3)
+
+    def get_slot_position(self, location, index):
+        """Screen position of the index-th checker of a point, ('bar', color) or ('off', color)."""
+        if isinstance(location, int):
+            return self.get_checker_position(location, index)
+        kind, color = location
+        if kind == 'bar':
+            return self.get_bar_checker_position(color, index)
+        return self.get_off_rect(color).center
+
+    def animate_move(self, from_point, to_point):
+        """Plays a move for the current player and queues the animation of its checkers."""
+        color = self.game.get_current_player().get_color()
+        origin = ('bar', color) if from_point == 'bar' else from_point
+        destination = ('off', color) if to_point == 'off' else to_point
+        start = self.get_slot_position(origin, self.get_stack(origin)[1] - 1)
+        destination_color, destination_count = self.get_stack(destination)
+        hit = isinstance(destination, int) and destination_count == 1 and destination_color != color
+        end = self.get_slot_position(destination, 0 if hit else destination_count)
+        if hit:
+            bar = ('bar', destination_color)
+            hit_end = self.get_slot_position(bar, self.get_stack(bar)[1])
+
+        self.game.move(from_point, to_point)
+
+        start_ms = self.animations.next_start(pygame.time.get_ticks())
+        self.animations.add(CheckerAnimation(color, start, end, origin, destination, start_ms))
+        if hit:
+            # The hit checker leaves for the bar as the hitter flies in
+            self.animations.add(CheckerAnimation(destination_color, end, hit_end, destination, bar, start_ms))
+
+    def draw_point(self, i):
+        owner, num_checkers = self.get_visible_stack(i)
+        color = WHITE if owner == 'white' else BLACK
+        for j in range(min(num_checkers, 5)): # Limit drawing to 5 checkers
+            x, y = self.get_checker_position(i, j)
+            pygame.draw.circle(self.screen, color, (int(x), int(y)), self.geometry.checker_radius)
+
+        if num_checkers > 5:
+            # Position counter on the 5th checker
+            x, y = self.get_checker_position(i, 4)
+            count_text = self.text.render(str(num_checkers), 24, (255, 200, 0))
+            self.screen.blit(count_text, (x - count_text.get_width()/2, y - count_text.get_height()/2))
+
+    def draw_bar(self):
+        for player_color in ('white', 'black'):
+            _, count = self.get_visible_stack(('bar', player_color))
+            color = WHITE if player_color == 'white' else BLACK
+            for k in range(count):
+                x, y = self.get_bar_checker_position(player_color, k)
+                pygame.draw.circle(self.screen, color, (int(x), int(y)), self.geometry.checker_radius)
+
+    def get_bar_checker_position(self, color, index):
+        return self.geometry.bar_slots[color][index]
 
     def get_checker_position(self, point_index, stack_index):
-        is_top = point_index >= 12
-        
-        if 0 <= point_index <= 5: col = 12 - point_index
-        elif 6 <= point_index <= 11: col = 11 - point_index
-        elif 12 <= point_index <= 17: col = point_index - 12
-        else: col = point_index - 11
-            
-        x = BOARD_LEFT + (col + 0.5) * POINT_WIDTH
-
-        y_offset = CHECKER_RADIUS + (stack_index * (CHECKER_RADIUS * 2))
-        if stack_index >= 5: # Ensure checkers don't go off board
-             y_offset = CHECKER_RADIUS + (4 * (CHECKER_RADIUS * 2))
-
-        if is_top:
-            y = BOARD_TOP + y_offset
-        else:
-            y = BOARD_TOP + BOARD_HEIGHT - y_offset
-            
-        return x, y
+        return self.geometry.get_checker_position(point_index, stack_index)
 
     def draw_hud(self):
-        hud_x = BOARD_LEFT + BOARD_WIDTH + 10
-        hud_width = SCREEN_WIDTH - hud_x - 10
-        pygame.draw.rect(self.screen, HUD_COLOR, (hud_x, 0, hud_width, SCREEN_HEIGHT))
-
+        # The panel, title and buttons are part of the static board surface.
         if not self.game: return
-
-        title_font = pygame.font.Font(None, 40)
-        title_text = title_font.render("Backgammon", True, FONT_COLOR)
-        self.screen.blit(title_text, (hud_x + hud_width/2 - title_text.get_width()/2, 20))
+        hud_rect = self.get_hud_rect()
+        hud_x, hud_width = hud_rect.x, hud_rect.width
 
         player = self.game.get_current_player()
-        turn_font = pygame.font.Font(None, 38)
-        turn_text = turn_font.render(f"Turn:", True, (200, 200, 200))
-        player_text = turn_font.render(player.get_name(), True, FONT_COLOR)
+        turn_text = self.text.render("Turn:", 38, (200, 200, 200))
+        player_text = self.text.render(player.get_name(), 38, FONT_COLOR)
         self.screen.blit(turn_text, (hud_x + hud_width/2 - turn_text.get_width()/2, 130))
         self.screen.blit(player_text, (hud_x + hud_width/2 - player_text.get_width()/2, 170))
-        
-        self.draw_message() # Draw any active message
-        
+
         dice = self.game.dice.get_values()
         dice_y = 240
-        dice_info_font = pygame.font.Font(None, 34)
         if not self.dice_rolled:
             dice_text_str = "Roll the dice!"
-            dice_text = dice_info_font.render(dice_text_str, True, FONT_COLOR)
+            dice_text = self.text.render(dice_text_str, 34, FONT_COLOR)
             self.screen.blit(dice_text, (hud_x + hud_width/2 - dice_text.get_width()/2, dice_y))
         else:
             self.draw_dice(dice, hud_x + hud_width/2, dice_y + 40)
 
-        for key, rect in self.ingame_buttons.items():
-            pygame.draw.rect(self.screen, POINT_COLOR_1, rect, border_radius=8)
-            text_str = key.replace("_", " ").title()
-            text = self.small_font.render(text_str, True, FONT_COLOR)
-            self.screen.blit(text, (rect.centerx - text.get_width()/2, rect.centery - text.get_height()/2))
+        thinking = self.get_thinking_phase()
+        if thinking is not None:
+            # Fixed-width dots so the text does not move while they cycle
+            thinking_text = self.text.render("Thinking" + "." * thinking + " " * (3 - thinking), 34, FONT_COLOR)
+            self.screen.blit(thinking_text, (hud_x + hud_width/2 - thinking_text.get_width()/2, 370))
+
+    def get_thinking_phase(self):
+        """Number of dots of the thinking indicator, or None when the AI is not thinking."""
+        if self.ai_job is None or not self.ai_worker.is_busy():
+            return None
+        return pygame.time.get_ticks() // 400 % 4
 
     def draw_dice(self, dice, center_x, center_y):
         die_size = 50
@@ -229,16 +423,17 @@ class BackgammonUI:
                     p2 = Player(self.game.players[1].get_name(), "black")
                 else:
                     p1 = Player(self.game.players[0].get_name(), "white")
-                    p2 = AIPlayer(self.game.players[1].get_name(), "black")
+                    p2 = SearchAIPlayer(self.game.players[1].get_name(), "black", depth=None,
+                                        time_budget=AI_TIME_BUDGET, opening_book=default_book())
                 self.game = Game([p1, p2])
                 self.game_state = "initial_roll"
             elif self.game_over_buttons["main_menu"].collidepoint(pos):
-                self.__init__(self.screen)
+                self.ai_worker.close()
+                self.__init__(self.screen, self.fps, self.text)
             return
 
         if self.ingame_buttons["exit"].collidepoint(pos):
-            self.game_state = "menu"
-            self.game = None
+            self.exit_to_menu()
             return
         
         if self.ingame_buttons["roll_dice"].collidepoint(pos) and not self.dice_rolled:
@@ -261,7 +456,7 @@ class BackgammonUI:
         
         player = self.game.get_current_player()
         
-        if self.game.board.get_bar().get(player):
+        if self.game.board.get_bar_count(player):
             if self.selected_checker_point == 'bar':
                 self.handle_move('bar', clicked_point)
             elif clicked_point == 'bar':
@@ -273,12 +468,24 @@ class BackgammonUI:
         elif isinstance(clicked_point, int):
             self.handle_selection(clicked_point)
 
+    def exit_to_menu(self):
+        # Abandon any AI turn still being computed
+        self.ai_worker.cancel()
+        self.ai_job = None
+        self.ai_result = None
+        self.ai_moves_played = False
+        self.animations.clear()
+        self.sprite_rects = []
+        self.ai_turn_timer = None
+        self.game_state = "menu"
+        self.game = None
+
     def handle_selection(self, point_index):
         player = self.game.get_current_player()
         dice = self.game.dice.get_values()
         
         if point_index == 'bar':
-            if self.game.board.get_bar().get(player):
+            if self.game.board.get_bar_count(player):
                 self.selected_checker_point = 'bar'
                 self.possible_moves = self.game.board.get_possible_moves_for_checker('bar', player, dice)
         else:
@@ -293,8 +500,8 @@ class BackgammonUI:
     def handle_move(self, from_point, to_point):
         if to_point in self.possible_moves:
             try:
-                # The core game logic now handles move validation and execution
-                self.game.move(from_point, to_point)
+                # The core game logic handles move validation and execution
+                self.animate_move(from_point, to_point)
             except (ValueError, IndexError) as e:
                 print(f"Move Error: {e}")
 
@@ -317,92 +524,62 @@ class BackgammonUI:
 
 
     def get_point_from_pos(self, pos):
-        x, y = pos
-
-        if 10 <= x < 10 + BEAR_OFF_WIDTH:
-            player = self.game.get_current_player()
-            p1_rect = pygame.Rect(10, BOARD_TOP, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10)
-            p2_rect = pygame.Rect(10, BOARD_TOP + BOARD_HEIGHT / 2 + 10, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10)
-            
-            if (player.get_color() == 'white' and p1_rect.collidepoint(pos)) or \
-               (player.get_color() == 'black' and p2_rect.collidepoint(pos)):
-                return "off"
+        target = self.geometry.hit_test(pos)
+        if isinstance(target, tuple):
+            # Only the current player's own tray is a destination
+            return "off" if target[1] == self.game.get_current_player().get_color() else None
+        return target
+
+    def draw_point_highlights(self, i):
+        if self.selected_checker_point == i:
+            num_checkers = len(self.game.board.get_point(i))
+            if num_checkers > 0:
+                x, y = self.get_checker_position(i, num_checkers - 1)
+                pygame.draw.circle(self.screen, (0, 255, 0), (int(x), int(y)), self.geometry.checker_radius + 3, 3)
 
-        if not (BOARD_LEFT <= x <= BOARD_LEFT + BOARD_WIDTH and BOARD_TOP <= y <= BOARD_TOP + BOARD_HEIGHT):
-            return None
-        
-        bar_x_start = BOARD_LEFT + 6 * POINT_WIDTH
-        bar_x_end = bar_x_start + POINT_WIDTH
-        
-        if bar_x_start <= x <= bar_x_end:
-            return 'bar'
+        if i in self.possible_moves:
+            num_checkers_dest = len(self.game.board.get_point(i))
+            x, y = self.get_checker_position(i, num_checkers_dest)
+            radius = self.geometry.checker_radius
+            self.screen.blit(self.geometry.checker_highlight, (int(x - radius), int(y - radius)))
 
-        if x < bar_x_start:
-            col = int((x - BOARD_LEFT) / POINT_WIDTH)
-            point = 12 + col if y < BOARD_TOP + BOARD_HEIGHT / 2 else 11 - col
-        else:
-            col = int((x - bar_x_end) / POINT_WIDTH)
-            point = 18 + col if y < BOARD_TOP + BOARD_HEIGHT / 2 else 5 - col
-            
-        return point
+    def draw_off_highlight(self, color):
+        if 'off' in self.possible_moves and self.game.get_current_player().get_color() == color:
+            self.screen.blit(self.geometry.off_highlights[color], self.get_off_rect(color).topleft)
 
-    def draw_possible_moves(self):
-        if self.selected_checker_point is not None and isinstance(self.selected_checker_point, int):
-            num_checkers = len(self.game.board.get_point(self.selected_checker_point))
-            if num_checkers > 0:
-                x, y = self.get_checker_position(self.selected_checker_point, num_checkers - 1)
-                pygame.draw.circle(self.screen, (0, 255, 0), (int(x), int(y)), CHECKER_RADIUS + 3, 3)
-
-        for move in self.possible_moves:
-            if move == 'off':
-                player = self.game.get_current_player()
-                rect = pygame.Rect(10, BOARD_TOP, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10) if player.get_color() == 'white' else \
-                       pygame.Rect(10, BOARD_TOP + BOARD_HEIGHT / 2 + 10, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10)
-                
-                highlight_surf = pygame.Surface(rect.size, pygame.SRCALPHA)
-                highlight_surf.fill((0, 255, 0, 100))
-                self.screen.blit(highlight_surf, rect.topleft)
-            elif isinstance(move, int):
-                num_checkers_dest = len(self.game.board.get_point(move))
-                x, y = self.get_checker_position(move, num_checkers_dest)
-                
-                highlight_surf = pygame.Surface((CHECKER_RADIUS * 2, CHECKER_RADIUS * 2), pygame.SRCALPHA)
-                pygame.draw.circle(highlight_surf, (0, 255, 0, 120), (CHECKER_RADIUS, CHECKER_RADIUS), CHECKER_RADIUS)
-                self.screen.blit(highlight_surf, (int(x - CHECKER_RADIUS), int(y - CHECKER_RADIUS)))
-                
     def draw_main_menu(self):
         self.screen.fill(HUD_COLOR)
-        title_text = self.font.render("Backgammon", True, FONT_COLOR)
-        self.screen.blit(title_text, (SCREEN_WIDTH/2 - title_text.get_width()/2, SCREEN_HEIGHT/4))
+        title_text = self.text.render("Backgammon", 50, FONT_COLOR)
+        self.screen.blit(title_text, (self.geometry.width/2 - title_text.get_width()/2, self.geometry.height/4))
 
         for key, rect in self.menu_buttons.items():
             pygame.draw.rect(self.screen, POINT_COLOR_1, rect, border_radius=8)
             text_str = key.replace("_", " ").title()
-            text = self.small_font.render(text_str, True, FONT_COLOR)
+            text = self.text.render(text_str, 36, FONT_COLOR)
             self.screen.blit(text, (rect.centerx - text.get_width()/2, rect.centery - text.get_height()/2))
 
     def draw_enter_names_screen(self):
         self.screen.fill(HUD_COLOR)
-        title_text = self.font.render("Enter Player Names", True, FONT_COLOR)
-        self.screen.blit(title_text, (SCREEN_WIDTH/2 - title_text.get_width()/2, 100))
+        title_text = self.text.render("Enter Player Names", 50, FONT_COLOR)
+        self.screen.blit(title_text, (self.geometry.width/2 - title_text.get_width()/2, 100))
 
         self.input_rects = []
         num_players = 1 if self.game_mode == "h_vs_ai" else 2
         for i in range(num_players):
-            rect = pygame.Rect(SCREEN_WIDTH/2 - 150, 200 + i * 100, 300, 50)
+            rect = pygame.Rect(self.geometry.width/2 - 150, 200 + i * 100, 300, 50)
             self.input_rects.append(rect)
             pygame.draw.rect(self.screen, WHITE, rect, 2)
-            name_text = self.small_font.render(self.player_names[i], True, FONT_COLOR)
+            name_text = self.text.render(self.player_names[i], 36, FONT_COLOR)
             self.screen.blit(name_text, (rect.x + 10, rect.y + 10))
 
-        self.start_game_rect = pygame.Rect(SCREEN_WIDTH/2 - 100, 400, 200, 50)
+        self.start_game_rect = pygame.Rect(self.geometry.width/2 - 100, 400, 200, 50)
         pygame.draw.rect(self.screen, POINT_COLOR_1, self.start_game_rect)
-        start_text = self.small_font.render("Start Game", True, FONT_COLOR)
+        start_text = self.text.render("Start Game", 36, FONT_COLOR)
         self.screen.blit(start_text, (self.start_game_rect.centerx - start_text.get_width()/2, self.start_game_rect.centery - start_text.get_height()/2))
         
-        self.exit_names_rect = pygame.Rect(SCREEN_WIDTH/2 - 100, 470, 200, 50)
+        self.exit_names_rect = pygame.Rect(self.geometry.width/2 - 100, 470, 200, 50)
         pygame.draw.rect(self.screen, POINT_COLOR_2, self.exit_names_rect)
-        exit_text = self.small_font.render("Exit", True, FONT_COLOR)
+        exit_text = self.text.render("Exit", 36, FONT_COLOR)
         self.screen.blit(exit_text, (self.exit_names_rect.centerx - exit_text.get_width()/2, self.exit_names_rect.centery - exit_text.get_height()/2))
 
     def handle_names_input(self, event):
@@ -419,7 +596,8 @@ class BackgammonUI:
                     p2 = Player(self.player_names[1], "black")
                 else:
                     p1 = Player(self.player_names[0], "white")
-                    p2 = AIPlayer(self.player_names[1], "black")
+                    p2 = SearchAIPlayer(self.player_names[1], "black", depth=None,
+                                        time_budget=AI_TIME_BUDGET, opening_book=default_book())
                 self.game = Game([p1, p2])
                 self.game_state = "initial_roll"
             elif self.exit_names_rect.collidepoint(event.pos):
@@ -432,95 +610,106 @@ class BackgammonUI:
             else:
                 self.player_names[self.active_input] += event.unicode
     
-    def draw_bear_off_area(self):
-        label_font = pygame.font.Font(None, 24)
-        
-        p1_rect = pygame.Rect(10, BOARD_TOP, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10)
-        pygame.draw.rect(self.screen, (40, 40, 40), p1_rect)
+    def draw_off_count(self, color):
         if self.game:
-            p1_off = self.game.board.get_off_board_count(self.game.players[0])
-            p1_text = self.font.render(str(p1_off), True, WHITE)
-            self.screen.blit(p1_text, (p1_rect.centerx - p1_text.get_width()/2, p1_rect.centery - p1_text.get_height()/2))
-        p1_label = label_font.render("White Off", True, FONT_COLOR)
-        self.screen.blit(p1_label, (p1_rect.centerx - p1_label.get_width()/2, p1_rect.bottom - 20))
-
-        p2_rect = pygame.Rect(10, BOARD_TOP + BOARD_HEIGHT / 2 + 10, BEAR_OFF_WIDTH, BOARD_HEIGHT / 2 - 10)
-        pygame.draw.rect(self.screen, (40, 40, 40), p2_rect)
-        if self.game:
-            p2_off = self.game.board.get_off_board_count(self.game.players[1])
-            p2_text = self.font.render(str(p2_off), True, WHITE)
-            self.screen.blit(p2_text, (p2_rect.centerx - p2_text.get_width()/2, p2_rect.centery - p2_text.get_height()/2))
-        p2_label = label_font.render("Black Off", True, FONT_COLOR)
-        self.screen.blit(p2_label, (p2_rect.centerx - p2_label.get_width()/2, p2_rect.bottom - 20))
+            rect = self.get_off_rect(color)
+            off_text = self.text.render(str(self.get_visible_stack(('off', color))[1]), 50, WHITE)
+            self.screen.blit(off_text, (rect.centerx - off_text.get_width()/2, rect.centery - off_text.get_height()/2))
 
     def draw_initial_roll_screen(self):
         self.screen.fill(HUD_COLOR)
-        title_text = self.font.render("Initial Roll", True, FONT_COLOR)
-        self.screen.blit(title_text, (SCREEN_WIDTH/2 - title_text.get_width()/2, 100))
+        title_text = self.text.render("Initial Roll", 50, FONT_COLOR)
+        self.screen.blit(title_text, (self.geometry.width/2 - title_text.get_width()/2, 100))
 
         if self.game.initial_roll_winner:
             winner_name = self.game.initial_roll_winner.get_name()
             msg = f"{winner_name} wins the roll and goes first!"
             p1_roll = self.game.initial_rolls[0]
             p2_roll = self.game.initial_rolls[1]
-            roll_text = self.small_font.render(f"{self.game.players[0].get_name()}: {p1_roll}, {self.game.players[1].get_name()}: {p2_roll}", True, FONT_COLOR)
+            roll_text = self.text.render(f"{self.game.players[0].get_name()}: {p1_roll}, {self.game.players[1].get_name()}: {p2_roll}", 36, FONT_COLOR)
             start_text_str = "Start Game"
         elif self.game.initial_rolls != [0, 0]:
             msg = "It's a tie! Roll again."
-            roll_text = self.small_font.render(f"Both players rolled a {self.game.initial_rolls[0]}", True, FONT_COLOR)
+            roll_text = self.text.render(f"Both players rolled a {self.game.initial_rolls[0]}", 36, FONT_COLOR)
             start_text_str = "Roll Again"
         else:
             msg = "Click the button to roll for the first turn."
-            roll_text = self.small_font.render("", True, FONT_COLOR)
+            roll_text = self.text.render("", 36, FONT_COLOR)
             start_text_str = "Roll for First Turn"
 
-        msg_text = self.small_font.render(msg, True, FONT_COLOR)
-        self.screen.blit(msg_text, (SCREEN_WIDTH/2 - msg_text.get_width()/2, 250))
-        self.screen.blit(roll_text, (SCREEN_WIDTH/2 - roll_text.get_width()/2, 300))
+        msg_text = self.text.render(msg, 36, FONT_COLOR)
+        self.screen.blit(msg_text, (self.geometry.width/2 - msg_text.get_width()/2, 250))
+        self.screen.blit(roll_text, (self.geometry.width/2 - roll_text.get_width()/2, 300))
 
         pygame.draw.rect(self.screen, POINT_COLOR_1, self.initial_roll_button, border_radius=8)
-        start_text = self.small_font.render(start_text_str, True, FONT_COLOR)
+        start_text = self.text.render(start_text_str, 36, FONT_COLOR)
         self.screen.blit(start_text, (self.initial_roll_button.centerx - start_text.get_width()/2, self.initial_roll_button.centery - start_text.get_height()/2))
     
     def draw_game_over_screen(self):
         self.screen.fill(HUD_COLOR)
         winner = self.game.get_winner()
         if winner:
-            win_text = self.font.render(f"{winner.get_name()} wins!", True, FONT_COLOR)
-            self.screen.blit(win_text, (SCREEN_WIDTH/2 - win_text.get_width()/2, SCREEN_HEIGHT/4))
+            win_text = self.text.render(f"{winner.get_name()} wins!", 50, FONT_COLOR)
+            self.screen.blit(win_text, (self.geometry.width/2 - win_text.get_width()/2, self.geometry.height/4))
         
         for key, rect in self.game_over_buttons.items():
             pygame.draw.rect(self.screen, POINT_COLOR_1, rect, border_radius=8)
             text_str = key.replace("_", " ").title()
-            text = self.small_font.render(text_str, True, FONT_COLOR)
+            text = self.text.render(text_str, 36, FONT_COLOR)
             self.screen.blit(text, (rect.centerx - text.get_width()/2, rect.centery - text.get_height()/2))
 
     def draw_message(self):
         if self.message:
-            # Create a semi-transparent surface for the background
-            overlay = pygame.Surface((500, 100), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180)) # Black with alpha transparency
-
-            # Render the text
-            msg_font = pygame.font.Font(None, 42)
-            msg_text = msg_font.render(self.message, True, (255, 255, 150)) # Light Yellow
-            text_rect = msg_text.get_rect(center=(250, 50))
-
-            # Blit the text onto the overlay
-            overlay.blit(msg_text, text_rect)
-
-            # Blit the overlay onto the center of the game board
-            board_center_x = BOARD_LEFT + BOARD_WIDTH / 2
-            board_center_y = BOARD_TOP + BOARD_HEIGHT / 2
-            self.screen.blit(overlay, (board_center_x - 250, board_center_y - 50))
+            # Semi-transparent background over the center of the game board
+            rect = self.get_message_rect()
+            self.screen.blit(self.geometry.message_panel, rect.topleft)
+
+            # Render the text, clipped to the panel
+            msg_text = self.text.render(self.message, 42, (255, 255, 150)) # Light Yellow
+            clip = self.screen.get_clip()
+            self.screen.set_clip(rect.clip(clip))
+            self.screen.blit(msg_text, msg_text.get_rect(center=rect.center))
+            self.screen.set_clip(clip)
             
+    def draw_frame(self, changed):
+        """
+        Draws what changed since the last frame. The game screen is redrawn region by region;
+        the other screens are static and only redrawn after input or a change of screen.
+        """
+        screen = "game" if self.game_state in ["playing", "ai_rolling", "ai_moving"] else self.game_state
+        full = screen != self.drawn_screen
+        self.drawn_screen = screen
+        if screen == "game":
+            self.draw_game_screen(full)
+            return
+        if not (full or changed):
+            return
+        self.screen.fill(BACKGROUND_COLOR)
+        if self.game_state == "menu":
+            self.draw_main_menu()
+        elif self.game_state == "enter_names":
+            self.draw_enter_names_screen()
+        elif self.game_state == "initial_roll":
+            self.draw_initial_roll_screen()
+        elif self.game_state == "game_over":
+            self.draw_game_over_screen()
+        self.dirty_rects.append(self.screen.get_rect())
+
     def run(self):
         running = True
         
         while running:
+            state_before = self.game_state
+            handled_input = False
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                if event.type == pygame.VIDEORESIZE:
+                    self.resize(event.size)
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.drawn_screen = None  # The window contents were lost
+                elif event.type != pygame.MOUSEMOTION:
+                    handled_input = True
 
                 # --- Event Handling based on Game State ---
                 if self.game_state == "enter_names":
@@ -539,11 +728,16 @@ class BackgammonUI:
                                 self.game.determine_first_player()
                     elif self.game_state == "playing":
                         self.handle_click(pos)
+                    elif self.game_state == "ai_moving":
+                        # Only leaving is allowed while the AI thinks
+                        if self.ingame_buttons["exit"].collidepoint(pos):
+                            self.exit_to_menu()
                     elif self.game_state == "game_over":
                         self.handle_click(pos)  # Reuses the main click handler
             
-            if self.game and self.game.is_game_over():
+            if self.game and self.game.is_game_over() and not len(self.animations):
                 self.game_state = "game_over"
+                self.ai_moves_played = False
 
             if self.message and pygame.time.get_ticks() - self.message_timer > 2000:
                 self.message = None
@@ -575,36 +769,41 @@ class BackgammonUI:
                     self.game_state = "ai_moving"
 
             if self.game_state == "ai_moving":
-                if self.ai_turn_timer is not None and pygame.time.get_ticks() - self.ai_turn_timer > 1000:
-                    self.game.play_ai_turn()
-                    self.game.switch_player()
-                    self.dice_rolled = False
-                    self.game_state = "playing"
-                    self.ai_turn_timer = None
-
-            self.screen.fill(BACKGROUND_COLOR)
-            if self.game_state in ["playing", "ai_rolling", "ai_moving"]:
-                self.draw_board()
-                self.draw_checkers()
-                self.draw_possible_moves()
-                self.draw_hud()
-                self.draw_bear_off_area()
-            elif self.game_state == "menu":
-                self.draw_main_menu()
-            elif self.game_state == "enter_names":
-                self.draw_enter_names_screen()
-            elif self.game_state == "initial_roll":
-                self.draw_initial_roll_screen()
-            elif self.game_state == "game_over":
-                self.draw_game_over_screen()
-            
-            pygame.display.flip()
-
+                if self.ai_moves_played:
+                    # Hand over once the AI's checkers have landed
+                    if not len(self.animations):
+                        self.ai_moves_played = False
+                        if not self.game.is_game_over():
+                            self.game.switch_player()
+                            self.dice_rolled = False
+                            self.game_state = "playing"
+                elif self.ai_job is None:
+                    # Think in the background; the UI keeps running meanwhile
+                    self.ai_job = self.ai_worker.submit(current_player, self.game.board, self.game.dice.get_values())
+                else:
+                    if self.ai_result is None:
+                        self.ai_result = self.ai_worker.poll()
+                    if self.ai_result is not None and pygame.time.get_ticks() - self.ai_turn_timer > AI_MOVE_DELAY:
+                        if self.ai_result.error is not None:
+                            print(f"AI failed to choose its moves: {self.ai_result.error}")
+                        self.game.play_moves(self.ai_result.moves, self.animate_move)
+                        self.ai_moves_played = True
+                        self.ai_turn_timer = None
+                        self.ai_job = None
+                        self.ai_result = None
+
+            self.draw_frame(handled_input or self.game_state != state_before)
+            if self.dirty_rects:
+                pygame.display.update(self.dirty_rects)
+                self.dirty_rects = []
+            self.clock.tick(self.fps)
+
+        self.ai_worker.close()
         pygame.quit()
 
 def main():
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
     pygame.display.set_caption("Backgammon")
     
     ui = BackgammonUI(screen)
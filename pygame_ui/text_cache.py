@@ -0,0 +1,83 @@
+"""
+Cache of fonts and rendered text for the pygame UI.
+
+Building a pygame Font loads and parses the font file, and rendering text rasterizes every
+glyph, so both are far too slow to repeat on every frame. The UI renders all of its text
+through one TextCache, which keeps the fonts by size and the rendered surfaces by
+(text, size, color) with least-recently-used eviction.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces.
+
+    The surfaces are shared: callers may blit them but must not draw on them.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Lookup and eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 256, font_name: Optional[str] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int, optional): Largest number of rendered surfaces kept.
+            font_name (str, optional): Font file to use; None is pygame's default font.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.__max_entries__ = max_entries
+        self.__font_name__ = font_name
+        self.__fonts__: Dict[int, pygame.font.Font] = {}
+        self.__surfaces__: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Returns the number of rendered surfaces kept."""
+        return len(self.__surfaces__)
+
+    def get_font(self, size: int) -> pygame.font.Font:
+        """Returns the font of the given size, loading it on first use."""
+        font = self.__fonts__.get(size)
+        if font is None:
+            font = self.__fonts__[size] = pygame.font.Font(self.__font_name__, size)
+        return font
+
+    def render(self, text: str, size: int, color: Tuple[int, ...]) -> pygame.Surface:
+        """
+        Returns the anti-aliased rendering of a text, rendering it only on a miss.
+
+        Args:
+            text (str): The text.
+            size (int): The font size.
+            color (tuple): The RGB text color.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, size, tuple(color))
+        surfaces = self.__surfaces__
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = surfaces[key] = self.get_font(size).render(text, True, color)
+        if len(surfaces) > self.__max_entries__:
+            surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Drops every rendered surface (the fonts are kept)."""
+        self.__surfaces__.clear()
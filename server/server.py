@@ -0,0 +1,363 @@
+"""
+Headless asyncio game server.
+
+Hosts many concurrent games in one process and speaks line-delimited JSON over TCP or a
+Unix socket: each request is one JSON object on its own line and gets exactly one JSON
+object line back. AI turns are computed in a worker pool, so the event loop keeps serving
+other tables while an AI thinks.
+
+Requests carry a "cmd" and, except for "new", the "game" id; an optional "id" is echoed
+back. Commands:
+
+    new       {"white": name, "black": name, "ai": "white"|"black"|null, "seed": int|null}
+    state     the position, dice and side to move
+    roll      roll the dice for the side to move
+    legal     the single moves playable with the remaining dice
+    move      {"from": 0-23|"bar", "to": 0-23|"off"}
+    end_turn  pass the turn after rolling; if the opponent is the AI it plays its whole turn
+    close     forget the game
+
+Responses have "ok": true and the command's result, or "ok": false and an "error" message.
+
+Usage:
+    python -m server.server --tcp 127.0.0.1:8765 [--workers 4]
+    python -m server.server --unix /tmp/backgammon.sock
+"""
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ai import AIPlayer
+from core.board import Board
+from core.book import default_book
+from core.dice import Dice
+from core.game import Game
+from core.player import Player
+
+# Longest request line accepted, in bytes.
+MAX_LINE = 1 << 16
+
+
+class ProtocolError(Exception):
+    """A request that cannot be served; its message is sent back to the client."""
+
+
+def choose_ai_moves(position_id: str, dice: List[int], name: str, color: str) -> List[list]:
+    """
+    Computes an AI turn in a worker process.
+
+    The position travels as its position ID, so nothing but short strings crosses the
+    process boundary.
+
+    Args:
+        position_id (str): The position, with the AI to move.
+        dice (list[int]): The dice of the turn.
+        name (str): The AI player's name.
+        color (str): The AI player's color.
+
+    Returns:
+        list: The moves as [from_point, to_point] pairs.
+    """
+    ai = AIPlayer(name, color, opening_book=default_book())
+    other = Player(name + " (opponent)", 'black' if color == 'white' else 'white')
+    board = Board(ai, other) if color == 'white' else Board(other, ai)
+    board.set_position_id(position_id)
+    return [list(move) for move in ai.choose_moves(board, list(dice))]
+
+
+class GameSession:
+    """
+    A hosted game and the lock that serializes the requests made on it.
+
+    Attributes
+    ----------
+    game : Game
+        The game.
+    lock : asyncio.Lock
+        Held while a request (including an AI turn) is being served.
+    rolled : bool
+        Whether the side to move has its roll for this turn; end_turn is refused until it has.
+    """
+
+    def __init__(self, game: Game):
+        """Initializes the session."""
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.rolled = False
+
+
+class GameServer:
+    """
+    Serves line-delimited JSON requests for any number of games.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None):
+        """
+        Initializes the server.
+
+        Args:
+            executor (Executor, optional): Pool used for AI turns. A ProcessPoolExecutor with
+                the given number of workers is created (and owned) if omitted.
+            workers (int, optional): Worker processes of the default pool; None uses every CPU.
+        """
+        self.__owns_executor__ = executor is None
+        self.__executor__ = executor if executor is not None else ProcessPoolExecutor(workers)
+        self.__sessions__: Dict[str, GameSession] = {}
+        self.__ids__ = itertools.count(1)
+
+    def get_game_count(self) -> int:
+        """Returns the number of games currently hosted."""
+        return len(self.__sessions__)
+
+    def close(self):
+        """Shuts down the worker pool if the server created it."""
+        if self.__owns_executor__:
+            self.__executor__.shutdown(cancel_futures=True)
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Serves one request.
+
+        Args:
+            request (dict): The decoded request.
+
+        Returns:
+            dict: The response, with the request's "id" echoed back.
+        """
+        try:
+            if not isinstance(request, dict):
+                raise ProtocolError("request must be a JSON object")
+            command = request.get('cmd')
+            if command == 'new':
+                response = await self._new(request)
+            else:
+                handler = None
+                if isinstance(command, str):
+                    handler = getattr(self, f"_cmd_{command}", None)
+                if handler is None:
+                    raise ProtocolError(f"unknown command {command!r}")
+                game_id = request.get('game')
+                session = self.__sessions__.get(game_id) if isinstance(game_id, str) else None
+                if session is None:
+                    raise ProtocolError("unknown game")
+                async with session.lock:
+                    response = await handler(request, session)
+            response = dict(response, ok=True)
+        except (ProtocolError, ValueError, IndexError) as error:
+            response = {'ok': False, 'error': str(error)}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves the requests of one client connection until it closes."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Line longer than the stream limit
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {'ok': False, 'error': "invalid JSON"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Starts listening on a TCP address and returns the asyncio server."""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        """Starts listening on a Unix socket and returns the asyncio server."""
+        return await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+
+    # --- Commands ---
+
+    async def _new(self, request: dict) -> dict:
+        """Creates a game, plays the opening roll and, if the AI won it, the AI's first turn."""
+        ai_color = request.get('ai')
+        if ai_color not in (None, 'white', 'black'):
+            raise ProtocolError("ai must be 'white', 'black' or null")
+        seed = request.get('seed')
+        if seed is not None and type(seed) is not int:
+            raise ProtocolError("seed must be an integer")
+        names = (str(request.get('white', 'White')), str(request.get('black', 'Black')))
+        if names[0] == names[1]:
+            raise ProtocolError("players need different names")
+        players = [AIPlayer(name, color) if color == ai_color else Player(name, color)
+                   for name, color in zip(names, ('white', 'black'))]
+        game = Game(players, dice=Dice(seed=seed))
+        game.determine_first_player()
+
+        game_id = str(next(self.__ids__))
+        session = GameSession(game)
+        self.__sessions__[game_id] = session
+        async with session.lock:
+            ai_turn = None
+            if isinstance(game.get_current_player(), AIPlayer):
+                ai_turn = await self._play_ai_turn(game, roll=False)
+            else:
+                session.rolled = True  # The opening dice are the first player's roll
+            return dict(self._state(game), game=game_id, ai_turn=ai_turn)
+
+    # Every _cmd_ handler takes (request, session); the session holds the game and its lock.
+
+    async def _cmd_state(self, _request: dict, session: GameSession) -> dict:
+        """Returns the state of a game."""
+        return self._state(session.game)
+
+    async def _cmd_roll(self, _request: dict, session: GameSession) -> dict:
+        """Rolls the dice for the side to move."""
+        game = session.game
+        self._check_running(game)
+        if session.rolled:
+            raise ProtocolError("dice already rolled")
+        game.roll_dice()
+        session.rolled = True
+        return {'dice': list(game.dice.get_values()), 'legal': self._legal_moves(game)}
+
+    async def _cmd_legal(self, _request: dict, session: GameSession) -> dict:
+        """Lists the single moves the side to move can play with the remaining dice."""
+        return {'legal': self._legal_moves(session.game)}
+
+    async def _cmd_move(self, request: dict, session: GameSession) -> dict:
+        """Plays one move for the side to move."""
+        game = session.game
+        self._check_running(game)
+        from_point, to_point = request.get('from'), request.get('to')
+        # type() rather than isinstance(): JSON true/false must not pass as points 1 and 0.
+        if not (from_point == 'bar' or (type(from_point) is int and 0 <= from_point < 24)):
+            raise ProtocolError("from must be 0-23 or 'bar'")
+        if not (to_point == 'off' or (type(to_point) is int and 0 <= to_point < 24)):
+            raise ProtocolError("to must be 0-23 or 'off'")
+        if from_point == 'bar' and to_point == 'off':
+            raise ProtocolError("a checker cannot go from the bar straight off")
+        game.move(from_point, to_point)
+        return dict(self._state(game), legal=self._legal_moves(game))
+
+    async def _cmd_end_turn(self, _request: dict, session: GameSession) -> dict:
+        """Passes the turn once the dice are used up or blocked, then plays any AI turn."""
+        game = session.game
+        self._check_running(game)
+        if not session.rolled:
+            raise ProtocolError("roll the dice first")
+        if self._legal_moves(game):
+            raise ProtocolError("moves are still available")
+        game.dice.set_values([])
+        game.switch_player()
+        session.rolled = False
+        ai_turn = None
+        if isinstance(game.get_current_player(), AIPlayer):
+            ai_turn = await self._play_ai_turn(game, roll=True)
+        return dict(self._state(game), ai_turn=ai_turn)
+
+    async def _cmd_close(self, request: dict, _session: GameSession) -> dict:
+        """Forgets a game."""
+        del self.__sessions__[request['game']]
+        return {}
+
+    # --- Helpers ---
+
+    async def _play_ai_turn(self, game: Game, roll: bool) -> dict:
+        """Plays the AI's turn with the moves computed in the worker pool, then passes the turn."""
+        player = game.get_current_player()
+        if roll:
+            game.roll_dice()
+        dice = list(game.dice.get_values())
+        loop = asyncio.get_running_loop()
+        moves = await loop.run_in_executor(self.__executor__, choose_ai_moves,
+                                           game.board.get_position_id(player), dice,
+                                           player.get_name(), player.get_color())
+        played = [list(move) for move in game.play_moves(moves)]
+        if not game.is_game_over():
+            game.dice.set_values([])
+            game.switch_player()
+        return {'dice': dice, 'moves': played}
+
+    @staticmethod
+    def _check_running(game: Game):
+        """Rejects commands that change a finished game."""
+        if game.is_game_over():
+            raise ProtocolError("game is over")
+
+    @staticmethod
+    def _legal_moves(game: Game) -> List[list]:
+        """The [from, to] moves playable right now by the side to move."""
+        if game.is_game_over():
+            return []
+        board, player, dice = game.board, game.get_current_player(), game.dice.get_values()
+        if not dice:
+            return []
+        if board.get_bar_count(player):
+            origins = ['bar']
+        else:
+            origins = [i for i in range(24)
+                       if board.get_point(i) and board.get_point(i)[0].get_owner() == player]
+        return [[origin, destination] for origin in origins
+                for destination in board.get_possible_moves_for_checker(origin, player, dice)]
+
+    @staticmethod
+    def _state(game: Game) -> dict:
+        """The JSON view of a game."""
+        player = game.get_current_player()
+        winner = game.get_winner()
+        return {
+            'position': game.board.get_position_id(player),
+            'turn': player.get_color(),
+            'dice': list(game.dice.get_values()),
+            'winner': winner.get_color() if winner is not None else None,
+        }
+
+
+async def _serve(args):
+    """Runs the server until it is cancelled."""
+    server = GameServer(workers=args.workers)
+    try:
+        if args.unix:
+            listener = await server.serve_unix(args.unix)
+        else:
+            host, _, port = args.tcp.rpartition(':')
+            listener = await server.serve_tcp(host or '127.0.0.1', int(port))
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve Backgammon games over line-delimited JSON.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--tcp", default="127.0.0.1:8765", help="host:port to listen on")
+    group.add_argument("--unix", help="Unix socket path to listen on")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="AI worker processes (default: all CPUs)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -60,5 +60,18 @@ class TestAIPlayer(unittest.TestCase):
         
         self.assertIn((18, 'off'), moves)
 
+    def test_choose_moves_leaves_board_unchanged(self):
+        points_before = [list(point) for point in self.board.get_points()]
+        bar_before = {player: list(checkers) for player, checkers in self.board.get_bar().items()}
+
+        moves = self.ai.choose_moves(self.board, [6, 6, 6, 6])
+
+        self.assertGreater(len(moves), 0)
+        self.assertEqual([list(point) for point in self.board.get_points()], points_before)
+        self.assertEqual(self.board.get_bar(), bar_before)
+        for before, after in zip(points_before, self.board.get_points()):
+            for original, current in zip(before, after):
+                self.assertIs(original, current)
+
 if __name__ == "__main__":
     unittest.main()
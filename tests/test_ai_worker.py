@@ -0,0 +1,78 @@
+import time
+import unittest
+from core.player import Player
+from core.board import Board
+from core.ai import AIPlayer, SearchAIPlayer
+from core.array_board import ArrayBoard
+from core.movegen import generate_positions
+from pygame_ui.ai_worker import AIWorker
+
+
+def _wait(worker, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.005)
+    raise AssertionError("the worker did not answer")
+
+
+class TestAIWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = AIWorker()
+        self.white = Player("White", "white")
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_delivers_the_moves_of_a_turn(self):
+        ai = AIPlayer("Computer", "black")
+        board = Board(self.white, ai)
+        before = board.get_position_id(ai)
+        job = self.worker.submit(ai, board, [5, 3])
+        self.assertTrue(self.worker.is_busy())
+        result = _wait(self.worker)
+        self.assertEqual(result.job, job)
+        self.assertIsNone(result.error)
+        legal = [sorted(m) for m, _ in generate_positions(ArrayBoard.from_board(board).get_cells(), False, [5, 3])]
+        self.assertIn(sorted(result.moves), legal)
+        self.assertFalse(self.worker.is_busy())
+        self.assertEqual(board.get_position_id(ai), before)  # The worker played on a copy
+
+    def test_cancelled_turns_are_dropped(self):
+        ai = SearchAIPlayer("Computer", "black", depth=None, time_budget=5.0)
+        board = Board(self.white, ai)
+        self.worker.submit(ai, board, [6, 6, 6, 6])
+        start = time.monotonic()
+        time.sleep(0.05)
+        self.worker.cancel()
+        self.assertFalse(self.worker.is_busy())
+        quick = AIPlayer("Quick", "black")
+        job = self.worker.submit(quick, Board(self.white, quick), [2, 1])
+        result = _wait(self.worker)
+        self.assertEqual(result.job, job)
+        # The cancelled search stopped early instead of using its whole budget
+        self.assertLess(time.monotonic() - start, 4.0)
+
+    def test_a_new_turn_clears_an_earlier_stop(self):
+        ai = SearchAIPlayer("Computer", "black", depth=2, time_budget=5.0)
+        ai.get_search().stop()  # As left behind by a cancelled turn
+        job = self.worker.submit(ai, Board(self.white, ai), [6, 5])
+        self.assertEqual(_wait(self.worker).job, job)
+        self.assertEqual(ai.get_search().last_depth, 2)
+
+    def test_reports_errors(self):
+        class Broken(AIPlayer):
+            def choose_moves(self, board, dice):
+                raise RuntimeError("no moves for you")
+
+        ai = Broken("Computer", "black")
+        self.worker.submit(ai, Board(self.white, ai), [4, 2])
+        result = _wait(self.worker)
+        self.assertEqual(result.moves, [])
+        self.assertIsInstance(result.error, RuntimeError)
+
+
+if __name__ == '__main__':
+    unittest.main()
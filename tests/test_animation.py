@@ -0,0 +1,43 @@
+import unittest
+from pygame_ui.animation import AnimationQueue, CheckerAnimation, ease_out, MOVE_DURATION
+
+
+class TestAnimation(unittest.TestCase):
+    def test_position_is_interpolated_over_time(self):
+        animation = CheckerAnimation('white', (0, 0), (100, 50), 5, 2, start_ms=1000, duration_ms=200)
+        self.assertEqual(animation.get_position(900), (0, 0))
+        self.assertEqual(animation.get_position(1200), (100, 50))
+        self.assertEqual(animation.get_position(5000), (100, 50))
+        x, y = animation.get_position(1100)
+        self.assertAlmostEqual(x, 100 * ease_out(0.5))
+        self.assertAlmostEqual(y, 50 * ease_out(0.5))
+        self.assertGreater(x, 50)  # Eased: more than halfway at half time
+
+    def test_moves_play_one_after_the_other(self):
+        queue = AnimationQueue()
+        first = CheckerAnimation('white', (0, 0), (1, 1), 7, 4, queue.next_start(0))
+        queue.add(first)
+        second = CheckerAnimation('white', (1, 1), (2, 2), 4, 1, queue.next_start(10))
+        queue.add(second)
+        self.assertEqual(second.start_ms, MOVE_DURATION)
+        self.assertEqual(queue.get_flying(10), [first])
+        self.assertEqual(queue.get_flying(MOVE_DURATION + 10), [second])
+        self.assertFalse(queue.prune(10))
+        self.assertTrue(queue.prune(MOVE_DURATION))
+        self.assertEqual(len(queue), 1)
+
+    def test_adjustments_hide_arrivals_and_keep_departures(self):
+        queue = AnimationQueue()
+        queue.add(CheckerAnimation('black', (0, 0), (1, 1), 12, 9, 0))
+        queue.add(CheckerAnimation('white', (1, 1), (2, 2), 9, ('bar', 'white'), 0))  # Hit on 9
+        queue.add(CheckerAnimation('black', (2, 2), (3, 3), 9, ('off', 'black'), MOVE_DURATION))
+        adjustments = queue.get_adjustments(10)
+        self.assertEqual(adjustments[('bar', 'white')][:2], (1, 0))
+        self.assertEqual(adjustments[9], (1, 1, 'black'))  # The hitter lands, then leaves again
+        self.assertEqual(adjustments[('off', 'black')][:2], (1, 0))
+        self.assertNotIn(12, adjustments)
+        self.assertEqual(queue.get_adjustments(2 * MOVE_DURATION), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+from core.player import Player
+from core.board import Board
+from core.checkers import Checkers
+from core.array_board import ArrayBoard, WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+
+
+class TestArrayBoard(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+        self.board = ArrayBoard(self.white, self.black)
+
+    def test_initial_position_matches_board(self):
+        reference = Board(self.white, self.black)
+        for i in range(24):
+            self.assertEqual(len(self.board.get_point(i)), len(reference.get_point(i)))
+            if reference.get_point(i):
+                self.assertEqual(self.board.get_point(i)[0].get_owner(),
+                                 reference.get_point(i)[0].get_owner())
+
+    def test_get_point_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.board.get_point(24)
+
+    def test_hit_sends_checker_to_bar(self):
+        cells = self.board.get_cells()
+        cells[20] = -1  # Black blot on white's path from 23
+        self.board.move_piece(23, 3, self.white)
+        self.assertEqual(cells[20], 1)
+        self.assertEqual(cells[BLACK_BAR], 1)
+        self.assertEqual(len(self.board.get_bar()[self.black]), 1)
+        # Black must now enter from the bar before anything else
+        self.assertFalse(self.board.is_valid_move(0, 1, self.black))
+        self.assertTrue(self.board.is_valid_move('bar', 2, self.black))
+
+    def test_blocked_point_is_invalid(self):
+        # White 6-point (index 5) holds 5 white checkers, black cannot land there
+        self.assertFalse(self.board.is_valid_move(0, 5, self.black))
+        with self.assertRaises(ValueError):
+            self.board.move_piece(0, 5, self.black)
+
+    def test_bear_off_and_winner(self):
+        cells = self.board.get_cells()
+        for i in range(24): cells[i] = 0
+        cells[20] = -1
+        cells[BLACK_OFF] = 14
+        self.assertTrue(self.board.can_player_bear_off(self.black))
+        self.assertFalse(self.board.is_valid_move(20, 5, self.black))
+        self.board.move_piece(20, 4, self.black)
+        self.assertEqual(self.board.get_off_board_count(self.black), 15)
+        self.assertEqual(self.board.get_winner(), self.black)
+
+    def test_from_board_roundtrip(self):
+        board = Board(self.white, self.black)
+        board.get_bar()[self.white].append(Checkers(self.white))
+        board.get_points()[23].pop()
+        board._set_off_board_count(self.black, 2)
+        board.get_points()[0] = []
+        fast = ArrayBoard.from_board(board)
+        self.assertEqual(fast.get_cells()[WHITE_BAR], 1)
+        self.assertEqual(fast.get_cells()[23], 1)
+        self.assertEqual(fast.get_cells()[0], 0)
+        self.assertEqual(fast.get_cells()[BLACK_OFF], 2)
+        self.assertEqual(fast.get_cells()[WHITE_OFF], 0)
+
+    def test_random_games_match_list_board(self):
+        rng = random.Random(1234)
+        for _ in range(20):
+            board = Board(self.white, self.black)
+            fast = ArrayBoard(self.white, self.black)
+            player = self.white
+            for _ in range(200):
+                dice = [rng.randint(1, 6), rng.randint(1, 6)]
+                self.assertEqual(board.has_any_valid_moves(player, dice),
+                                 fast.has_any_valid_moves(player, dice))
+                self.assertEqual(board.can_player_bear_off(player), fast.can_player_bear_off(player))
+                for die in dice:
+                    origins = ['bar'] + list(range(24))
+                    valid = [o for o in origins if board.is_valid_move(o, die, player)]
+                    self.assertEqual(valid, [o for o in origins if fast.is_valid_move(o, die, player)])
+                    for origin in valid[:1]:
+                        self.assertEqual(board.get_possible_moves_for_checker(origin, player, dice),
+                                         fast.get_possible_moves_for_checker(origin, player, dice))
+                    if valid:
+                        origin = rng.choice(valid)
+                        board.move_piece(origin, die, player)
+                        fast.move_piece(origin, die, player)
+                self.assertEqual(list(ArrayBoard.from_board(board).get_cells()), list(fast.get_cells()))
+                if board.get_winner():
+                    self.assertEqual(board.get_winner(), fast.get_winner())
+                    break
+                player = self.black if player == self.white else self.white
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+import numpy as np
+from core.player import Player
+from core.array_board import ArrayBoard
+from core.batch import stack_boards, legal_move_mask, apply_moves, successors, BAR
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+        random.seed(17)
+        self.boards = [ArrayBoard(self.white, self.black, random_positions=True) for _ in range(40)]
+        rng = random.Random(5)
+        for board in self.boards[:15]:
+            cells = board.get_cells()
+            cells[24], cells[25] = rng.randint(0, 2), rng.randint(0, 2)
+        for board in self.boards[15:25]:
+            # Bear-off positions for both sides
+            cells = board.get_cells()
+            for i in range(28): cells[i] = 0
+            cells[rng.randrange(6)] += 3
+            cells[rng.randrange(6)] += 2
+            cells[26] = 10
+            cells[18 + rng.randrange(6)] -= 4
+            cells[27] = 11 - rng.randint(0, 1)
+        self.stacked = stack_boards(self.boards)
+
+    def _origins(self):
+        return list(range(24)) + ['bar']
+
+    def test_mask_matches_is_valid_move(self):
+        for player in (self.white, self.black):
+            is_white = player.get_color() == 'white'
+            for die in range(1, 7):
+                mask = legal_move_mask(self.stacked, die, is_white)
+                for row, board in enumerate(self.boards):
+                    expected = [board.is_valid_move(o, die, player) for o in self._origins()]
+                    self.assertEqual(mask[row].tolist(), expected)
+
+    def test_per_board_dice_and_sides(self):
+        rng = np.random.default_rng(1)
+        dice = rng.integers(1, 7, size=len(self.boards))
+        sides = rng.integers(0, 2, size=len(self.boards)).astype(bool)
+        mask = legal_move_mask(self.stacked, dice, sides)
+        for row, board in enumerate(self.boards):
+            player = self.white if sides[row] else self.black
+            expected = [board.is_valid_move(o, int(dice[row]), player) for o in self._origins()]
+            self.assertEqual(mask[row].tolist(), expected)
+
+    def test_successors_match_move_piece(self):
+        for player in (self.white, self.black):
+            for die in range(1, 7):
+                parents, origins, children = successors(self.stacked, die, player.get_color() == 'white')
+                for parent, origin, child in zip(parents, origins, children):
+                    board = self.boards[parent].copy()
+                    board.move_piece('bar' if origin == BAR else int(origin), die, player)
+                    self.assertEqual(child.tolist(), list(board.get_cells()))
+
+    def test_apply_moves_does_not_modify_input(self):
+        before = self.stacked.copy()
+        mask = legal_move_mask(self.stacked, 3, True)
+        rows = np.nonzero(mask.any(axis=1))[0]
+        apply_moves(self.stacked[rows], mask[rows].argmax(axis=1), 3, True)
+        np.testing.assert_array_equal(self.stacked, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
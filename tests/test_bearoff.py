@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from core.player import Player
+from core.board import Board
+from core.checkers import Checkers
+from core.ai import AIPlayer
+from core.array_board import ArrayBoard
+from core.bearoff import (BearoffDatabase, generate_database, num_positions, position_index,
+                          successors, _all_positions, _rank_table)
+from core.movegen import generate_positions, to_perspective
+
+
+class TestBearoff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "bearoff.db")
+        generate_database(cls.path, max_checkers=4)
+        cls.database = BearoffDatabase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.database.close()
+        cls.directory.cleanup()
+
+    def test_index_is_a_bijection(self):
+        table = _rank_table(4)
+        indices = sorted(position_index(p, table) for p in _all_positions(4))
+        self.assertEqual(indices, list(range(num_positions(4))))
+
+    def test_single_checker_needs_an_exact_roll(self):
+        # A lone checker on the 1-point leaves only with a 1: 11 rolls in 36.
+        self.assertAlmostEqual(self.database.expected_rolls((1, 0, 0, 0, 0, 0)), 36 / 11, places=5)
+        distribution = self.database.distribution((1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(distribution[1], 11 / 36, places=4)
+        self.assertAlmostEqual(sum(distribution), 1.0, places=3)
+        self.assertEqual(self.database.expected_rolls((0, 0, 0, 0, 0, 0)), 0.0)
+
+    def test_successors_match_move_generator(self):
+        white, black = Player("White", "white"), Player("Black", "black")
+        board = ArrayBoard(white, black)
+        cells = board.get_cells()
+        for counts in [(1, 0, 2, 0, 0, 1), (0, 0, 0, 0, 1, 3), (2, 1, 0, 0, 0, 0)]:
+            for i in range(28): cells[i] = 0
+            for i, count in enumerate(counts): cells[i] = count
+            cells[26] = 15 - sum(counts)
+            cells[12] = -15
+            for dice in ([6, 5], [2, 1], [4, 4, 4, 4]):
+                expected = {tuple(c[:6]) for _, c in generate_positions(cells, True, dice)}
+                self.assertEqual(set(successors(counts, dice)), expected)
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, "other.db")
+        with open(path, "wb") as handle:
+            handle.write(b"not a database at all")
+        with self.assertRaises(ValueError):
+            BearoffDatabase(path)
+
+    def test_ai_uses_database_in_the_endgame(self):
+        human = Player("Human", "white")
+        ai = AIPlayer("Computer", "black", bearoff_database=self.database)
+        board = Board(human, ai)
+        for i in range(24): board.get_points()[i] = []
+        board.get_points()[5] = [Checkers(human) for _ in range(15)]
+        board.get_points()[23] = [Checkers(ai)]
+        board.get_points()[20] = [Checkers(ai), Checkers(ai)]
+        board._set_off_board_count(ai, 12)
+        cells = ArrayBoard.from_board(board).get_cells()
+        dice = [2, 1]
+        moves = ai.choose_moves(board, dice)
+
+        def expected(play):
+            return self.database.expected_rolls(to_perspective(play[1], False)[:6])
+
+        plays = generate_positions(cells, False, dice)
+        chosen = [play for play in plays if play[0] == moves]
+        self.assertEqual(len(chosen), 1)
+        self.assertAlmostEqual(expected(chosen[0]), min(expected(play) for play in plays))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from core.benchmark import BENCHMARKS, compare, main, run_benchmarks, sample_positions
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_positions_are_reproducible(self):
+        state = random.getstate()
+        first = sample_positions(10, seed=3)
+        second = sample_positions(10, seed=3)
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual([p.dice for p in first], [p.dice for p in second])
+        self.assertEqual([p.board.position_hash(p.player) for p in first],
+                         [p.board.position_hash(p.player) for p in second])
+
+    def test_benchmarks_leave_positions_unchanged(self):
+        positions = sample_positions(5, seed=1)
+        before = [p.board.position_hash(p.player) for p in positions]
+        for name in ('board.apply_undo', 'ai.choose_moves'):
+            run, operations = BENCHMARKS[name](positions)
+            run()
+            self.assertGreater(operations, 0)
+        self.assertEqual([p.board.position_hash(p.player) for p in positions], before)
+
+    def test_report_and_comparison(self):
+        report = run_benchmarks(['board.is_valid_move', 'game.roll_dice'], positions=5, repeat=1)
+        self.assertEqual(set(report['benchmarks']), {'board.is_valid_move', 'game.roll_dice'})
+        for result in report['benchmarks'].values():
+            self.assertGreater(result['median_us'], 0)
+
+        slower = {'benchmarks': {name: dict(result, median_us=result['median_us'] * 2)
+                                 for name, result in report['benchmarks'].items()}}
+        self.assertTrue(all(row['regression'] for row in compare(slower, report)))
+        self.assertFalse(any(row['regression'] for row in compare(report, slower)))
+
+    def test_command_line_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            code = main(["--only", "game.roll_dice", "--repeat", "1", "--positions", "2", "--output", path])
+            self.assertEqual(code, 0)
+            with open(path) as handle:
+                self.assertIn('game.roll_dice', json.load(handle)['benchmarks'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import unittest
+from core.player import Player
+from core.board import Board
+from core.array_board import ArrayBoard
+from core.checkers import Checkers
+
+
+def _reference(board, player):
+    """Pip count and bear-off eligibility computed by scanning the board."""
+    is_white = player.get_color() == 'white'
+    pips = 25 * board.get_bar_count(player)
+    home = 0
+    for i in range(24):
+        point = board.get_point(i)
+        if point and point[0].get_owner() == player:
+            pips += len(point) * ((i + 1) if is_white else (24 - i))
+            if (i < 6) if is_white else (i > 17):
+                home += len(point)
+    can_bear_off = board.get_bar_count(player) == 0 and home + board.get_off_board_count(player) == 15
+    return pips, can_bear_off
+
+
+class TestBoardCounters(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def test_starting_position(self):
+        board = Board(self.white, self.black)
+        self.assertEqual(board.get_pip_count(self.white), 167)
+        self.assertEqual(board.get_pip_count(self.black), 167)
+        self.assertEqual(board.get_checkers_outside_home(self.white), 10)
+        self.assertFalse(board.can_player_bear_off(self.white))
+
+    def test_counters_follow_moves_and_undo(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            board = Board(self.white, self.black)
+            player = self.white
+            history = []
+            for _ in range(400):
+                die = rng.randint(1, 6)
+                origins = [o for o in ['bar'] + list(range(24)) if board.is_valid_move(o, die, player)]
+                if origins:
+                    history.append((board.apply_move(rng.choice(origins), die, player),
+                                    _reference(board, self.white), _reference(board, self.black)))
+                for side in (self.white, self.black):
+                    self.assertEqual((board.get_pip_count(side), board.can_player_bear_off(side)),
+                                     _reference(board, side))
+                if board.get_winner():
+                    break
+                player = self.black if player == self.white else self.white
+            while history:
+                record, white_before, black_before = history.pop()
+                self.assertEqual((_reference(board, self.white), _reference(board, self.black)),
+                                 (white_before, black_before))
+                board.undo_move(record)
+                self.assertEqual(board.get_pip_count(self.white), _reference(board, self.white)[0])
+                self.assertEqual(board.get_pip_count(self.black), _reference(board, self.black)[0])
+
+    def test_direct_edits_are_picked_up(self):
+        board = Board(self.white, self.black)
+        self.assertFalse(board.can_player_bear_off(self.white))
+        for i in range(24): board.get_points()[i] = []
+        board.get_points()[3] = [Checkers(self.white)]
+        board._set_off_board_count(self.white, 14)
+        self.assertTrue(board.can_player_bear_off(self.white))
+        self.assertEqual(board.get_pip_count(self.white), 4)
+        self.assertEqual(board.get_checkers_outside_home(self.white), 0)
+
+    def test_array_board_bear_off_follows_moves_and_undo(self):
+        rng = random.Random(9)
+        for _ in range(20):
+            board = ArrayBoard(self.white, self.black)
+            player = self.white
+            history = []
+            for _ in range(400):
+                die = rng.randint(1, 6)
+                origins = [o for o in ['bar'] + list(range(24)) if board.is_valid_move(o, die, player)]
+                if origins:
+                    history.append(board.apply_move(rng.choice(origins), die, player))
+                for side in (self.white, self.black):
+                    self.assertEqual(board.can_player_bear_off(side), _reference(board, side)[1])
+                if board.get_winner():
+                    break
+                player = self.black if player == self.white else self.white
+            while history:
+                board.undo_move(history.pop())
+                for side in (self.white, self.black):
+                    self.assertEqual(board.can_player_bear_off(side), _reference(board, side)[1])
+
+    def test_array_board_direct_edits_are_picked_up(self):
+        board = ArrayBoard(self.white, self.black)
+        self.assertFalse(board.can_player_bear_off(self.white))
+        cells = board.get_cells()
+        for i in (7, 12, 23):
+            cells[i] = 0
+        cells[3] += 10
+        self.assertTrue(board.can_player_bear_off(self.white))
+
+
+if __name__ == "__main__":
+    unittest.main()
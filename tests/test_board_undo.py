@@ -0,0 +1,78 @@
+import random
+import unittest
+from core.player import Player
+from core.board import Board
+from core.array_board import ArrayBoard
+from core.checkers import Checkers
+
+
+def _snapshot(board):
+    """Captures every container of a list-based Board, keeping checker identities."""
+    points = [list(point) for point in board.get_points()]
+    bar = {player: list(checkers) for player, checkers in board.get_bar().items()}
+    white, black = board.get_players()
+    return points, bar, board.get_off_board_count(white), board.get_off_board_count(black), board.get_winner()
+
+
+class TestBoardUndo(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def test_undo_hit_restores_blot_and_bar(self):
+        board = Board(self.white, self.black)
+        blot = Checkers(self.black)
+        board.get_points()[20] = [blot]
+        before = _snapshot(board)
+        record = board.apply_move(23, 3, self.white)
+        self.assertIs(record.hit_checker, blot)
+        self.assertEqual(board.get_bar()[self.black], [blot])
+        board.undo_move(record)
+        self.assertEqual(_snapshot(board), before)
+        self.assertIs(board.get_point(20)[0], blot)
+
+    def test_undo_bear_off_restores_winner(self):
+        board = Board(self.white, self.black)
+        for i in range(24): board.get_points()[i] = []
+        board._set_off_board_count(self.white, 14)
+        checker = Checkers(self.white)
+        board.get_points()[2] = [checker]
+        record = board.apply_move(2, 3, self.white)
+        self.assertEqual(board.get_winner(), self.white)
+        board.undo_move(record)
+        self.assertIsNone(board.get_winner())
+        self.assertEqual(board.get_off_board_count(self.white), 14)
+        self.assertIs(board.get_point(2)[0], checker)
+
+    def test_random_sequences_undo_exactly(self):
+        rng = random.Random(99)
+        for board in (Board(self.white, self.black), ArrayBoard(self.white, self.black)):
+            for _ in range(30):
+                before = _snapshot(board)
+                cells_before = list(ArrayBoard.from_board(board).get_cells()) if isinstance(board, Board) \
+                    else list(board.get_cells())
+                records = []
+                player = self.white
+                for _ in range(12):
+                    die = rng.randint(1, 6)
+                    origins = [o for o in ['bar'] + list(range(24)) if board.is_valid_move(o, die, player)]
+                    if origins:
+                        records.append(board.apply_move(rng.choice(origins), die, player))
+                    player = self.black if player == self.white else self.white
+                while records:
+                    board.undo_move(records.pop())
+                if isinstance(board, Board):
+                    self.assertEqual(_snapshot(board), before)
+                    self.assertEqual(list(ArrayBoard.from_board(board).get_cells()), cells_before)
+                else:
+                    self.assertEqual(list(board.get_cells()), cells_before)
+                # Advance the base position so later rounds start from new positions
+                die = rng.randint(1, 6)
+                for origin in range(24):
+                    if board.is_valid_move(origin, die, self.white):
+                        board.move_piece(origin, die, self.white)
+                        break
+
+
+if __name__ == "__main__":
+    unittest.main()
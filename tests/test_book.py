@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from core.player import Player
+from core.board import Board
+from core.ai import AIPlayer, SearchAIPlayer
+from core.array_board import ArrayBoard, START_POSITION
+from core.book import OpeningBook, build_book, default_book
+from core.movegen import generate_positions
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "book.bin")
+        cls.count = build_book(cls.path, plies=1, depth=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_covers_the_opening_rolls(self):
+        book = OpeningBook(self.path)
+        self.assertEqual(self.count, 15)
+        self.assertEqual(len(book), 15)
+
+    def test_loads_on_first_lookup(self):
+        book = OpeningBook(self.path)
+        self.assertFalse(book.is_loaded())
+        self.assertIsNotNone(book.lookup(START_POSITION, True, [3, 1]))
+        self.assertTrue(book.is_loaded())
+        self.assertEqual((book.hits, book.misses), (1, 0))
+
+    def test_plays_are_legal_and_mirrored_for_black(self):
+        book = OpeningBook(self.path)
+        for dice in ([3, 1], [6, 5], [2, 4]):
+            white_moves = book.lookup(START_POSITION, True, dice)
+            legal = [moves for moves, _ in generate_positions(START_POSITION, True, dice)]
+            self.assertIn(white_moves, legal)
+            black_moves = book.lookup(START_POSITION, False, dice)
+            self.assertEqual(black_moves, [(23 - origin, 23 - destination) for origin, destination in white_moves])
+
+    def test_misses(self):
+        book = OpeningBook(self.path)
+        self.assertIsNone(book.lookup(START_POSITION, True, [3]))
+        self.assertIsNone(book.lookup(START_POSITION, True, [3, 3]))
+        cells = list(START_POSITION)
+        cells[5], cells[4] = 4, 1
+        self.assertIsNone(book.lookup(cells, True, [3, 1]))
+        self.assertEqual(book.misses, 1)
+
+    def test_ai_plays_from_the_book(self):
+        book = OpeningBook(self.path)
+        white, black = AIPlayer("White", "white", opening_book=book), Player("Black", "black")
+        board = Board(white, black)
+        expected = book.lookup(ArrayBoard.from_board(board).get_cells(), True, [6, 1])
+        self.assertEqual(white.choose_moves(board, [6, 1]), expected)
+        self.assertEqual(book.hits, 2)
+
+    def test_search_ai_plays_from_the_book_without_searching(self):
+        book = OpeningBook(self.path)
+        white = SearchAIPlayer("White", "white", depth=2, time_budget=None, opening_book=book)
+        board = Board(white, Player("Black", "black"))
+        expected = book.lookup(START_POSITION, True, [4, 2])
+        search = white.get_search()
+        with mock.patch.object(search, 'choose_play') as choose_play, \
+                mock.patch.object(search, 'iterative_play') as iterative_play:
+            self.assertEqual(white.choose_moves(board, [4, 2]), expected)
+        choose_play.assert_not_called()
+        iterative_play.assert_not_called()
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, "not_a_book.bin")
+        with open(path, 'wb') as handle:
+            handle.write(b'BGRC\x01')
+        with self.assertRaises(ValueError):
+            len(OpeningBook(path))
+
+    def test_shipped_book(self):
+        book = default_book()
+        self.assertIs(book, default_book())
+        self.assertGreater(len(book), 15)
+        self.assertIsNotNone(book.lookup(START_POSITION, False, [5, 2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
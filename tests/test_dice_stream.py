@@ -0,0 +1,54 @@
+import random
+import unittest
+from core.dice import Dice, DiceStream
+from core.game import Game
+from core.player import Player
+from core.simulate import play_game
+
+
+class TestDiceStream(unittest.TestCase):
+    def test_sequence_depends_only_on_seed(self):
+        small = DiceStream(123, block_size=7)
+        large = DiceStream(123, block_size=4096)
+        values = [small.next_die() for _ in range(50)] + small.take(30)
+        self.assertEqual(values, large.take(80))
+        self.assertEqual(small.get_consumed(), 80)
+        self.assertTrue(all(1 <= value <= 6 for value in values))
+        self.assertNotEqual(values, DiceStream(124).take(80))
+
+    def test_values_are_uniform(self):
+        values = DiceStream(1).take(60000)
+        for face in range(1, 7):
+            self.assertAlmostEqual(values.count(face) / len(values), 1 / 6, delta=0.01)
+
+    def test_spawned_streams_are_reproducible_and_distinct(self):
+        parent = DiceStream(9)
+        parent.take(5)  # Children do not depend on how much of the parent was consumed
+        first = DiceStream(9).spawn(3).take(20)
+        self.assertEqual(parent.spawn(3).take(20), first)
+        self.assertNotEqual(parent.spawn(4).take(20), first)
+
+    def test_global_random_state_is_not_used_when_seeded(self):
+        state = random.getstate()
+        dice = Dice(seed=5)
+        for _ in range(100):
+            dice.roll()
+        self.assertEqual(random.getstate(), state)
+
+    def test_game_with_injected_dice_replays(self):
+        def rolls():
+            game = Game([Player("A", "white"), Player("B", "black")], dice=Dice(DiceStream(77)))
+            game.determine_first_player()
+            result = [list(game.dice.get_values())]
+            for _ in range(10):
+                game.roll_dice()
+                result.append(list(game.dice.get_values()))
+            return result
+        self.assertEqual(rolls(), rolls())
+
+    def test_play_game_replays_with_stream(self):
+        self.assertEqual(play_game(stream=DiceStream(3)), play_game(stream=DiceStream(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
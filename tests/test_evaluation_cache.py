@@ -0,0 +1,66 @@
+import unittest
+from core.ai import AIPlayer
+from core.array_board import START_POSITION
+from core.board import Board
+from core.evaluator import CachedEvaluator, EvaluationCache, HeuristicEvaluator, ENTRY_BYTES
+from core.movegen import generate_positions
+from core.player import Player
+
+
+class CountingEvaluator(HeuristicEvaluator):
+    def __init__(self):
+        self.evaluated = 0
+
+    def evaluate_batch(self, positions, is_white):
+        self.evaluated += len(positions)
+        return super().evaluate_batch(positions, is_white)
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = EvaluationCache(max_entries=2)
+        a, b, c = (cache.key([i] + [0] * 27, True) for i in range(3))
+        cache.put(a, 0.1)
+        cache.put(b, 0.2)
+        self.assertEqual(cache.get(a), 0.1)  # a becomes the most recently used
+        cache.put(c, 0.3)                    # so b is evicted
+        self.assertIsNone(cache.get(b))
+        self.assertEqual(cache.get(c), 0.3)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (2, 1, 1))
+        self.assertEqual(len(cache), 2)
+        self.assertAlmostEqual(cache.hit_rate(), 2 / 3)
+
+    def test_side_to_move_is_part_of_the_key(self):
+        self.assertNotEqual(EvaluationCache.key(START_POSITION, True), EvaluationCache.key(START_POSITION, False))
+
+    def test_memory_limit(self):
+        self.assertEqual(EvaluationCache(max_entries=None, max_bytes=ENTRY_BYTES * 10).get_capacity(), 10)
+        self.assertEqual(EvaluationCache(max_entries=5, max_bytes=ENTRY_BYTES * 10).get_capacity(), 5)
+        with self.assertRaises(ValueError):
+            EvaluationCache(max_entries=None)
+
+    def test_cached_scores_match_and_only_misses_are_evaluated(self):
+        inner = CountingEvaluator()
+        evaluator = CachedEvaluator(inner)
+        positions = [play[1] for play in generate_positions(list(START_POSITION), True, [6, 5])]
+        first = evaluator.evaluate_batch(positions, False)
+        self.assertEqual(first, HeuristicEvaluator().evaluate_batch(positions, False))
+        self.assertEqual(inner.evaluated, len(positions))
+        self.assertEqual(evaluator.evaluate_batch(positions, False), first)
+        self.assertEqual(inner.evaluated, len(positions))
+        self.assertEqual(evaluator(positions[0], True), HeuristicEvaluator()(positions[0], True))
+        self.assertEqual(inner.evaluated, len(positions) + 1)
+
+    def test_shared_between_players(self):
+        inner = CountingEvaluator()
+        cache = EvaluationCache(max_entries=1000)
+        first = AIPlayer("Computer", "white", evaluator=CachedEvaluator(inner, cache))
+        second = AIPlayer("Computer", "white", evaluator=CachedEvaluator(inner, cache))
+        board = Board(first, Player("Human", "black"))
+        self.assertEqual(first.choose_moves(board, [3, 1]), second.choose_moves(board, [3, 1]))
+        self.assertEqual(cache.hits, inner.evaluated)
+        self.assertEqual(cache.stats()['size'], inner.evaluated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+try:
+    import pygame
+except ImportError:  # pragma: no cover - the UI is optional
+    pygame = None
+
+if pygame is not None:
+    from pygame_ui.geometry import BoardGeometry, STACK_SLOTS
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestBoardGeometry(unittest.TestCase):
+    SIZES = [(1024, 680), (800, 600), (1600, 1000)]
+
+    def test_checker_slots_hit_their_point(self):
+        for size in self.SIZES:
+            geometry = BoardGeometry(*size)
+            for point in range(24):
+                for k in range(STACK_SLOTS):
+                    self.assertEqual(geometry.hit_test(geometry.get_checker_position(point, k)), point)
+                self.assertTrue(geometry.point_rects[point].collidepoint(geometry.get_checker_position(point, 0)))
+
+    def test_bar_trays_and_outside(self):
+        geometry = BoardGeometry(1024, 680)
+        self.assertEqual(geometry.hit_test(geometry.bar_slots['white'][0]), 'bar')
+        self.assertEqual(geometry.hit_test(geometry.bar_rect.center), 'bar')
+        for color in ('white', 'black'):
+            self.assertEqual(geometry.hit_test(geometry.off_rects[color].center), ('off', color))
+        self.assertIsNone(geometry.hit_test(geometry.hud_rect.center))
+        self.assertIsNone(geometry.hit_test((geometry.board_rect.centerx, 5)))
+
+    def test_tables_follow_the_window_size(self):
+        small, large = BoardGeometry(800, 600), BoardGeometry(1600, 1000)
+        self.assertGreater(large.checker_radius, small.checker_radius)
+        self.assertEqual(large.hud_rect.right, 1600 - 10)
+        self.assertEqual(large.checker_highlight.get_width(), 2 * large.checker_radius)
+        # Point columns tile the board without gaps or overlaps
+        for geometry in (small, large):
+            top = sorted(geometry.point_rects[12:24] + [geometry.bar_rect], key=lambda rect: rect.left)
+            for left, right in zip(top, top[1:]):
+                self.assertEqual(left.right, right.left)
+
+    def test_small_windows_keep_the_minimum_layout(self):
+        tiny = BoardGeometry(200, 100)
+        self.assertEqual((tiny.width, tiny.height), (200, 100))
+        self.assertGreater(tiny.checker_radius, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+from core.player import Player
+from core.board import Board
+from core.array_board import ArrayBoard
+from core.movegen import generate_plays, generate_positions
+
+
+def _brute_force_positions(board, player, dice):
+    """Reference enumeration through ArrayBoard.is_valid_move without any pruning."""
+    finals = []
+
+    def search(current, remaining, used):
+        moved = False
+        for i, die in enumerate(remaining):
+            for origin in ['bar'] + list(range(24)):
+                if current.is_valid_move(origin, die, player):
+                    moved = True
+                    after = current.copy()
+                    after.move_piece(origin, die, player)
+                    search(after, remaining[:i] + remaining[i + 1:], used + [die])
+        if not moved:
+            finals.append((tuple(current.get_cells()), used))
+
+    search(board, list(dice), [])
+    longest = max(len(used) for _, used in finals)
+    finals = [f for f in finals if len(f[1]) == longest]
+    if longest == 1 and len(set(dice)) > 1:
+        largest = max(used[0] for _, used in finals)
+        finals = [f for f in finals if f[1][0] == largest]
+    return {cells for cells, _ in finals}
+
+
+class TestMoveGen(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def test_opening_roll_uses_both_dice(self):
+        board = ArrayBoard(self.white, self.black)
+        plays = generate_plays(board, self.white, [3, 1])
+        self.assertEqual(len(plays), 16)
+        self.assertTrue(all(len(play) == 2 for play in plays))
+
+    def test_accepts_list_board(self):
+        board = Board(self.white, self.black)
+        self.assertEqual(generate_plays(board, self.black, [6, 5]),
+                         generate_plays(ArrayBoard(self.white, self.black), self.black, [6, 5]))
+
+    def test_doubles_play_four_moves(self):
+        board = ArrayBoard(self.white, self.black)
+        plays = generate_plays(board, self.white, [2, 2, 2, 2])
+        self.assertTrue(plays)
+        self.assertTrue(all(len(play) == 4 for play in plays))
+
+    def test_larger_die_must_be_played(self):
+        board = ArrayBoard(self.white, self.black)
+        cells = board.get_cells()
+        for i in range(28): cells[i] = 0
+        cells[23], cells[8] = 14, 1
+        cells[17], cells[18], cells[20] = -2, -2, -11
+        self.assertEqual(generate_plays(board, self.white, [5, 6]), [[(8, 2)]])
+
+    def test_no_moves_returns_empty_play(self):
+        board = ArrayBoard(self.white, self.black)
+        cells = board.get_cells()
+        cells[24] = 1
+        for i in range(18, 24): cells[i] = -2
+        self.assertEqual(generate_plays(board, self.white, [3, 4]), [[]])
+
+    def test_matches_brute_force(self):
+        random.seed(42)
+        rng = random.Random(7)
+        for _ in range(60):
+            board = ArrayBoard(self.white, self.black, random_positions=True)
+            for player in (self.white, self.black):
+                d1, d2 = rng.randint(1, 6), rng.randint(1, 6)
+                dice = [d1] * 4 if d1 == d2 else [d1, d2]
+                plays = generate_positions(board.get_cells(), player.get_color() == 'white', dice)
+                finals = [tuple(cells) for _, cells in plays]
+                self.assertEqual(len(finals), len(set(finals)))
+                self.assertEqual(set(finals), _brute_force_positions(board, player, dice))
+
+    def test_moves_replay_to_final_position(self):
+        board = Board(self.white, self.black)
+        for moves, cells in generate_positions(ArrayBoard.from_board(board).get_cells(), False, [4, 4, 4, 4]):
+            replay = ArrayBoard.from_board(board)
+            for from_point, to_point in moves:
+                replay.move_piece(from_point, to_point - from_point, self.black)
+            self.assertEqual(list(replay.get_cells()), cells)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from core.ai import AIPlayer, SearchAIPlayer
+from core.array_board import ArrayBoard, START_POSITION
+from core.board import Board
+from core.evaluator import Evaluator, HeuristicEvaluator
+from core.movegen import generate_positions
+from core.network import NeuralEvaluator, encode
+from core.player import Player
+from core.search import evaluate_position
+
+
+class CountingEvaluator(HeuristicEvaluator):
+    def __init__(self):
+        self.batches = []
+
+    def evaluate_batch(self, positions, is_white):
+        self.batches.append(len(positions))
+        return super().evaluate_batch(positions, is_white)
+
+
+class TestNetwork(unittest.TestCase):
+    def test_encoding_of_start_position(self):
+        inputs = encode([START_POSITION], True)
+        self.assertEqual(inputs.shape, (1, 198))
+        # White: 2 on point 23 -> units (1, 1, 0, 0); 5 on point 5 -> (1, 1, 1, 1).
+        self.assertEqual(list(inputs[0, 92:96]), [1, 1, 0, 0])
+        self.assertEqual(list(inputs[0, 20:24]), [1, 1, 1, 1])
+        # Black: 2 on point 0.
+        self.assertEqual(list(inputs[0, 98:102]), [1, 1, 0, 0])
+        self.assertEqual(list(inputs[0, 196:198]), [1, 0])
+
+    def test_batch_matches_single_positions(self):
+        network = NeuralEvaluator(hidden=8, seed=1)
+        plays = generate_positions(list(START_POSITION), True, [6, 5])
+        positions = [play[1] for play in plays]
+        batch = network.evaluate_batch(positions, False)
+        for cells, score in zip(positions, batch):
+            self.assertAlmostEqual(network(cells, False), score, places=5)
+            self.assertTrue(-1 <= score <= 1)
+
+    def test_save_and_load(self):
+        network = NeuralEvaluator(hidden=5, seed=2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weights.npz")
+            network.save(path)
+            loaded = NeuralEvaluator.load(path)
+        np.testing.assert_array_equal(loaded.hidden_weights, network.hidden_weights)
+        self.assertAlmostEqual(loaded(START_POSITION, True), network(START_POSITION, True), places=6)
+
+    def test_ai_scores_all_plays_in_one_batch(self):
+        human, ai_color = Player("Human", "white"), "black"
+        evaluator = CountingEvaluator()
+        ai = AIPlayer("Computer", ai_color, evaluator=evaluator)
+        board = Board(human, ai)
+        moves = ai.choose_moves(board, [6, 5])
+        plays = generate_positions(ArrayBoard.from_board(board).get_cells(), False, [6, 5])
+        self.assertEqual(evaluator.batches, [len(plays)])
+        best = min(plays, key=lambda play: evaluate_position(play[1], True))
+        self.assertEqual(moves, best[0])
+
+    def test_network_plugs_into_players(self):
+        network = NeuralEvaluator(hidden=8)
+        for player in (AIPlayer("Computer", "white", evaluator=network),
+                       SearchAIPlayer("Computer", "white", depth=1, evaluator=network)):
+            board = Board(player, Player("Human", "black"))
+            moves = player.choose_moves(board, [3, 1])
+            self.assertEqual(len(moves), 2)
+
+    def test_base_class_is_abstract(self):
+        class Incomplete(Evaluator):
+            pass
+
+        # Fails when built, not in the middle of a search
+        with self.assertRaises(TypeError):
+            Evaluator()
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import base64
+import unittest
+from core.array_board import ArrayBoard
+from core.benchmark import sample_positions
+from core.board import Board
+from core.dice import Dice
+from core.player import Player
+from core.position_id import decode_dice, decode_position, encode_dice, encode_position
+
+
+class TestPositionId(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def test_starting_position(self):
+        board = Board(self.white, self.black)
+        position_id = board.get_position_id(self.white)
+        self.assertEqual(len(position_id), 15)
+        self.assertEqual(position_id, ArrayBoard(self.white, self.black).get_position_id(self.white))
+        self.assertNotEqual(position_id, board.get_position_id(self.black))
+
+    def test_round_trip_of_game_positions(self):
+        ids = set()
+        for position in sample_positions(40, seed=2):
+            cells = list(ArrayBoard.from_board(position.board).get_cells())
+            is_white = position.player.get_color() == 'white'
+            position_id = position.board.get_position_id(position.player)
+            self.assertEqual(decode_position(position_id), (cells, is_white))
+            ids.add(position_id)
+
+            board = Board(self.white, self.black)
+            to_move = board.set_position_id(position_id)
+            self.assertEqual(to_move.get_color(), position.player.get_color())
+            self.assertEqual(list(ArrayBoard.from_board(board).get_cells()), cells)
+            self.assertEqual(board.position_hash(), position.board.position_hash())
+            self.assertEqual(board.get_pip_count(self.white), position.board.get_pip_count(position.board.get_players()[0]))
+
+            fast = ArrayBoard(self.white, self.black)
+            fast.set_position_id(position_id)
+            self.assertEqual(list(fast.get_cells()), cells)
+        self.assertEqual(len(ids), 40)
+
+    def test_bear_off_position_keeps_winner(self):
+        cells = [0] * 28
+        cells[26], cells[0], cells[27] = 15, -1, 14
+        board = Board(self.white, self.black)
+        board.set_position_id(encode_position(cells, False))
+        self.assertEqual(board.get_winner(), self.white)
+        self.assertEqual(board.get_off_board_count(self.black), 14)
+
+    def test_malformed_ids(self):
+        for bad in ("", "abc", "!!!!!!!!!!!!!!!", "_" * 15):
+            with self.assertRaises(ValueError):
+                decode_position(bad)
+        cells = [0] * 28
+        cells[0] = 16
+        with self.assertRaises(ValueError):
+            encode_position(cells, True)
+
+    def test_dice_ids(self):
+        dice = Dice(seed=0)
+        for values in ([], [6, 1], [1, 6], [4, 4, 4, 4], [3]):
+            dice.set_values(list(values))
+            dice_id = dice.get_dice_id()
+            self.assertEqual(len(dice_id), 4)
+            dice.set_dice_id(dice_id)
+            self.assertEqual(dice.get_values(), sorted(values, reverse=True))
+        self.assertEqual(encode_dice([6, 1]), encode_dice([1, 6]))
+        with self.assertRaises(ValueError):
+            encode_dice([7])
+        with self.assertRaises(ValueError):
+            decode_dice("____")
+
+    def test_malformed_dice_ids(self):
+        def dice_id(bits):
+            return base64.urlsafe_b64encode(bits.to_bytes(3, 'little')).rstrip(b'=').decode()
+
+        self.assertEqual(decode_dice(dice_id(4 << 9)), [4, 4, 4, 4])
+        for bits in (1 << 18,              # Stray bit above the six face counts
+                     5 << 9,               # Five fours
+                     2 | 1 << 3,           # Two ones and a two
+                     1 | 1 << 3 | 1 << 6,  # Three different faces
+                     1 << 23):
+            with self.assertRaises(ValueError):
+                decode_dice(dice_id(bits))
+        for values in ([3, 3, 5], [1, 2, 3], [2] * 5):
+            with self.assertRaises(ValueError):
+                encode_dice(values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import unittest
+from core.array_board import ArrayBoard
+from core.dice import DiceStream
+from core.game import Game
+from core.player import Player
+from core.record import GameRecordWriter, Move, Roll, read_games, replay
+from core.simulate import play_game
+
+
+class TestRecord(unittest.TestCase):
+    def test_round_trip_of_played_games(self):
+        buffer = io.BytesIO()
+        with GameRecordWriter(buffer, buffer_size=64) as writer:
+            for seed in range(3):
+                play_game(stream=DiceStream(seed), recorder=writer)
+        self.assertEqual(writer.games, 3)
+
+        buffer.seek(0)
+        records = list(read_games(buffer))
+        self.assertEqual(len(records), 3)
+        for record in records:
+            self.assertEqual((record.white, record.black), ("White", "Black"))
+            self.assertIn(record.winner, ('white', 'black'))
+            self.assertIsInstance(record.events[0], Roll)
+            board = None
+            for board in replay(record):
+                pass
+            winner_off = 26 if record.winner == 'white' else 27
+            self.assertEqual(board.get_cells()[winner_off], 15)
+            # Rolls, moves and the end marker take a few bytes per turn
+            rolls = sum(isinstance(event, Roll) for event in record.events)
+            moves = len(record.events) - rolls
+            self.assertGreater(moves, 0)
+
+    def test_hooks_record_rolls_and_moves(self):
+        white, black = Player("Ann", "white"), Player("Bob", "black")
+        game = Game([white, black])
+        buffer = io.BytesIO()
+        writer = GameRecordWriter(buffer)
+        writer.start_game(game)
+        game.dice.set_values([3, 1])
+        game.move(7, 4)
+        game.move(5, 4)
+        game.switch_player()
+        game.roll_dice()
+        rolled = game.dice.get_values()
+        writer.close()
+        self.assertEqual(buffer.getvalue()[:5], b'BGRC\x02')
+
+        (record,) = read_games(io.BytesIO(buffer.getvalue()))
+        self.assertEqual((record.white, record.black), ("Ann", "Bob"))
+        self.assertEqual(record.cells, tuple(ArrayBoard(white, black).get_cells()))
+        # The moves precede any recorded roll, yet keep their mover
+        self.assertEqual(record.events, [Move('white', 7, 4), Move('white', 5, 4),
+                                         Roll('black', (rolled[0], rolled[1]))])
+        self.assertIsNone(record.winner)
+
+    def test_moves_keep_their_color_and_replay(self):
+        white, black = Player("White", "white"), Player("Black", "black")
+        game = Game([white, black])
+        buffer = io.BytesIO()
+        writer = GameRecordWriter(buffer)
+        writer.start_game(game)
+        game.switch_player()  # Black moves first, without a recorded roll
+        game.dice.set_values([3, 1])
+        game.move(0, 3)
+        game.move(0, 1)
+        writer.close()
+
+        (record,) = read_games(io.BytesIO(buffer.getvalue()))
+        self.assertEqual(record.events, [Move('black', 0, 3), Move('black', 0, 1)])
+        board = None
+        for board in replay(record):
+            pass
+        self.assertEqual(list(board.get_cells()), list(ArrayBoard.from_board(game.board).get_cells()))
+
+    def test_reads_version_1_files(self):
+        # Version 1 moves carry no color bit and belong to the side that rolled last
+        payload = bytes(28) + b'\x01A\x01B' + bytes([0x80 | 2 * 6, 0xC0 | 5, 2, 0x00, 255])
+        data = b'BGRC\x01' + len(payload).to_bytes(4, 'little') + payload
+        (record,) = read_games(io.BytesIO(data))
+        self.assertEqual(record.events, [Roll('black', (3, 1)), Move('black', 5, 2)])
+
+    def test_rejects_other_streams(self):
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(b'not a record')))
+        buffer = io.BytesIO()
+        with GameRecordWriter(buffer) as writer:
+            play_game(stream=DiceStream(1), recorder=writer)
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(buffer.getvalue()[:-3])))
+
+
+if __name__ == "__main__":
+    unittest.main()
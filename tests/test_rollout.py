@@ -0,0 +1,62 @@
+import unittest
+from core.player import Player
+from core.board import Board
+from core.array_board import ArrayBoard
+from core.movegen import die_for_move
+from core.rollout import Rollout
+
+
+class TestRollout(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def _race(self, white_points, black_points):
+        board = ArrayBoard(self.white, self.black)
+        cells = board.get_cells()
+        for i in range(28): cells[i] = 0
+        for point, count in white_points.items(): cells[point] = count
+        for point, count in black_points.items(): cells[point] = -count
+        cells[26] = 15 - sum(white_points.values())
+        cells[27] = 15 - sum(black_points.values())
+        return board
+
+    def test_die_for_move(self):
+        self.assertEqual(die_for_move('bar', 20, True), 4)
+        self.assertEqual(die_for_move('bar', 2, False), 3)
+        self.assertEqual(die_for_move(3, 'off', True), 4)
+        self.assertEqual(die_for_move(20, 'off', False), 4)
+        self.assertEqual(die_for_move(12, 7, True), 5)
+
+    def test_clearly_won_race(self):
+        board = self._race({0: 1}, {12: 15})
+        result = Rollout(max_trials=72, min_trials=72).run(board, self.white)
+        self.assertEqual(result.win, 1.0)
+        self.assertGreater(result.win_gammon, 0.9)
+
+    def test_same_seed_is_reproducible_and_board_untouched(self):
+        board = Board(self.white, self.black)
+        before = list(ArrayBoard.from_board(board).get_cells())
+        first = Rollout(max_trials=8, min_trials=8, seed=3).run(board, self.white)
+        second = Rollout(max_trials=8, min_trials=8, seed=3).run(board, self.white)
+        self.assertEqual((first.win, first.equity), (second.win, second.equity))
+        self.assertEqual(list(ArrayBoard.from_board(board).get_cells()), before)
+
+    def test_early_stopping_when_interval_is_tight(self):
+        board = self._race({0: 2}, {23: 2, 22: 2})
+        result = Rollout(max_trials=1000, min_trials=10, tolerance=0.5).run(board, self.white)
+        self.assertLess(result.trials, 1000)
+        low, high = result.confidence_interval()
+        self.assertLessEqual(low, result.equity)
+        self.assertGreaterEqual(high, result.equity)
+
+    def test_truncated_rollout_uses_evaluator(self):
+        board = Board(self.white, self.black)
+        evaluator = lambda cells, is_white: (0.75 if is_white else 0.25, 0.0, 0.0, 0.0, 0.0)
+        result = Rollout(max_trials=4, min_trials=4, truncate_after=2, evaluator=evaluator).run(board, self.white)
+        self.assertAlmostEqual(result.win, 0.75)
+        self.assertAlmostEqual(result.equity, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import time
+import unittest
+from core.player import Player
+from core.board import Board
+from core.game import Game
+from core.array_board import ArrayBoard, START_POSITION
+from core.ai import SearchAIPlayer
+from core.movegen import generate_positions
+from core.search import ExpectiminimaxSearch, TranspositionTable, evaluate_position, ROLLS
+
+
+def _reference_chance(cells, is_white, depth):
+    """Plain expectiminimax without pruning or transposition table."""
+    if cells[26] == 15 or cells[27] == 15 or depth <= 0:
+        return evaluate_position(cells, is_white)
+    total = 0.0
+    for dice, p in ROLLS:
+        total += p * max(-_reference_chance(child, not is_white, depth - 1)
+                         for _, child in generate_positions(cells, is_white, dice))
+    return total
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def _endgame(self):
+        board = ArrayBoard(self.white, self.black)
+        cells = board.get_cells()
+        for i in range(28): cells[i] = 0
+        cells[0], cells[3], cells[4], cells[26] = 1, 2, 1, 11
+        cells[23], cells[20], cells[27] = -2, -1, -12
+        return board
+
+    def test_rolls_cover_all_outcomes(self):
+        self.assertEqual(len(ROLLS), 21)
+        self.assertAlmostEqual(sum(p for _, p in ROLLS), 1.0)
+
+    def test_pruned_search_matches_plain_expectiminimax(self):
+        board = self._endgame()
+        cells = list(board.get_cells())
+        for dice in ([2, 1], [5, 4], [3, 3, 3, 3]):
+            search = ExpectiminimaxSearch(TranspositionTable(10))
+            moves = search.choose_play(cells, True, dice, depth=3)
+            values = {tuple(m): -_reference_chance(child, False, 2)
+                      for m, child in generate_positions(cells, True, dice)}
+            self.assertAlmostEqual(values[tuple(moves)], max(values.values()))
+
+    def test_table_is_bounded_and_used(self):
+        table = TranspositionTable(4)
+        search = ExpectiminimaxSearch(table)
+        cells = list(self._endgame().get_cells())
+        search.choose_play(cells, True, [2, 1], depth=3)
+        search.choose_play(cells, True, [2, 1], depth=3)
+        self.assertEqual(len(table), 16)
+        self.assertGreater(table.stores, 0)
+        self.assertGreater(table.hits, 0)
+
+    def test_replacement_prefers_deeper_entries_within_a_search(self):
+        table = TranspositionTable(1)
+        table.new_search()
+        table.store(2, 3, 0.5, 0)
+        table.store(4, 1, 0.1, 0)  # Same slot, shallower: kept out
+        self.assertEqual(table.probe(2), (3, 0.5, 0))
+        table.new_search()
+        table.store(4, 1, 0.1, 0)  # Older entries are always replaceable
+        self.assertEqual(table.probe(4), (1, 0.1, 0))
+        self.assertIsNone(table.probe(2))
+
+    def test_time_budget_still_returns_a_legal_play(self):
+        ai = SearchAIPlayer("Computer", "black", depth=3, time_budget=0.01)
+        board = Board(self.white, ai)
+        moves = ai.choose_moves(board, [4, 2])
+        legal = [m for m, _ in generate_positions(ArrayBoard.from_board(board).get_cells(), False, [4, 2])]
+        self.assertIn(moves, legal)
+
+    def test_iterative_deepening_matches_fixed_depth(self):
+        search = ExpectiminimaxSearch()
+        expected = ExpectiminimaxSearch().choose_play(START_POSITION, True, [4, 2], 2)
+        self.assertEqual(search.iterative_play(START_POSITION, True, [4, 2], max_depth=2), expected)
+        self.assertEqual(search.last_depth, 2)
+        with self.assertRaises(ValueError):
+            search.iterative_play(START_POSITION, True, [4, 2])
+
+    def test_iterative_deepening_meets_the_deadline(self):
+        search = ExpectiminimaxSearch()
+        start = time.perf_counter()
+        moves = search.iterative_play(START_POSITION, False, [6, 6, 6, 6], time_budget=0.05)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(moves, [m for m, _ in generate_positions(START_POSITION, False, [6, 6, 6, 6])])
+        self.assertGreaterEqual(search.last_depth, 1)
+
+    def test_stop_before_the_search_starts_is_kept(self):
+        search = ExpectiminimaxSearch()
+        search.stop()  # E.g. a cancel that lands just before the search starts
+        start = time.monotonic()
+        moves = search.iterative_play(START_POSITION, False, [6, 6, 6, 6], time_budget=5.0)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(search.last_depth, 1)
+        self.assertTrue(moves)
+        search.clear_stop()
+        search.iterative_play(START_POSITION, True, [4, 2], max_depth=2, time_budget=5.0)
+        self.assertEqual(search.last_depth, 2)
+
+    def test_time_budget_is_per_player(self):
+        fast = SearchAIPlayer("Fast", "white", depth=None, time_budget=0.02)
+        slow = SearchAIPlayer("Slow", "black", depth=None, time_budget=0.5)
+        self.assertEqual((fast.get_time_budget(), slow.get_time_budget()), (0.02, 0.5))
+        with self.assertRaises(ValueError):
+            fast.set_time_budget(None)
+        fast.set_time_budget(0.01)
+        self.assertEqual(fast.get_time_budget(), 0.01)
+
+    def test_plugs_into_game_turn(self):
+        ai = SearchAIPlayer("Computer", "black", depth=2, time_budget=2.0)
+        game = Game([self.white, ai])
+        game.switch_player()
+        game.dice.set_values([3, 1])
+        game.play_ai_turn()
+        self.assertEqual(game.dice.get_values(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from server.server import GameServer, choose_ai_moves
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = ThreadPoolExecutor(2)
+        self.server = GameServer(executor=self.executor)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        self.executor.shutdown()
+
+    async def request(self, **request):
+        return await self.server.handle_request(request)
+
+    async def test_human_turn_then_ai_reply(self):
+        response = await self.request(cmd='new', white='Ann', black='Bot', ai='black', seed=3, id=1)
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['id'], 1)
+        game = response['game']
+
+        # Play human turns (with whatever legal moves come first) until the AI has replied.
+        for _ in range(4):
+            state = await self.request(cmd='state', game=game)
+            self.assertEqual(state['turn'], 'white')
+            if not state['dice']:
+                state = await self.request(cmd='roll', game=game)
+                self.assertTrue(state['ok'])
+            legal = (await self.request(cmd='legal', game=game))['legal']
+            while legal:
+                moved = await self.request(cmd='move', game=game, **{'from': legal[0][0], 'to': legal[0][1]})
+                self.assertTrue(moved['ok'], moved)
+                legal = moved['legal']
+            ended = await self.request(cmd='end_turn', game=game)
+            self.assertTrue(ended['ok'])
+            self.assertEqual(ended['turn'], 'white')
+            self.assertIn('moves', ended['ai_turn'])
+            self.assertEqual(ended['dice'], [])
+
+    async def test_errors(self):
+        self.assertFalse((await self.request(cmd='state', game='missing'))['ok'])
+        self.assertFalse((await self.request(cmd='fly'))['ok'])
+        self.assertFalse((await self.server.handle_request([1, 2]))['ok'])
+        game = (await self.request(cmd='new', seed=1))['game']
+        state = await self.request(cmd='state', game=game)
+        bad = await self.request(cmd='move', game=game, **{'from': 0, 'to': 23})
+        self.assertFalse(bad['ok'])
+        for move in ({'from': 'bar', 'to': 'off'}, {'from': True, 'to': 3}, {'from': 5, 'to': False}):
+            rejected = await self.request(cmd='move', game=game, **move)
+            self.assertFalse(rejected['ok'], move)
+            self.assertIn('error', rejected)
+        self.assertFalse((await self.request(cmd='roll', game=game))['ok'])  # Opening dice pending
+        self.assertFalse((await self.request(cmd='end_turn', game=game))['ok'])
+        self.assertEqual((await self.request(cmd='state', game=game))['position'], state['position'])
+        self.assertTrue((await self.request(cmd='close', game=game))['ok'])
+        self.assertEqual(self.server.get_game_count(), 0)
+
+    async def test_end_turn_needs_a_roll(self):
+        game = (await self.request(cmd='new', seed=2))['game']
+        legal = (await self.request(cmd='legal', game=game))['legal']
+        while legal:  # The opening dice count as the first player's roll
+            legal = (await self.request(cmd='move', game=game,
+                                        **{'from': legal[0][0], 'to': legal[0][1]}))['legal']
+        self.assertTrue((await self.request(cmd='end_turn', game=game))['ok'])
+        skipped = await self.request(cmd='end_turn', game=game)
+        self.assertFalse(skipped['ok'])
+        self.assertIn('roll', skipped['error'])
+        self.assertTrue((await self.request(cmd='roll', game=game))['ok'])
+        self.assertFalse((await self.request(cmd='roll', game=game))['ok'])
+
+    async def test_many_games_over_tcp(self):
+        listener = await self.server.serve_tcp('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        async def client(seed):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(json.dumps({'cmd': 'new', 'ai': 'white', 'seed': seed}).encode() + b'\n')
+            writer.write(b'not json\n')
+            await writer.drain()
+            created = json.loads(await reader.readline())
+            invalid = json.loads(await reader.readline())
+            writer.close()
+            return created, invalid
+
+        async with listener:
+            results = await asyncio.gather(*(client(seed) for seed in range(20)))
+        self.assertEqual(self.server.get_game_count(), 20)
+        for created, invalid in results:
+            self.assertTrue(created['ok'])
+            self.assertEqual(created['turn'], 'black')
+            self.assertFalse(invalid['ok'])
+
+    def test_worker_function_uses_position_id(self):
+        from core.board import Board
+        from core.player import Player
+        white, black = Player("W", "white"), Player("B", "black")
+        moves = choose_ai_moves(Board(white, black).get_position_id(white), [3, 1], "W", "white")
+        self.assertTrue(1 <= len(moves) <= 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
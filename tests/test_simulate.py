@@ -0,0 +1,36 @@
+import unittest
+from core.simulate import SimulationStats, play_game, simulate
+
+
+class TestSimulate(unittest.TestCase):
+    def test_play_game_finishes(self):
+        result = play_game()
+        self.assertIn(result['winner'], ('white', 'black'))
+        self.assertGreater(result['turns'], 0)
+        self.assertGreaterEqual(result['loser_pips'], 0)
+
+    def test_results_are_reproducible_for_a_seed(self):
+        first = simulate(12, workers=1, seed=7, shard_size=4).to_dict()
+        second = simulate(12, workers=1, seed=7, shard_size=4).to_dict()
+        self.assertEqual(first, second)
+        self.assertEqual(first['games'], 12)
+        self.assertEqual(first['wins']['white'] + first['wins']['black'] + first['unfinished'], 12)
+
+    def test_process_pool_matches_single_process(self):
+        single = simulate(8, workers=1, seed=11, shard_size=2).to_dict()
+        pooled = simulate(8, workers=2, seed=11, shard_size=2).to_dict()
+        self.assertEqual(single, pooled)
+
+    def test_merge_and_progress(self):
+        seen = []
+        stats = simulate(6, workers=1, seed=1, shard_size=3, on_progress=lambda s: seen.append(s.games))
+        self.assertEqual(seen, [3, 6])
+        merged = SimulationStats()
+        merged.merge(stats)
+        merged.merge(stats)
+        self.assertEqual(merged.games, 12)
+        self.assertEqual(merged.average_turns(), stats.average_turns())
+
+
+if __name__ == "__main__":
+    unittest.main()
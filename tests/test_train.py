@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from core.dice import DiceStream
+from core.network import NeuralEvaluator, encode
+from core.train import lambda_errors, learn, play_training_game, train
+
+
+class TestTrain(unittest.TestCase):
+    def test_lambda_errors_match_eligibility_traces(self):
+        values = np.array([0.5, 0.6, 0.3, 0.8])
+        outcome, decay = 1.0, 0.7
+        # Online view: at step t the TD error is credited to every earlier state k with weight decay**(t - k).
+        expected = np.zeros(4)
+        targets = list(values[1:]) + [outcome]
+        for t in range(4):
+            delta = targets[t] - values[t]
+            for k in range(t + 1):
+                expected[k] += decay ** (t - k) * delta
+        np.testing.assert_allclose(lambda_errors(values, outcome, decay), expected)
+        # With lambda = 1 every error is the distance to the final outcome.
+        np.testing.assert_allclose(lambda_errors(values, outcome, 1.0), outcome - values)
+
+    def test_self_play_game(self):
+        network = NeuralEvaluator(hidden=8, seed=3)
+        positions, to_move, outcome = play_training_game(network, DiceStream(4))
+        replay = play_training_game(network, DiceStream(4))
+        np.testing.assert_array_equal(positions, replay[0])
+        self.assertEqual(positions.shape[1], 28)
+        self.assertEqual(len(positions), len(to_move))
+        self.assertIn(outcome, (0.0, 1.0))
+        self.assertTrue((to_move[1:] != to_move[:-1]).all())
+
+    def test_learning_moves_values_towards_outcome(self):
+        network = NeuralEvaluator(hidden=8, seed=5)
+        trajectory = play_training_game(network, DiceStream(6))
+        inputs = encode(trajectory[0], trajectory[1])
+        before = np.abs(network.win_probability(inputs)[-5:] - trajectory[2]).mean()
+        for _ in range(20):
+            learn(network, trajectory, 0.1, 0.7)
+        after = np.abs(network.win_probability(inputs)[-5:] - trajectory[2]).mean()
+        self.assertLess(after, before)
+
+    def test_training_run_checkpoints_and_reproduces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weights.npz")
+            first = NeuralEvaluator(hidden=8, seed=0)
+            progress = train(first, 6, workers=1, games_per_round=3, seed=9,
+                             checkpoint_path=path, checkpoint_every=3)
+            self.assertEqual(progress.games + progress.dropped, 6)
+            self.assertGreater(progress.games_per_second_per_core(), 0)
+            loaded = NeuralEvaluator.load(path)
+        np.testing.assert_array_equal(loaded.hidden_weights, first.hidden_weights)
+
+        second = NeuralEvaluator(hidden=8, seed=0)
+        train(second, 6, workers=1, games_per_round=3, seed=9)
+        np.testing.assert_array_equal(second.hidden_weights, first.hidden_weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
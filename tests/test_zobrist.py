@@ -0,0 +1,100 @@
+import random
+import unittest
+from unittest import mock
+from core.player import Player
+from core.board import Board
+from core.array_board import ArrayBoard
+from core.checkers import Checkers
+from core.game import Game
+from core.zobrist import hash_cells, hash_after_play, BLACK_TO_MOVE_KEY
+from core.movegen import generate_positions
+
+
+class TestZobrist(unittest.TestCase):
+    def setUp(self):
+        self.white = Player("White", "white")
+        self.black = Player("Black", "black")
+
+    def test_side_to_move_changes_hash(self):
+        board = Board(self.white, self.black)
+        self.assertNotEqual(board.position_hash(self.white), board.position_hash(self.black))
+        self.assertEqual(board.position_hash(self.white), board.position_hash())
+
+    def test_list_and_array_boards_agree(self):
+        board = Board(self.white, self.black)
+        fast = ArrayBoard(self.white, self.black)
+        self.assertEqual(board.position_hash(self.black), fast.position_hash(self.black))
+
+    def test_incremental_hash_matches_full_recompute(self):
+        rng = random.Random(3)
+        board = Board(self.white, self.black)
+        fast = ArrayBoard(self.white, self.black)
+        player = self.white
+        for _ in range(300):
+            die = rng.randint(1, 6)
+            origins = [o for o in ['bar'] + list(range(24)) if fast.is_valid_move(o, die, player)]
+            if origins:
+                origin = rng.choice(origins)
+                board.apply_move(origin, die, player)
+                fast.apply_move(origin, die, player)
+                self.assertEqual(fast.position_hash(), hash_cells(fast.copy().get_cells()))
+                self.assertEqual(board.position_hash(), fast.position_hash())
+            if fast.get_winner():
+                break
+            player = self.black if player == self.white else self.white
+
+    def test_undo_restores_hash(self):
+        board = Board(self.white, self.black)
+        board.get_points()[20] = [Checkers(self.black)]
+        before = board.position_hash()
+        record = board.apply_move(23, 3, self.white)
+        self.assertNotEqual(board.position_hash(), before)
+        board.undo_move(record)
+        self.assertEqual(board.position_hash(), before)
+
+    def test_direct_modification_is_picked_up(self):
+        board = Board(self.white, self.black)
+        before = board.position_hash()
+        board.get_points()[23] = []
+        self.assertNotEqual(board.position_hash(), before)
+        self.assertEqual(board.position_hash(), ArrayBoard.from_board(board).position_hash())
+
+    def test_read_only_access_keeps_the_incremental_hash(self):
+        board = Board(self.white, self.black)
+        board.apply_move(23, 3, self.white)
+        with mock.patch.object(Board, '_refresh_hash') as board_refresh, \
+                mock.patch('core.array_board.hash_cells') as array_refresh:
+            fast = ArrayBoard.from_board(board)
+            fast.apply_move(0, 4, self.black)
+            fast.get_cells_snapshot()
+            board.position_hash()
+            board_refresh.assert_not_called()
+            # The new ArrayBoard hashes itself once, then follows its moves incrementally
+            self.assertEqual(array_refresh.call_count, 1)
+
+    def test_hash_after_play_matches_full_recompute(self):
+        rng = random.Random(11)
+        opening = ArrayBoard(self.white, self.black).get_cells_snapshot()  # Hits and bar entries
+        bear_off = (3, 3, 3, 3, 3) + (0,) * 14 + (-3, -3, -3, -3, -3) + (0, 0, 0, 0)
+        for cells in (opening, bear_off):
+            is_white = True
+            key = hash_cells(cells)
+            for _ in range(60):
+                dice = [rng.randint(1, 6), rng.randint(1, 6)]
+                moves, after = rng.choice(generate_positions(cells, is_white, dice))
+                key = hash_after_play(key, cells, moves, after, is_white)
+                is_white = not is_white
+                self.assertEqual(key, hash_cells(after) ^ (0 if is_white else BLACK_TO_MOVE_KEY))
+                cells = after
+                if cells[26] == 15 or cells[27] == 15:
+                    break
+
+    def test_game_hash_uses_current_player(self):
+        game = Game([self.white, self.black])
+        first = game.position_hash()
+        game.switch_player()
+        self.assertNotEqual(game.position_hash(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()